@@ -0,0 +1,472 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from spell_and_assign import SpellChecker
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# The lowercase letters of the generated words, with a few digits and capitals as in chat messages
+LETTERS = 'abcdefghijklmnopqrstuvwxyz' * 4 + 'ABCDEIKLMOT0123456789'
+# The share of each kind of query in a query mix: a corpus word, a prefix of one, a word with one typo, and a random word
+QUERY_MIX = {'exact': 0.4, 'prefix': 0.3, 'typo': 0.2, 'miss': 0.1}
+# The latency percentiles reported for check
+PERCENTILES = {'p50': 0.5, 'p90': 0.9, 'p99': 0.99, 'p999': 0.999}
+# The version of the format of the results file
+RESULTS_VERSION = 1
+
+
+def vocabulary_size(tokens):
+    """
+    Function Description: Returns the default number of distinct words of a corpus, by Heaps' law
+
+    Input:
+        tokens: an integer representing the number of words in the corpus
+
+    Output:
+        vocabulary: an integer representing the number of distinct words to generate
+
+    Time Complexity: O(1)
+
+    Auxiliary Space/Space Complexity: O(1)
+    """
+    return max(100, int(4 * tokens ** 0.6))
+
+
+def make_vocabulary(size, seed):
+    """
+    Function Description: Generates distinct random words, with lengths that peak at 4 to 7 characters
+
+    Input:
+        size: an integer representing the number of words
+        seed: an integer representing the seed of the random words
+
+    Output:
+        words: a list of distinct strings, in the order they are ranked by the Zipf distribution
+
+    Time Complexity: O(V*L) where V is the number of words and L is the length of the longest word
+
+    Auxiliary Space/Space Complexity: O(V*L) where V is the number of words and L is the length of the longest word
+    """
+    rng = random.Random(seed)
+    words = {}
+    while len(words) < size:
+        length = min(14, 1 + int(rng.expovariate(0.2)) + rng.randint(1, 3))
+        words[''.join(rng.choices(LETTERS, k=length))] = None
+    return list(words)
+
+
+def zipf_weights(size, exponent):
+    """
+    Function Description: Returns the cumulative weights of a Zipf distribution over ranks 1 to size
+
+    Input:
+        size: an integer representing the number of ranks
+        exponent: a float representing the exponent of the distribution, 1 for the classic Zipf law
+
+    Output:
+        weights: a list of floats representing the cumulative weights, for random.choices
+
+    Time Complexity: O(V) where V is the number of ranks
+
+    Auxiliary Space/Space Complexity: O(V) where V is the number of ranks
+    """
+    total = 0.0
+    weights = []
+    for rank in range(1, size + 1):
+        total += rank ** -exponent
+        weights.append(total)
+    return weights
+
+
+def write_corpus(path, tokens, vocabulary, exponent, seed, line_words=12):
+    """
+    Function Description: Writes a corpus of Zipf distributed words, a block of lines at a time
+
+    Approach Description: The words are drawn with random.choices from the cumulative Zipf weights of the vocabulary, in blocks, so a corpus of 10^8 words is never held in memory. The lines separate words with spaces and some punctuation, which the tokenizer ignores. The same arguments always write the same file.
+
+    Input:
+        path: a string representing the path of the corpus file
+        tokens: an integer representing the number of words to write
+        vocabulary: a list of strings representing the words, ordered by rank
+        exponent: a float representing the exponent of the Zipf distribution
+        seed: an integer representing the seed of the random draws
+        line_words: an integer representing the number of words on each line
+
+    Output:
+        None
+
+    Time Complexity: O(N*log(V)) where N is the number of words and V is the size of the vocabulary
+
+    Auxiliary Space/Space Complexity: O(V + B) where V is the size of the vocabulary and B is the block size
+    """
+    rng = random.Random(seed)
+    weights = zipf_weights(len(vocabulary), exponent)
+    block = 1 << 16
+    with open(path + '.part', 'w') as file:
+        for start in range(0, tokens, block):
+            words = rng.choices(vocabulary, cum_weights=weights, k=min(block, tokens - start))
+            lines = []
+            for i in range(0, len(words), line_words):
+                lines.append(' '.join(words[i:i + line_words]) + rng.choice('.,!?') + '\n')
+            file.write(''.join(lines))
+    os.replace(path + '.part', path)
+
+
+def make_queries(count, vocabulary, exponent, mix, seed):
+    """
+    Function Description: Generates a query mix of corpus words, prefixes, words with one typo and random words
+
+    Approach Description: The corpus words behind each query are drawn from the same Zipf distribution as the corpus, so popular words are queried most, as in real traffic. A prefix keeps 1 to all but one of the characters of a word, a typo replaces one character, and a miss is a new random word.
+
+    Input:
+        count: an integer representing the number of queries
+        vocabulary: a list of strings representing the words, ordered by rank
+        exponent: a float representing the exponent of the Zipf distribution
+        mix: a dictionary from kind of query to its share, as in QUERY_MIX
+        seed: an integer representing the seed of the random queries
+
+    Output:
+        queries: a list of strings representing the queries, shuffled
+
+    Time Complexity: O(Q*log(V)*L) where Q is the number of queries, V is the size of the vocabulary and L is the length of the longest word
+
+    Auxiliary Space/Space Complexity: O(Q*L + V) where Q is the number of queries, L is the length of the longest word and V is the size of the vocabulary
+    """
+    rng = random.Random(seed)
+    total = sum(mix.values())
+    kinds = rng.choices(list(mix), weights=[share / total for share in mix.values()], k=count)
+    words = rng.choices(vocabulary, cum_weights=zipf_weights(len(vocabulary), exponent), k=count)
+    queries = []
+    for kind, word in zip(kinds, words):
+        if kind == 'prefix' and len(word) > 1:
+            word = word[:rng.randint(1, len(word) - 1)]
+        elif kind == 'typo':
+            i = rng.randrange(len(word))
+            word = word[:i] + rng.choice(LETTERS) + word[i + 1:]
+        elif kind == 'miss':
+            word = ''.join(rng.choices(LETTERS, k=rng.randint(3, 10)))
+        queries.append(word)
+    return queries
+
+
+def percentiles(latencies):
+    """
+    Function Description: Returns the latency percentiles of PERCENTILES and the largest latency, by the nearest rank
+
+    Input:
+        latencies: a sorted list of latencies
+
+    Output:
+        percentiles: a dictionary from name to latency
+
+    Time Complexity: O(P) where P is the number of percentiles
+
+    Auxiliary Space/Space Complexity: O(P) where P is the number of percentiles
+    """
+    summary = {name: latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] for name, fraction in PERCENTILES.items()}
+    summary['max'] = latencies[-1]
+    return summary
+
+
+def peak_rss():
+    """
+    Function Description: Returns the peak resident set size of this process in bytes, or None where it is not available
+
+    Input:
+        None
+
+    Output:
+        rss: an integer representing the peak resident set size in bytes, or None
+
+    Time Complexity: O(1)
+
+    Auxiliary Space/Space Complexity: O(1)
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes and macOS reports bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def node_count(trie):
+    """
+    Function Description: Returns the number of nodes of a trie of any backend, which is the number of words for a SortedArray and the number of merged nodes for a Dawg
+
+    Input:
+        trie: a Trie, ArrayTrie, RadixTrie, SortedArray or Dawg object
+
+    Output:
+        nodes: an integer representing the number of nodes
+
+    Time Complexity: O(1), or O(N) where N is the number of nodes for a Trie, which does not keep a count
+
+    Auxiliary Space/Space Complexity: O(N*W) for a Trie where N is the number of nodes and W is the length of the longest word, otherwise O(1)
+    """
+    if hasattr(trie, '__len__'):
+        return len(trie)
+    return sum(1 for _ in trie.export_nodes())
+
+
+def measure(corpus, queries, backend, bulk):
+    """
+    Function Description: Builds a SpellChecker from a corpus and measures its build and check performance
+
+    Approach Description: This function runs in a new process for each measurement, so the peak resident set size belongs to one build alone and no measurement warms the caches of another. The build time covers reading, tokenizing and inserting the corpus. The latency of each check is timed on its own after a warm up pass over the first queries, and the throughput of check and check_many is timed over the whole query mix. Their throughput is also timed over the distinct queries alone, so the gain of check_many is not only the duplicates it skips.
+
+    Input:
+        corpus: a string representing the path of the corpus file
+        queries: a list of strings representing the query mix
+        backend: a string representing the backend, one of SpellChecker.BACKENDS
+        bulk: a boolean representing whether to build the trie from word counts
+
+    Output:
+        result: a dictionary of the measurements, with times in seconds and sizes in bytes
+
+    Time Complexity: O(T + Q*M) where T is the number of characters in the corpus, Q is the number of queries and M is the time of one check
+
+    Auxiliary Space/Space Complexity: O(N + Q) where N is the size of the trie and Q is the number of queries
+    """
+    rss_before = peak_rss()
+    start = time.perf_counter()
+    checker = SpellChecker(corpus, backend=backend, bulk=bulk)
+    build_seconds = time.perf_counter() - start
+    rss_after = peak_rss()
+    check = checker.check
+    for query in queries[:1000]:
+        check(query)
+    latencies = []
+    clock = time.perf_counter
+    start = clock()
+    for query in queries:
+        begin = clock()
+        check(query)
+        latencies.append(clock() - begin)
+    check_seconds = clock() - start
+    start = clock()
+    checker.check_many(queries)
+    many_seconds = clock() - start
+    distinct = sorted(set(queries))
+    start = clock()
+    for query in distinct:
+        check(query)
+    check_distinct_seconds = clock() - start
+    start = clock()
+    checker.check_many(distinct)
+    many_distinct_seconds = clock() - start
+    latencies.sort()
+    return {
+        'backend': backend,
+        'bulk': bulk,
+        'build_seconds': build_seconds,
+        'peak_rss_bytes': rss_after,
+        'build_rss_bytes': rss_after - rss_before if rss_after is not None else None,
+        'nodes': node_count(checker.trie),
+        'queries': len(queries),
+        'check_latency_seconds': percentiles(latencies),
+        'check_per_second': len(queries) / check_seconds,
+        'check_many_per_second': len(queries) / many_seconds,
+        'distinct_queries': len(distinct),
+        'check_distinct_per_second': len(distinct) / check_distinct_seconds,
+        'check_many_distinct_per_second': len(distinct) / many_distinct_seconds,
+    }
+
+
+def run_benchmark(token_counts, backends, bulk=False, queries=10000, exponent=1.0, mix=QUERY_MIX, vocabulary=None, seed=0, directory=None, log=None):
+    """
+    Function Description: Runs the benchmark for every corpus size and backend
+
+    Approach Description: A corpus is generated for each number of words, and kept in directory under a name made of its parameters, so later runs with the same parameters reuse it instead of generating it again. Each backend is measured with measure in a new spawned process.
+
+    Input:
+        token_counts: a list of integers representing the number of words of each corpus
+        backends: a list of strings representing the backends to measure
+        bulk: a boolean representing whether to build the tries from word counts
+        queries: an integer representing the number of queries in the query mix
+        exponent: a float representing the exponent of the Zipf distribution
+        mix: a dictionary from kind of query to its share, as in QUERY_MIX
+        vocabulary: an integer representing the number of distinct words, or None for vocabulary_size of each corpus
+        seed: an integer representing the seed of the corpora and queries
+        directory: a string representing the directory of the corpora, or None for the temporary directory
+        log: a file to write progress to, or None
+
+    Output:
+        results: a dictionary of the parameters of the run, the environment and a list of the result of each measurement
+
+    Time Complexity: O(S*B*(T + Q*M)) where S is the number of corpus sizes, B is the number of backends, T is the number of characters in a corpus, Q is the number of queries and M is the time of one check
+
+    Auxiliary Space/Space Complexity: O(V + Q + R) where V is the size of the vocabulary, Q is the number of queries and R is the number of results
+    """
+    directory = directory or tempfile.gettempdir()
+    results = []
+    for tokens in token_counts:
+        size = vocabulary or vocabulary_size(tokens)
+        words = make_vocabulary(size, seed)
+        corpus = os.path.join(directory, f'zipf-{tokens}-{size}-{exponent}-{seed}.txt')
+        if not os.path.exists(corpus):
+            if log:
+                print(f'Generating {corpus}', file=log, flush=True)
+            write_corpus(corpus, tokens, words, exponent, seed)
+        query_mix = make_queries(queries, words, exponent, mix, seed + 1)
+        for backend in backends:
+            if log:
+                print(f'Measuring {backend} on {tokens} words', file=log, flush=True)
+            with ProcessPoolExecutor(1, mp_context=get_context('spawn')) as executor:
+                result = executor.submit(measure, corpus, query_mix, backend, bulk).result()
+            results.append({'tokens': tokens, 'vocabulary': size, 'corpus_bytes': os.path.getsize(corpus), **result})
+    return {
+        'version': RESULTS_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {'exponent': exponent, 'queries': queries, 'mix': mix, 'seed': seed, 'bulk': bulk},
+        'results': results,
+    }
+
+
+def git_commit():
+    """
+    Function Description: Returns the git commit of the code being measured, or None outside a git checkout
+
+    Input:
+        None
+
+    Output:
+        commit: a string representing the commit hash, or None
+
+    Time Complexity: O(1)
+
+    Auxiliary Space/Space Complexity: O(1)
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """
+    Function Description: Compares the results of a run with the results of an earlier run
+
+    Approach Description: Measurements are matched by backend, bulk and number of words. For each match the ratio of the new to the old build time, peak memory and p50 and p99 check latency is given, so a ratio above 1 is a regression.
+
+    Input:
+        results: a dictionary of results, as returned by run_benchmark
+        baseline: a dictionary of earlier results, as returned by run_benchmark
+
+    Output:
+        lines: a list of strings describing the ratio of each measure
+
+    Time Complexity: O(R) where R is the number of results
+
+    Auxiliary Space/Space Complexity: O(R) where R is the number of results
+    """
+    def key(result):
+        return result['backend'], result['bulk'], result['tokens']
+
+    def measures(result):
+        return {
+            'build': result['build_seconds'],
+            'rss': result['peak_rss_bytes'],
+            'p50': result['check_latency_seconds']['p50'],
+            'p99': result['check_latency_seconds']['p99'],
+        }
+
+    old = {key(result): measures(result) for result in baseline['results']}
+    lines = []
+    for result in results['results']:
+        if key(result) not in old:
+            continue
+        ratios = []
+        for name, value in measures(result).items():
+            if value and old[key(result)][name]:
+                ratios.append(f'{name} x{value / old[key(result)][name]:.2f}')
+        lines.append(f"{result['backend']}{' bulk' if result['bulk'] else ''} {result['tokens']} words: {', '.join(ratios)}")
+    return lines
+
+
+def parse_mix(text):
+    """
+    Function Description: Parses a query mix such as exact=40,prefix=30,typo=20,miss=10
+
+    Input:
+        text: a string of comma separated kind=share pairs
+
+    Output:
+        mix: a dictionary from kind of query to its share
+
+    Time Complexity: O(L) where L is the length of the text
+
+    Auxiliary Space/Space Complexity: O(K) where K is the number of kinds
+    """
+    mix = {}
+    for pair in text.split(','):
+        kind, _, share = pair.partition('=')
+        if kind not in QUERY_MIX:
+            raise argparse.ArgumentTypeError(f'unknown kind of query {kind!r}, expected one of {sorted(QUERY_MIX)}')
+        mix[kind] = float(share)
+    if not mix or min(mix.values()) < 0 or not sum(mix.values()):
+        raise argparse.ArgumentTypeError('the shares must not be negative and must not all be 0')
+    return mix
+
+
+def main(argv=None):
+    """
+    Function Description: Runs the benchmark from the command line and writes the results as JSON
+
+    Input:
+        argv: a list of strings representing the command line arguments, or None for sys.argv
+
+    Output:
+        status: an integer representing the exit status
+
+    Time Complexity: O(S*B*(T + Q*M)), as for run_benchmark
+
+    Auxiliary Space/Space Complexity: O(V + Q + R), as for run_benchmark
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the SpellChecker backends on synthetic Zipf distributed corpora')
+    parser.add_argument('--tokens', type=int, nargs='+', default=[10 ** 4, 10 ** 5, 10 ** 6], help='the number of words of each corpus')
+    parser.add_argument('--backends', nargs='+', default=sorted(SpellChecker.BACKENDS), choices=sorted(SpellChecker.BACKENDS), help='the backends to measure')
+    parser.add_argument('--bulk', action='store_true', help='build the tries from word counts')
+    parser.add_argument('--queries', type=int, default=10000, help='the number of queries in the query mix')
+    parser.add_argument('--mix', type=parse_mix, default=QUERY_MIX, help='the shares of each kind of query, such as exact=40,prefix=30,typo=20,miss=10')
+    parser.add_argument('--exponent', type=float, default=1.0, help='the exponent of the Zipf distribution')
+    parser.add_argument('--vocabulary', type=int, help="the number of distinct words, by default by Heaps' law from the number of words")
+    parser.add_argument('--seed', type=int, default=0, help='the seed of the corpora and queries')
+    parser.add_argument('--directory', help='the directory to keep the generated corpora in, the temporary directory by default')
+    parser.add_argument('--output', default='benchmark.json', help='the file to write the results to')
+    parser.add_argument('--baseline', help='a results file of an earlier run to compare with')
+    args = parser.parse_args(argv)
+    if min(args.tokens) < 1 or args.queries < 1:
+        parser.error('--tokens and --queries must be at least 1')
+    results = run_benchmark(args.tokens, args.backends, args.bulk, args.queries, args.exponent, args.mix, args.vocabulary, args.seed, args.directory, sys.stderr)
+    with open(args.output, 'w') as file:
+        json.dump(results, file, indent=2)
+    for result in results['results']:
+        latency = result['check_latency_seconds']
+        print(f"{result['backend']:6} {result['tokens']:>10} words  build {result['build_seconds']:8.2f}s  "
+              f"rss {(result['peak_rss_bytes'] or 0) / 2 ** 20:8.1f}MiB  nodes {result['nodes']:>9}  "
+              f"p50 {latency['p50'] * 1e6:7.1f}us  p99 {latency['p99'] * 1e6:7.1f}us  {result['check_per_second']:9.0f} checks/s  "
+              f"distinct {result['check_distinct_per_second']:9.0f} checks/s {result['check_many_distinct_per_second']:9.0f} check_many/s")
+    if args.baseline:
+        with open(args.baseline) as file:
+            for line in compare(results, json.load(file)):
+                print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
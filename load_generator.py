@@ -0,0 +1,122 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from spell_and_assign import SpellClient, tokenize_input
+
+
+def percentile(values, fraction):
+    """
+    Function Description: Returns a percentile of a sorted list of values, by the nearest rank
+
+    Input:
+        values: a sorted list of numbers
+        fraction: a float between 0 and 1 representing the percentile
+
+    Output:
+        value: the value at the percentile, or 0.0 if there are no values
+
+    Time Complexity: O(1)
+
+    Auxiliary Space/Space Complexity: O(1)
+    """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def generate_load(words, requests, connections=4, depth=16, batch=1, host='127.0.0.1', port=None, path=None, seed=0):
+    """
+    Function Description: Sends requests to a SpellServer and measures their latency
+
+    Approach Description: Each connection runs depth workers that send requests one after the other, so up to connections * depth requests are in flight at once, which is what lets the server gather them into batches. Each request checks batch words picked at random from words. The latency of each request is measured from sending it to receiving its response.
+
+    Input:
+        words: a list of strings representing the words to check
+        requests: an integer representing the total number of requests to send
+        connections: an integer representing the number of connections to open
+        depth: an integer representing the number of requests in flight on each connection
+        batch: an integer representing the number of words in each request, 1 to send single word requests
+        host: a string representing the address of the server
+        port: an integer representing the TCP port of the server
+        path: a string representing the path of the Unix socket of the server, or None to connect over TCP
+        seed: an integer representing the seed of the random words
+
+    Output:
+        summary: a dictionary of the number of requests, the throughput, the latency percentiles in seconds and the metrics of the server
+
+    Time Complexity: O(R*log(R)) where R is the number of requests
+
+    Auxiliary Space/Space Complexity: O(R) where R is the number of requests
+    """
+    rng = random.Random(seed)
+    clients = [await SpellClient.connect(host, port, path) for _ in range(connections)]
+    latencies = []
+    remaining = requests
+
+    async def worker(client):
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            if batch == 1:
+                await client.check(rng.choice(words))
+            else:
+                await client.check_many(rng.choices(words, k=batch))
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(client) for client in clients for _ in range(depth)))
+    elapsed = time.perf_counter() - start
+    metrics = await clients[0].metrics()
+    for client in clients:
+        await client.close()
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'words': len(latencies) * batch,
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed if elapsed else 0.0,
+        'latency': {name: percentile(latencies, fraction) for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0))},
+        'server': metrics,
+    }
+
+
+def main(argv=None):
+    """
+    Function Description: Runs the load generator from the command line and prints its summary as JSON
+
+    Input:
+        argv: a list of strings representing the command line arguments, or None for sys.argv
+
+    Output:
+        status: an integer representing the exit status
+
+    Time Complexity: O(T + R*log(R)) where T is the number of characters in the word file and R is the number of requests
+
+    Auxiliary Space/Space Complexity: O(U + R) where U is the number of words in the word file and R is the number of requests
+    """
+    parser = argparse.ArgumentParser(description='Send spell check requests to a server started with python -m spell_and_assign serve')
+    parser.add_argument('words', help='a file of words to check, picked at random')
+    parser.add_argument('--host', default='127.0.0.1', help='the address of the server')
+    parser.add_argument('--port', type=int, default=8765, help='the TCP port of the server')
+    parser.add_argument('--unix', metavar='PATH', help='connect to a Unix socket at PATH instead of TCP')
+    parser.add_argument('--requests', type=int, default=10000, help='the total number of requests')
+    parser.add_argument('--connections', type=int, default=4, help='the number of connections')
+    parser.add_argument('--depth', type=int, default=16, help='the number of requests in flight on each connection')
+    parser.add_argument('--batch', type=int, default=1, help='the number of words in each request')
+    parser.add_argument('--seed', type=int, default=0, help='the seed of the random words')
+    args = parser.parse_args(argv)
+    words = [word for chunk in tokenize_input(args.words) for word in chunk]
+    if not words:
+        parser.error(f'{args.words} has no words')
+    summary = asyncio.run(generate_load(words, args.requests, args.connections, args.depth, args.batch, args.host, args.port, args.unix, args.seed))
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
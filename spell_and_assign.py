@@ -1,912 +1,4849 @@
-class TrieNode:
-    def __init__(self):
-        """
-        Function Description: Initialises a TrieNode instance.
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from heapq import heappop, heappush, nsmallest
+from multiprocessing import resource_tracker, shared_memory
+import argparse
+import asyncio
+import bz2
+import glob
+import gzip
+import io
+import json
+import locale
+import lzma
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import weakref
+
+# A TrieNode stores its children in a dictionary until it has at least this many children
+SPARSE_CHILDREN = 8
+# A TrieNode switches to a list indexed by the alphabet once this many times its children cover the alphabet
+DENSE_FILL = 3
+# The number of words kept in the ranking of each node
+RANK_SIZE = 3
+# A word is a run of alphanumeric characters, the same characters for which str.isalnum is True
+WORD_PATTERN = re.compile(r'[^\W_]+')
+# Maps every non-alphanumeric ASCII character to a space, so ASCII text can be split with str.split
+ASCII_SEPARATORS = str.maketrans({chr(code): ' ' for code in range(128) if not chr(code).isalnum()})
+# A SortedArray or Dawg stores the ranking of every prefix of more than this many words, and finds the ranking of smaller prefixes by scanning their words
+SORTED_SCAN_LIMIT = 32
+# The number of characters, or bytes when counting, read from the input file at a time
+CHUNK_SIZE = 1 << 20
+# Opens each kind of compressed input file, by file extension, decompressing it while it is read
+COMPRESSED_OPENERS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+# The number of bytes of the input file counted by one task when counting in parallel
+RANGE_SIZE = 64 << 20
+# Decayed frequencies are scaled back down once the newest occurrence weighs this many powers of 2
+DECAY_RESCALE = 64
+# Words whose decayed frequency is below this weight of one new occurrence are removed
+DECAY_FLOOR = 2.0 ** -20
+# The longest line in bytes that a SpellServer reads as a request and a SpellClient reads as a response
+LINE_LIMIT = 16 << 20
+# The upper bounds in seconds of the buckets of the latency histogram of a SpellServer
+LATENCY_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+# The upper bounds of the buckets of the queue depth histogram of a SpellServer
+QUEUE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+# Marks the end of an iterator timed by SpellStats.timed
+_END = object()
+# The statistics of the result cache of a SpellChecker
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'invalidations', 'size', 'max_size'])
+
+
+def split_words(text):
+    """
+    Function Description: Splits text into its runs of alphanumeric characters.
 
-        Approach Description: This method sets up the structure of a trie node, which is used to represent a single node in a trie. Each node can store child nodes representing subsequent characters, track word ranking based on prefix similarity and frequency, and indicate whether it is the end of a word. It also counts how many times the word is in the input file.
+    Approach Description: If the text is ASCII, every non-alphanumeric character is translated to a space in one pass and the text is split on whitespace, which is done in C and is several times faster than a regular expression. Otherwise the runs are found with the compiled WORD_PATTERN regular expression, which matches the same characters as str.isalnum.
 
-        Input: 
-            None
-        
-        Output: 
-            None
+    Input:
+        text: a string to be split into words
 
-        Time Complexity: O(1)
-        
-        Time Complexity Analysis: 
-            Each of the initialisations in the method takes constant time, so the overall time complexity of the method is O(1).
+    Output:
+        words: a list of strings representing the words in the text
 
-        Auxiliary Space/Space Complexity: O(1)
+    Time Complexity: O(T) where T is the number of characters in the text
 
-        Auxiliary Space/Space Complexity Analysis:
-            The self.children is a fixed size list of 62 elements, leading to O(62), O(1) space complexity.
-            The self.ranking is a fixed size list of 3 elements, each containing a tuple of the form (prefix similarity, frequency, word), leading to O(3), O(1) space complexity.
-            The self.is_end_of_word is a boolean value, leading to O(1) space complexity.
-            The self.frequency is an integer value, leading to O(1) space complexity.
-        """
-        # Initialise the TrieNode with 62 children, one for each alphanumeric character 26 + 26 + 10 = 52 (a-z, A-Z, 0-9)
-        self.children = [None] * 62
-        # Initialise the ranking with 3 elements, each containing a tuple of the form (prefix similarity, frequency, word)
-        self.ranking = Ranking()
-        # Store if the current node is the end of a word
-        self.is_end_of_word = False
-        # Store the amount of times the word features in the input file
-        self.frequency = 0
+    Auxiliary Space/Space Complexity: O(T) where T is the number of characters in the text
+    """
+    if text.isascii():
+        return text.translate(ASCII_SEPARATORS).split()
+    return WORD_PATTERN.findall(text)
 
 
-class Trie:
-    def __init__(self):
-        """
-        Function Description: Initialises a Trie instance.
+def ascii_compatible(encoding):
+    """
+    Function Description: Checks whether an encoding encodes every ASCII character as the same single byte.
 
-        Approach Description: This method creates a Trie instance, which stores the words in a trie structure. The Trie stores a reference to the root TrieNode.
+    Approach Description: The 128 ASCII bytes are decoded with the encoding and compared with the ASCII characters. This is True for UTF-8 and the single byte encodings, and False for encodings such as UTF-16, where a newline byte can be part of another character.
 
-        Input:
-            None
+    Input:
+        encoding: a string representing the name of the encoding
 
-        Output:
-            None
+    Output:
+        compatible: a boolean representing whether the encoding is ASCII compatible
 
-        Time Complexity: O(1)
+    Time Complexity: O(1)
 
-        Time Complexity Analysis:
-            The method initialises the Trie instance with a constant time complexity of O(1).
+    Auxiliary Space/Space Complexity: O(1)
+    """
+    try:
+        return bytes(range(128)).decode(encoding) == ''.join(map(chr, range(128)))
+    except UnicodeDecodeError:
+        return False
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
 
-        Auxiliary Space/Space Complexity: O(1)
+def count_list(words):
+    """
+    Function Description: Counts a list of words, ordered by last occurrence.
 
-        Auxiliary Space/Space Complexity Analysis:
-            The space for the root node is fixed at a costant 1 element leading to O(1) space complexity.
+    Approach Description: The words are counted in bulk by a Counter, which counts in C instead of a Python loop over the words. The words are counted in reverse, so the Counter keeps the words in the order of their last occurrence from the end, and reversing its items orders the counts by last occurrence, in the same way as SpellChecker.count_words.
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
-        """
-        self.root = TrieNode()
+    Input:
+        words: a list of strings representing the words in the order they appear in the input
 
-    def _char_to_index(self, char):
-        """
-        Function Description: Converts a character to an index in the list of characters abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.
+    Output:
+        counts: a dictionary from word to frequency, ordered by the last occurrence of each word
 
-        Approach Description: This method converts a character to the index of the chacter in the string abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.
-        
-        Input:
-            char: a character to be converted to an index
+    Time Complexity: O(N) where N is the number of words
 
-        Output:
-            index: an integer representing the index of the character in the list
+    Auxiliary Space/Space Complexity: O(U) where U is the number of distinct words
+    """
+    return dict(reversed(Counter(reversed(words)).items()))
 
-        Time Complexity: O(1)
-    
-        Time Complexity Analysis:
-            The ord method has a constant time complexity of O(1), leading to O(1) time complexity.
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+def is_stream(source):
+    """
+    Function Description: Checks whether an input is an open binary stream rather than the name of a file.
 
-        Auxiliary Space/Space Complexity: O(1)
+    Input:
+        source: a file name, path or binary stream
 
-        Auxiliary Space/Space Complexity Analysis:
-            The space for the index is fixed at a costant 1 element leading to O(1) space complexity.
+    Output:
+        stream: a boolean representing whether the input is a stream
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
-        """
-        if 'a' <= char <= 'z':
-            return ord(char) - 97
-        elif 'A' <= char <= 'Z':
-            return ord(char) - 39
-        elif '0' <= char <= '9':
-            return ord(char) + 4
+    Time Complexity: O(1)
 
-    def insert(self, word):
-        """
-        Function Description: Inserts a word into the Trie.
+    Auxiliary Space/Space Complexity: O(1)
+    """
+    return hasattr(source, 'read')
 
-        Approach Description: This method iterates over each character in the inputed word and inserts a new trie node if there is no child node for the character. The method also updates the ranking of the word based on the frequency and ASCCI character value. The method then sets the is_end_of_word attribute of the last node to True and increments the frequency of the word.
 
-        Input:
-            word: a string representing the word to be inserted into the trie
+def is_compressed(source):
+    """
+    Function Description: Checks whether an input is a compressed file, by its file extension.
 
-        Output:
-            None
+    Input:
+        source: a file name, path or binary stream
 
-        Time Complexity: O(W) where W is the number of characters in the input word
+    Output:
+        compressed: a boolean representing whether the input is a file with an extension in COMPRESSED_OPENERS
 
-        Time Complexity Analysis: O(W), where W is the number of characters in the input word
-            Initiliasing the node as the root node has a constant time complexity of O(1).
-            Similarly, initialising the previous_nodes list has a constant time complexity of O(1).
-            The for loop iterates over each character in the input word leading to O(W) time complexity.
-            The _char_to_index method has a constant time complexity of O(1) leading to O(W*1), O(W) time complexity.
-            Each of creating a new trie node, assigning the new child node and appending the node to the previous_nodes list has a constant time complexity of O(1) leading to O(W*1), O(W) time complexity.
-            The for loop iterates over each node in the previous_nodes list leading to O(W+W), O(W) time complexity.
-            The insert method called inside the for loop has a time complexity of O(1) leading to O(W*1), O(W) time complexity.
-            The is_end_of_word attribute of the last node is set to True and the frequency of the word is incremented, both of which have a constant time complexity of O(1) leading to O(W*1), O(W) time complexity.
+    Time Complexity: O(L) where L is the number of characters in the file name
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+    Auxiliary Space/Space Complexity: O(L) where L is the number of characters in the file name
+    """
+    return not is_stream(source) and os.path.splitext(os.fspath(source))[1].lower() in COMPRESSED_OPENERS
 
-        Space Complexity: O(W)
 
-        Space Complexity Analysis:
-            The space for the node is fixed at a costant 1 element leading to O(1) space complexity.
-            The space for the previous_nodes list is proportional to the number of characters in the input word leading to O(W) space complexity.
+def read_chunks(source, encoding=None, chunk_size=CHUNK_SIZE):
+    """
+    Function Description: Reads the text of an input in chunks of characters, decompressing it while it is read.
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
-            
-        Auxiliary Space Complexity: O(1)
+    Approach Description: A compressed file is opened with its opener in COMPRESSED_OPENERS, which decompresses it a block at a time, so it is never decompressed to disk or held in memory as a whole. Other files are opened as they are, and an open binary stream is read from its current position. The bytes are decoded with a text wrapper, in the same way as opening the file in text mode. A stream is detached from the wrapper instead of closed, so it stays open for the caller.
 
-        Auxiliary Space Complexity Analysis:
-            The auxiliary space complexity is equal to space complexity - input size, therefore the auxiliary space complexity is O(W) - O(W) = O(1).
+    Input:
+        source: a file name, path or binary stream
+        encoding: a string representing the encoding of the input, the locale encoding used by open if None
+        chunk_size: an integer representing the number of characters to read at a time
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
-        """
-        # Initialise the node as the root node
-        node = self.root
-        # Keep track of the previous nodes to allow for backtracking of nodes
-        previous_nodes = []
-        # Iterate over each character in the word
-        for char in word:
-            # Convert the character to an index
-            index = self._char_to_index(char)
-            # If there is no trie node for the character, insert a new trie node
-            if not node.children[index]:
-                node.children[index] = TrieNode()
-            # Move to the child node
-            node = node.children[index]
-            # Keep track of the previous nodes
-            previous_nodes.append(node)
-        # Update the ranking of the word based on the frequency and ASCCI character value
-        for prefixIndex, prev_node in enumerate(previous_nodes):
-            prev_node.ranking.insert((-float('inf'), node.frequency+1, word, word[prefixIndex+1] if prefixIndex+1 < len(word) else ''))
-        # Set the is_end_of_word attribute of the last node to True and increment the frequency of the word
-        node.is_end_of_word = True
-        node.frequency += 1
+    Output:
+        chunks: a generator of strings of up to chunk_size characters
 
-    def search(self, word):
-        """
-        Function Description: Searches for a word in the Trie and returns the top 3 words based on prefix similarity, frequency and ASCCI character value.
+    Time Complexity: O(T) where T is the number of characters in the input
 
-        Approach Description: This method searches for a word in the Trie and returns the top 3 words based on prefix similarity, frequency and ASCCI character value. The method iterates over each character in the input word and checks if there is a child node for the character. If there is no child node for the character, the method returns the ranking of the previous node. If the character is the last character in the word and the node is the end of a word, the method returns the ranking of the node. The method then inserts the ranking of the previous node into the ranking of the current node.
+    Auxiliary Space/Space Complexity: O(C) where C is the chunk size
+    """
+    if is_stream(source):
+        binary = source
+    else:
+        name = os.fspath(source)
+        binary = COMPRESSED_OPENERS.get(os.path.splitext(name)[1].lower(), open)(name, 'rb')
+    file = io.TextIOWrapper(binary, encoding or locale.getpreferredencoding(False))
+    try:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        if is_stream(source):
+            file.detach()
+        else:
+            file.close()
 
-        Input:
-            word: a string representing the word to be searched in the trie
 
-        Output:
-            ranking: a Ranking object representing the top 3 words based on prefix similarity, frequency and ASCCI character value
-            None: if the exact word is found in the trie
+def tokenize_input(source, encoding=None, chunk_size=CHUNK_SIZE):
+    """
+    Function Description: Splits an input into words, a large chunk at a time.
 
-        Time Complexity: O(M) where M is the number of characters in the input word
+    Approach Description: The input is read in chunks of chunk_size characters with read_chunks and the words of each chunk are found with split_words, in the same way as SpellChecker.clean_and_split. If a chunk ends with an alphanumeric character its last word may continue in the next chunk, so it is held back and joined to the start of the next chunk.
 
-        Time Complexity Analysis: where M is the number of characters in the input word
-            The initialisation of the ranking object, node and previous_nodes has a constant time complexity of O(1).
-            The for loop iterates over each character in the input word leading to O(M) time complexity.
-            The _char_to_index method has a constant time complexity of O(1) leading to O(M*1), O(M) time complexity.
-            Initialising the ranking of the previous node has a constant time complexity of O(1) leading to O(M*1), O(M) time complexity.
-            If the full inputed word is found in the trie, or  the for loop exits early leading to O(M) time complexity.
-            Or if there are no valid suggestions the previous_nodes will only have the root node leading to O(M + 1), O(M) time complexity.
-            If there are valid suggestions, the previous_nodes will have a length of M leading to O(M + M), O(M) time complexity.
-            The for loop iterates over the previous_nodes list which can have a max length of M leading to O(M + M), O(M) time complexity.
+    Input:
+        source: a file name, path or binary stream
+        encoding: a string representing the encoding of the input, the locale encoding used by open if None
+        chunk_size: an integer representing the number of characters to read at a time
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+    Output:
+        words: a generator of lists of strings representing the words of each chunk, in the order they appear in the input
 
-        Space Complexity: O(M) where M is the number of characters in the input word
+    Time Complexity: O(T) where T is the number of characters in the input
 
-        Space Complexity Analysis:
-            The space for the ranking object is fixed at a costant 1 element leading to O(1) space complexity.
-            The space for the node is fixed at a costant 1 element leading to O(1) space complexity.
-            The space for the previous_nodes list is proportional to the number of characters in the input word leading to O(M) space complexity.
+    Time Complexity Analysis:
+        Each chunk is split in linear time, and the held back word is at most the length of the longest word, leading to O(T) time complexity.
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
-            
-        Auxiliary Space Complexity: O(1)
+    Auxiliary Space/Space Complexity: O(C) where C is the chunk size
 
-        Auxiliary Space Complexity Analysis:
-            The auxiliary space complexity is equal to space complexity - input size, therefore the auxiliary space complexity is O(M) - O(M) = O(1).
+    Auxiliary Space/Space Complexity Analysis:
+        Only one chunk and the list of its words are stored at a time, leading to O(C) space complexity.
+    """
+    partial = ''
+    for chunk in read_chunks(source, encoding, chunk_size):
+        text = partial + chunk if partial else chunk
+        words = split_words(text)
+        # Hold back the last word if it may continue in the next chunk
+        partial = words.pop() if words and text[-1].isalnum() else ''
+        yield words
+    if partial:
+        yield [partial]
+
+
+def count_input(source, encoding=None):
+    """
+    Function Description: Counts the words in an input, ordered by last occurrence.
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
-        """
-        # Initialise the node as the root node
-        node = self.root
-        index = self._char_to_index(word[0])
-        # Initialise the ranking object
-        ranking = node.children[index].ranking if node.children[index] else Ranking()
-        # Keep track of the previous nodes to allow for backtracking of nodes
-        previous_nodes = []
-        # Iterate over each character in the word
-        for charIndex, char in enumerate(word):
-            # Convert the character to an index
-            index = self._char_to_index(char)
-            # If there is no child node for the character, set the ranking to the previous nodes ranking and break
-            if not node.children[index]:
-                ranking = Ranking(node.ranking, charIndex)
-                break
-            if charIndex == len(word)-1:
-                if node.children[index].is_end_of_word:
-                    return
-                ranking = node.children[index].ranking
-                break
-            # Move to the child node
-            node = node.children[index]
-            if node.ranking.rank_count:
-                previous_nodes.append(node)
-            # If the exact word is found in the trie, return None
-            if node.is_end_of_word and charIndex == len(word)-1:
-                return
-        # Insert the ranking of the previous node into the ranking of the current node
-        for prev_node in reversed(previous_nodes):
-            if ranking.append(prev_node.ranking):
-                break
-        return ranking
+    Approach Description: A plain file in an ASCII compatible encoding is read from the end to the start with read_backwards, and the words of each chunk are counted in reverse by one Counter, which then holds the words in the order of their last occurrence from the end. Compressed files and streams can only be read from the start, so the words of each chunk from tokenize_input are counted with count_list and the counts of the chunks are merged in order with merge_counts. This function is run by the worker processes of SpellChecker.count_words for compressed files.
 
-class Ranking:
-    def __init__(self, ranking=None, depth=0):
-        """
-        Function Description: Initialises a Ranking instance.
+    Input:
+        source: a file name, path or binary stream
+        encoding: a string representing the encoding of the input, the locale encoding used by open if None
 
-        Approach Description: This method initialises the ranking list, which stores the top 3 words based on prefix similarity, frequency and ASCCI character value. The ranking list is initialised with 3 elements, each containing a tuple of the form (prefix similarity, frequency, word).
+    Output:
+        counts: a dictionary from word to frequency, ordered by the last occurrence of each word
 
-        Input:
-            ranking: a list of tuples representing the ranking of words
-            depth: an integer representing the depth of the word in the trie or the length of the prefix similarity between the input word and the word in the trie
+    Time Complexity: O(T) where T is the number of characters in the input
 
-        Output:
-            None
+    Auxiliary Space/Space Complexity: O(C + U) where C is the chunk size and U is the number of characters in the distinct words of the input
+    """
+    encoding = encoding or locale.getpreferredencoding(False)
+    if is_stream(source) or is_compressed(source) or not ascii_compatible(encoding):
+        return merge_counts(count_list(words) for words in tokenize_input(source, encoding))
+    counts = Counter()
+    for text in read_backwards(source, encoding):
+        counts.update(reversed(split_words(text)))
+    return dict(reversed(counts.items()))
 
-        Time Complexity: O(1)
 
-        Time Complexity Analysis:
-            The self.ranking initialisation iterates over a constant 3 elements leading to O(3), O(1) time complexity.
+def read_backwards(file_name, encoding=None, chunk_size=CHUNK_SIZE):
+    """
+    Function Description: Reads the text of a file in chunks of whole lines, from the end of the file to the start.
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+    Approach Description: The file is read in binary chunks of chunk_size bytes from the end. The bytes of a chunk before its first newline may be part of a line that starts in the chunk before it, so they are held back and joined to the end of the next chunk read. The chunks of a line longer than a chunk are collected in a list and joined once the start of the line is found, so a file of one long line is read in linear time. In an ASCII compatible encoding a newline byte is never part of another character, so each chunk can be decoded on its own.
 
-        Auxiliary Space/Space Complexity: O(1)
-        
-        Auxiliary Space/Space Complexity Analysis:
-            The space for the ranking list is fixed at a costant 3 elements leading to O(1) space complexity.
+    Input:
+        file_name: a string representing the name of the file
+        encoding: a string representing the encoding of the file, which must be ASCII compatible, the locale encoding used by open if None
+        chunk_size: an integer representing the number of bytes to read at a time
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
-        """
-        self.ranking = [(-float('inf'), -float('inf'), '', '')] * 3 if not ranking else [(depth, word[1], word[2], word[depth]) if word[2] else word for word in ranking]
-        self.rank_count = 0 if not ranking else len([word for word in ranking if word[2]])
+    Output:
+        texts: a generator of strings holding whole lines of the file, from the last to the first
 
-    def insert(self, word_obj):
-        """
-        Function Description: Inserts a word into the ranking list based on prefix similarity, frequency and ASCCI character value.
+    Time Complexity: O(B) where B is the number of bytes in the file
 
-        Approach Description: This method inserts a word into the ranking list based on the prefix similarity, frequency and ASCCI character value. The method first checks if the word is already in the ranking list. If the word is not in the ranking list, the method compares the word with the existing words in the ranking list. If the word has a higher frequency than the existing words, it is inserted into the ranking list. If the word has the same frequency as an existing word, the method compares the ASCCI character value of the word with the existing word. If the word has a higher ASCCI character value, it is inserted into the ranking list. The method then calls the sink method to insert the word into the ranking list.
+    Auxiliary Space/Space Complexity: O(C + L) where C is the chunk size and L is the number of bytes in the longest line
+    """
+    encoding = encoding or locale.getpreferredencoding(False)
+    with open(file_name, 'rb') as file:
+        position = file.seek(0, os.SEEK_END)
+        # The bytes held back from the chunks read after the current one, last first
+        pieces = []
+        while position > 0:
+            start = max(position - chunk_size, 0)
+            file.seek(start)
+            data = file.read(position - start)
+            position = start
+            cut = data.find(b'\n') + 1 if start else 0
+            # Keep reading until the chunk holds a whole line, joining the pieces of a long line once
+            if start and not cut:
+                pieces.append(data)
+                continue
+            pieces.append(data[cut:])
+            text = b''.join(reversed(pieces))
+            pieces = [data[:cut]]
+            if text:
+                yield text.decode(encoding)
 
-        Input:
-            word_obj: a tuple representing the word to be inserted into the ranking list
 
-        Output:
-            None
+def split_file(file_name, parts):
+    """
+    Function Description: Splits a file into byte ranges that start and end at line boundaries.
 
-        Time Complexity: O(1)
+    Approach Description: The file is cut into the given number of parts of equal size, and each cut is moved forward to just after the next newline, so no line or word is split between two ranges. Cuts that land in the same line are merged.
 
-        Time Complexity Analysis:
-            The first for loop iterates over the 3 elements in the ranking list leading to O(3), O(1) time complexity.
-            If the word is in the ranking list, the next for loop iterates over 3 elements in the ranking list leading to O(3), O(1) time complexity.
-            Comparing the third element of the word which is only one character has a constant time complexity of O(1) leading to O(3*1), O(1) time complexity.
+    Input:
+        file_name: a string representing the name of the file
+        parts: an integer representing the number of ranges to split the file into
 
-            The next for loop iterates over 3 elements in the ranking list leading to O(3), O(1) time complexity.
-            If there is an element which has a lower rank, it sinks the elements from a specific index leading to O(1) time complexity.
+    Output:
+        ranges: a list of (start, end) tuples of byte offsets covering the whole file
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios    
-            
-        Auxiliary Space/Space Complexity: O(1)
+    Time Complexity: O(P*L) where P is the number of parts and L is the number of characters in the longest line
 
-        Auxiliary Space/Space Complexity Analysis: O(1)
-            The method uses a constant amount of space to store the word_obj, leading to O(1) space complexity.
+    Auxiliary Space/Space Complexity: O(P) where P is the number of parts
+    """
+    size = os.path.getsize(file_name)
+    cuts = [0]
+    with open(file_name, 'rb') as file:
+        for part in range(1, parts):
+            position = max(size * part // parts, cuts[-1])
+            file.seek(position)
+            file.readline()
+            position = file.tell()
+            if position >= size:
+                break
+            if position > cuts[-1]:
+                cuts.append(position)
+    cuts.append(size)
+    return [(start, end) for start, end in zip(cuts, cuts[1:]) if end > start]
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
 
-        """
-        # Check if the word is already in the ranking list
-        for rankIndex, rank in enumerate(self.ranking):
-            if rank[2] == word_obj[2]:
-                # If the word exists, update the frequency and update its ranking
-                self.ranking[rankIndex] = (rank[0], word_obj[1], rank[2], rank[3])
-                for i in range(rankIndex, 0, -1):
-                    if self.ranking[i][1] > self.ranking[i-1][1]\
-                        or self.ranking[i][1] == self.ranking[i-1][1] and self.ranking[i][3] < self.ranking[i-1][3]:
-                        self.ranking[i], self.ranking[i-1] = self.ranking[i-1], self.ranking[i]
-                    return
-                return
-        # If the word is not in the ranking list, compare the word with the existing words in the ranking list
-        for i in range(3):
-            # if the word has a higher rank than an existing word, sink the existing words and insert the new word
-            if self.ranking[i][1] < word_obj[1]\
-                or self.ranking[i][1] == word_obj[1] and self.ranking[i][3] > word_obj[3]:
-                self.sink(i)
-                self.ranking[i] = word_obj
-                self.rank_count += 1 if self.rank_count < 3 else 0
-                return
-    
-    def sink(self, index):
-        """
-        Function Description: Sinks a word in the ranking list to the specified index.
+def count_range(file_name, start, end, encoding=None):
+    """
+    Function Description: Counts the words in a byte range of a file.
 
-        Approach Description: This method sinks a word in the ranking list to the specified index. The method shifts the words in the ranking list to the right to make space for the new word. The method then inserts the new word into the ranking list.
+    Approach Description: The bytes of the range are read and decoded in one go and counted with count_list, so the counts are ordered by last occurrence, in the same way as SpellChecker.count_words. This function is run by the worker processes of SpellChecker.count_words.
 
-        Input:
-            index: an integer representing the index to sink from
-        
-        Output:
-            None
+    Input:
+        file_name: a string representing the name of the file
+        start: an integer representing the byte offset of the start of the range, at a line boundary
+        end: an integer representing the byte offset of the end of the range, at a line boundary
+        encoding: a string representing the encoding of the file, the locale encoding used by open if None
 
-        Time Complexity: O(1)
+    Output:
+        counts: a dictionary from word to frequency, ordered by the last occurrence of each word
 
-        Time Complexity Analysis:
-            The method iterates over a constant 3 elements leading to O(3), O(1) time complexity.
+    Time Complexity: O(R) where R is the number of bytes in the range
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+    Auxiliary Space/Space Complexity: O(R) where R is the number of bytes in the range
+    """
+    with open(file_name, 'rb') as file:
+        file.seek(start)
+        text = file.read(end - start).decode(encoding or locale.getpreferredencoding(False))
+    return count_list(split_words(text))
 
-        Auxiliary Space/Space Complexity: O(1)
 
-        Auxiliary Space/Space Complexity Analysis:
-            The method uses a constant amount of space to store the index and the temporary variable, leading to O(1) space complexity.
-        
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
-        """
-        for i in range(2-index):
-            self.ranking[2-i] = self.ranking[1-i]
+def merge_counts(all_counts):
+    """
+    Function Description: Merges word counts of consecutive parts of the input into one.
 
-    def append(self, other_ranking):
-        """
-        Function Description: Appends the ranks from another ranking object to the end current ranking object.
+    Approach Description: The counts are merged in the order of the parts, and each word is moved to the end of the merged dictionary when it is merged. A word is therefore placed by the last part it occurs in, and by its last occurrence within that part, so the merged counts are ordered by last occurrence over the whole input.
 
-        Approach Description: This method appends the ranks from another ranking object to the end current ranking object. The method iterates over each word in the other ranking object and appends the word to the current ranking object if the word is not already in the ranking list.
+    Input:
+        all_counts: an iterable of dictionaries from word to frequency, each ordered by last occurrence, in the order of the parts
 
-        Input:
-            other_ranking: a Ranking object representing the ranking object to append to the current ranking object
+    Output:
+        counts: a dictionary from word to frequency, ordered by the last occurrence of each word
 
-        Output:
-            None
+    Time Complexity: O(U) where U is the total number of words in all the dictionaries
 
-        Time Complexity: O(1)
+    Auxiliary Space/Space Complexity: O(U) where U is the number of distinct words
+    """
+    merged = {}
+    for counts in all_counts:
+        if not merged:
+            merged = dict(counts)
+            continue
+        for word, frequency in counts.items():
+            merged[word] = merged.pop(word, 0) + frequency
+    return merged
 
-        Time Complexity Analysis:
-            The for loop iterates over each word in the other_ranking object leading to O(3), O(1) time complexity.
-            The nested for loop to check if the word is already in the ranking list has a constant time complexity of O(3) leading to O(3*3), O(1) time complexity.
-            The rest of the method has a constant time complexity of O(1) leading to O(3*1), O(1) time complexity.
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+def edit_distance(source, target, max_distance):
+    """
+    Function Description: Computes the edit distance between two words, counting insertions, deletions, substitutions and swaps of adjacent characters, up to a maximum distance.
 
-        Auxiliary Space/Space Complexity: O(1)
+    Approach Description: The characters shared at the start and the end of both words do not change the distance, so they are removed first, which leaves a few characters for most typos. If what is left is a single insertion, deletion, substitution or swap, the distance is 1, and any other difference is at least 2 edits. Otherwise the distance of the rest is computed with the optimal string alignment dynamic programming table, one row at a time. If every value of a row is over max_distance, the distance can only grow, so the method stops early.
 
-        Auxiliary Space/Space Complexity Analysis:
-            The method uses a constant amount of space to store the other_ranking object, leading to O(1) space complexity.
+    Input:
+        source: a string representing the first word
+        target: a string representing the second word
+        max_distance: an integer representing the largest distance of interest
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
-        """
-        # Iterates over each word in the other ranking object
-        for word in other_ranking.ranking:
-            if not word[2]:
-                break
-            if self.rank_count == 3:
-                return True
-            # Check if the word is already in the ranking list
-            wordExistsAlready = False
-            for i in range(3):
-                if word[2] == self.ranking[i][2]:
-                    wordExistsAlready = True
-                    break
-            # If the word is already in the ranking list, continue to the next word
-            if wordExistsAlready:
-                continue
-            # If there are no more words in the ranking list or if the current ranking list is full, break
-            # If not, insert the word into the ranking list and increment the rank count
-            self.ranking[self.rank_count] = word
-            self.rank_count += 1
+    Output:
+        distance: an integer representing the edit distance, or max_distance + 1 if it is larger than max_distance
 
-    def __getitem__(self, indicies):
-        return self.ranking[indicies]
-    
-class SpellChecker:
-    def __init__(self, file_name):
-        """
-        Function Description: Initialises the SpellChecker object by loading words from the input file
+    Time Complexity: O(S*T) where S and T are the number of characters left in the words after removing the shared start and end
 
-        Approach Description: The SpellChecker object is initialised by creating a Trie object and loading words from the input file. The load_words function is used to clean and split the input line into words, which are then inserted into the Trie object.
+    Auxiliary Space/Space Complexity: O(T) where T is the number of characters left in the target after removing the shared start and end
+    """
+    source_length = len(source)
+    target_length = len(target)
+    if source_length - target_length > max_distance or target_length - source_length > max_distance:
+        return max_distance + 1
+    # Remove the shared start and end of the words
+    limit = source_length if source_length < target_length else target_length
+    start = 0
+    while start < limit and source[start] == target[start]:
+        start += 1
+    end = 0
+    while end < limit - start and source[-1-end] == target[-1-end]:
+        end += 1
+    source_length -= start + end
+    target_length -= start + end
+    if not source_length or not target_length:
+        return source_length + target_length
+    source = source[start:start+source_length]
+    target = target[start:start+target_length]
+    # A single substitution or swap is all that is left for most typos
+    if source_length == target_length and (source_length == 1 or source_length == 2 and source == target[::-1]):
+        return 1
+    if max_distance <= 1:
+        return max_distance + 1
+    previous_row = None
+    row = list(range(len(target) + 1))
+    for i in range(1, len(source) + 1):
+        before_previous_row, previous_row = previous_row, row
+        row = [i] + [0] * len(target)
+        source_char = source[i-1]
+        for j in range(1, len(target) + 1):
+            cost = source_char != target[j-1]
+            distance = min(previous_row[j] + 1, row[j-1] + 1, previous_row[j-1] + cost)
+            # Swapping two adjacent characters counts as one edit
+            if i > 1 and j > 1 and source_char == target[j-2] and source[i-2] == target[j-1]:
+                distance = min(distance, before_previous_row[j-2] + 1)
+            row[j] = distance
+        if min(row) > max_distance:
+            return max_distance + 1
+    return min(row[-1], max_distance + 1)
+
+
+def rank_key(rank):
+    """
+    Function Description: Returns the key that orders the words of a ranking, best first.
 
-        Input:
-            file_name: a string representing the name of the input file
-
-        Output:
-            None
+    Approach Description: Words with a higher frequency rank first, then words with a lower ASCCI value of the character after the prefix, then the word whose frequency changed first.
 
-        Time Complexity: O(T) where T is the number of characters in the input file
-
-        Time Complexity Analysis: O(T), where T is the number of characters in the input file
+    Input:
+        rank: a (prefix similarity, frequency, word, next character, order) tuple
 
-        """
-        self.trie = Trie()
-        self.load_words(file_name)
+    Output:
+        key: a (-frequency, next character, order) tuple
 
-    def load_words(self, file_name):
-        """
-        Function Description: Loads words from the input file
+    Time Complexity: O(1)
 
-        Approach Description: This method loads words from the input file by opening the file and reading each line. The method then cleans and splits the line into words using the clean_and_split method. The method then inserts the words into the Trie object.
+    Auxiliary Space/Space Complexity: O(1)
+    """
+    return (-rank[1], rank[3], rank[4])
 
-        Input:
-            file_name: a string representing the name of the input file
 
-        Output:
-            None
+class TrieNode:
+    __slots__ = ('children', 'ranking', 'word_id')
 
-        Time Complexity: O(T) where T is the number of characters in the input file, N is the number of lines in the input file, W is the number of words in each line
+    def __init__(self):
+        """
+        Function Description: Initialises a TrieNode instance.
 
-        Time Complexity Analysis: O(T), where T is the number of characters in the input file
-            The open method has a constant time complexity of O(1).
-            The first for loop iterates over each line in the input file leading to O(N) time complexity.
-            The clean_and_split method has a time complexity of O(W) leading to O(N*W), O(T) time complexity.
-            The nested for loop iterates over each word in the line leading to O(N*(W+W)), O(N*W) time complexity.
-            The insert method called in the for loop has a constant time complexity of O(W) leading to O(N*(W+W)), O(N*W) time complexity.
-            The amount of lines multipled by the amount of words in each line is equal to the amount of characters in the input file leading to O(T) time complexity.
+        Approach Description: This method sets up the structure of a trie node, which is used to represent a single node in a trie. Each node can store child nodes representing subsequent characters, track word ranking based on prefix similarity and frequency, and indicate whether it is the end of a word. Words are stored once in the word table of the Trie, so the node refers to its ranked words and its own word by word id.
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+        Input: 
+            None
+        
+        Output: 
+            None
 
-        Space Complexity: O(W) where W is the number of characters in each line
+        Time Complexity: O(1)
+        
+        Time Complexity Analysis: 
+            Each of the initialisations in the method takes constant time, so the overall time complexity of the method is O(1).
 
-        Space Complexity Analysis:
-            The space for the words list is proportional to the number of characters in each line leading to O(W) space complexity.
+        Auxiliary Space/Space Complexity: O(1)
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
-            
-        Auxiliary Space Complexity: O(1)
+        Auxiliary Space/Space Complexity Analysis:
+            The self.children is None until the node has a child, leading to O(1) space complexity.
+            The self.ranking is a list of at most k word ids, leading to O(k) space complexity, where k is the rank_size of the Trie.
+            The self.word_id is an integer value, leading to O(1) space complexity.
+        """
+        # The children are None for a leaf, a dictionary from character to child for a few children, or a list indexed by the alphabet of the Trie for many children
+        self.children = None
+        # The word ids of the top ranked words below the node, best first
+        self.ranking = []
+        # The word id of the word ending at the node, -1 if no word ends at the node
+        self.word_id = -1
 
-        Auxiliary Space Complexity Analysis:
-            The auxiliary space complexity is equal to space complexity - input size, therefore the auxiliary space complexity is O(W) - O(W) = O(1).
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
-        """
-        # Load words from the input file
-        with open(file_name, 'r') as file:
-            for line in file:
-                # Clean and split the line into words
-                words = self.clean_and_split(line)
-                for word in words:
-                    self.trie.insert(word)
+class TrieVersion:
+    __slots__ = ('newer', '__weakref__')
 
-    def clean_and_split(self, line):
+    def __init__(self):
         """
-        Function Description: Cleans and splits a line into words
+        Function Description: Initialises a TrieVersion, a token for a published version of a copy-on-write Trie.
 
-        Approach Description: This method cleans and splits a line into words by iterating over each character in the line. The method ignores non-alphanumeric characters and appends alphanumeric characters to a word. The method then appends the word to a list of words.
+        Approach Description: A search holds the current token for as long as it reads the trie, and every token holds the token of the next version, so a token is only freed once no search holds it or any older token. The word ids removed in a version are freed for reuse when the token of the version before it is freed.
 
         Input:
-            line: a string representing the line to be cleaned and split into words
+            None
 
         Output:
-            words: a list of strings representing the words in the line
-
-        Time Complexity: O(W) where W is the number of characters in the input line
-
-        Time Complexity Analysis: O(W), where W is the number of characters in the input line
-            The for loop iterates over each character in the input line leading to O(W) time complexity.
-            The append method called in the for loop has a constant time complexity of O(1) leading to O(W*1), O(W) time complexity.
-
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
-
-        Space Complexity: O(W)
-
-        Space Complexity Analysis:
-            The space for the word list is proportional to the number of characters in the input line leading to O(W) space complexity.
-
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
-
-        Auxiliary Space Complexity: O(1)
+            None
 
-        Auxiliary Space Complexity Analysis:
-            The auxiliary space complexity is equal to space complexity - input size, therefore the auxiliary space complexity is O(W) - O(W) = O(1).
+        Time Complexity: O(1)
 
-            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+        Auxiliary Space/Space Complexity: O(1)
         """
-        # Initialise the word list and a string to concatenate characters to form a word
-        word = ""
-        words = []
-        for char in line:
-            # Ignore non-alphanumeric characters
-            if char.isalnum():
-                word += char 
-            # If it is the end of a word, append the word to the list of words
-            else:
-                if word:
-                    words.append(word)
-                    word = ""
-        # If there is a word at the end of the line, append the word to the list of words
-        if word:
-            words.append(word)
-        return words
+        self.newer = None
 
 
-    def check(self, input_word):
+class Trie:
+    def __init__(self, k=RANK_SIZE, weighted=False, copy_on_write=False):
         """
-        Function Description: Checks for suggestions based on the input word
+        Function Description: Initialises a Trie instance.
 
-        Approach Description: This method checks for suggestions based on the input word by searching for the input word in the Trie object. The method then returns the top 3 words based on prefix similarity, frequency and ASCCI character value.
+        Approach Description: This method creates a Trie instance, which stores the words in a trie structure. The Trie stores a reference to the root TrieNode and the number of words ranked at each node. If copy_on_write is True, insert and set_frequency never change a node that searches can reach. They copy the nodes on the path of the word into a draft version of the trie, which shares every other node with the current version, and publish replaces the root with the root of the draft in a single assignment, so searches running in other threads always see a whole version. It also stores the alphabet of the characters seen in the words, in the order they were first seen, which gives the index of each character in the nodes that store their children in a list. Every word is stored once in a word table and is referred to by its word id, which indexes the arrays of the frequency of each word and the order of its last change. The word id of a removed word is reused by the next new word, so the word table only grows with the number of words stored at once.
 
         Input:
-            input_word: a string representing the word to check for suggestions
+            k: an integer representing the number of words ranked at each node, which is the most suggestions a search returns
+            weighted: a boolean representing whether frequencies are floats, such as decayed counts, instead of integers
+            copy_on_write: a boolean representing whether changes are made to a draft version that is published with publish
 
         Output:
-            suggestions: a list of strings representing the top 3 words based on prefix similarity, frequency and ASCCI character value
+            None
 
-        Time Complexity: O(M) where M is the number of characters in the input word
+        Time Complexity: O(1)
+
+        Time Complexity Analysis:
+            The method initialises the Trie instance with a constant time complexity of O(1).
 
-        Time Complexity Analysis: O(M), where M is the number of characters in the input word
-            The search method called in the method has a time complexity of O(M) leading to O(M) time complexity.
-            Iterating over the ranking list has a constant time complexity of O(3) leading to O(3), O(1) time complexity.
-            
             The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
 
         Auxiliary Space/Space Complexity: O(1)
 
         Auxiliary Space/Space Complexity Analysis:
-            The space for the suggestions list is fixed at a costant 3 elements leading to O(1) space complexity.
+            The space for the root node is fixed at a costant 1 element leading to O(1) space complexity.
 
             The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
         """
-        # Check for suggestions based on the input word
-        ranking = self.trie.search(input_word)
-        if not ranking:
-            return []
-        return [word[2] for word in ranking.ranking if word[2]]
-    
-class PreferenceManager:
-    def __init__(self, preferences, places):
+        # Store the number of words ranked at each node
+        self.rank_size = k
+        self.root = TrieNode()
+        # The root of the draft version and the nodes copied or added since the last publish, which can be changed in place
+        self.copy_on_write = copy_on_write
+        self._draft = None
+        self._fresh = set()
+        # The word table, from word id to word and from word to word id
+        self.words = []
+        self.word_ids = {}
+        # The word ids of removed words, which are reused by new words, and with copy on write the ids removed in the draft, which are freed once no search reads an older version
+        self._free_ids = []
+        self._removed_ids = []
+        self.version = TrieVersion()
+        # The amount of times each word features in the input file and when its frequency last changed, used to break ties between words with the same frequency
+        self.frequency = array('d' if weighted else 'I')
+        self.order = array('Q')
+        # The index of each character seen in the words and the character at each index
+        self.alphabet = {}
+        self.letters = []
+        # Counts the changes to word frequencies, giving the order of each change
+        self.clock = 0
+        # The SpellStats counting the work of insert and search, or None to not count
+        self.stats = None
+
+    def _writable_root(self):
         """
-        Function Description: This function initialises the PreferenceManager object with the given preferences and places.
+        Function Description: Returns the root that insert and set_frequency change.
 
-        Approach Description: The function initialises the preferences, number of people, places, number of places, place nodes, and edges in the graph. It then creates the network for the Ford-Fulkerson algorithm and sets up the graph.
+        Approach Description: Without copy on write this is the root. Otherwise the root of the draft version is returned, copying the current root if there is no draft yet.
 
         Input:
-            preferences (list): A list of lists representing the preferences of each participant for each activity.
-            places (list): A list of integers representing the number of places available in each activity.
+            None
 
         Output:
-            None
+            root: a TrieNode representing the root to change
 
-        Time Complexity: O(n * m), where n is the number of people and m is the number of places
+        Time Complexity: O(A + k) where A is the number of characters in the alphabet and k is the size of the ranking, when the root is copied
+
+        Auxiliary Space/Space Complexity: O(A + k) where A is the number of characters in the alphabet and k is the size of the ranking, when the root is copied
         """
-        self.preferences = preferences
-        self.num_people = len(preferences)
-        self.places = places
-        self.num_places = len(places)
-        self.place_nodes = [None for _ in range(self.num_places)]
-        self.edges = self.create_network()
-        self.graph_setup()
-        self.calculate_path()
+        if not self.copy_on_write:
+            return self.root
+        if self._draft is None:
+            self._draft = self._writable(self.root)
+        return self._draft
 
-    def create_network(self):
+    def _writable(self, node):
         """
-        Function Description: This function creates the network for the Ford-Fulkerson algorithm.
+        Function Description: Returns a copy of a node that can be changed without changing a published version.
 
-        Approach Description: The function calculates the index boundaries for the leader, people, places, and sink nodes in the graph. It then adds the people, preferences, leaders, non-leaders, and sink edges to the graph.
+        Approach Description: A node copied or added since the last publish is only reachable from the draft, so it is returned as it is. Otherwise the node is copied, with its own copy of the container of its children and of its ranking, and the children themselves are shared.
 
         Input:
-            None
+            node: a TrieNode
 
         Output:
-            people_edges + preference_edges + leaders_edges + non_leadeer_edges + sink_edges (list): A list of tuples representing the edges in the graph.
+            node: a TrieNode that is only reachable from the draft
 
-        Time Complexity: O(n * m), where n is the number of people and m is the number of places
+        Time Complexity: O(C + k) where C is the size of the container of the children and k is the size of the ranking
 
-        Time Complexity Analysis:
-            The calculate_boundaries function calculates the index boundaries for the leader, people, places, and sink nodes in the graph, leading to O(1) time complexity.
-            The people edges, node addition, preference edges, leader edges, non-leader edges, and sink edges are added to the graph, leading to O(n + m + n * m + m + m + m) time complexity.
-            Since n * m is the dominant term, the overall time complexity is O(n * m)
+        Auxiliary Space/Space Complexity: O(C + k) where C is the size of the container of the children and k is the size of the ranking
+        """
+        if node in self._fresh:
+            return node
+        copy = TrieNode()
+        copy.children = node.children.copy() if node.children is not None else None
+        copy.ranking = list(node.ranking)
+        copy.word_id = node.word_id
+        self._fresh.add(copy)
+        return copy
+
+    def _writable_child(self, node, char, child):
+        """
+        Function Description: Returns a child of a draft node that can be changed, replacing the child with a copy if needed.
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        Input:
+            node: a TrieNode in the draft representing the parent
+            char: a character on the edge to the child
+            child: a TrieNode representing the child
 
-        Auxiliary Space Complexity/Space Complexity: O(n * m), where n is the number of people and m is the number of places
-        
+        Output:
+            child: a TrieNode that is only reachable from the draft
+
+        Time Complexity: O(C + k) where C is the size of the container of the children of the child and k is the size of the ranking
+
+        Auxiliary Space/Space Complexity: O(C + k) where C is the size of the container of the children of the child and k is the size of the ranking
         """
-        # Calculate the index boundaries for the leader, people, places, and sink nodes in the graph
-        boundary_leader, boundary_people, boundary_places, boundary_sink = self.calculate_boundaries()
-        # Add the people, preferences, leaders, non-leaders, and sink edges to the graph
-        people_edges = self.add_people_edges()
-        self.add_place_nodes(boundary_leader, boundary_people)
-        preference_edges = self.add_preferences(boundary_leader, boundary_people)
-        leaders_edges = self.add_leader_edges(boundary_leader, boundary_places)
-        non_leadeer_edges = self.add_non_leader_edges(boundary_people, boundary_places, boundary_leader)
-        sink_edges = self.add_sink_edges(boundary_places, boundary_sink)
-        # Return the edges in the graph
-        return people_edges + preference_edges + leaders_edges + non_leadeer_edges + sink_edges
+        copy = self._writable(child)
+        if copy is not child:
+            if type(node.children) is dict:
+                node.children[char] = copy
+            else:
+                node.children[self.alphabet[char]] = copy
+        return copy
 
-    def calculate_boundaries(self):
+    def publish(self):
         """
-        Function Description: This function calculates the beginning index of the leader, people, places, and sink nodes in the edges list.
+        Function Description: Makes the draft version the current version of the Trie.
 
-        Approach Description: The boundary for the leader accounts for the nodes for each person and the source node. The boundary for the people accounts for the nodes for each person, the source node, and the leader nodes. The boundary for the places accounts for the nodes for each person, the source node, the leader nodes, and the people nodes. The boundary for the sink accounts for the nodes for each person, the source node, the leader nodes, the people nodes, and the places nodes.
+        Approach Description: The root is replaced with the root of the draft in a single assignment, so a search either sees the whole draft or none of it. The nodes of the draft are not changed again, as the next change starts a new draft. The word ids of the words removed in the draft are only reused once no search holds the TrieVersion of the replaced version or an older one, so a search still reads the words ranked by the version it started on.
 
         Input:
             None
 
         Output:
-            boundary_leader (int): The beginning index of the leader nodes in the edges list.
-            boundary_people (int): The beginning index of the people nodes in the edges list.
-            boundary_places (int): The beginning index of the places nodes in the edges list.
-            boundary_sink (int): The beginning index of the sink nodes in the edges list.
+            None
 
         Time Complexity: O(1)
 
-        Time Complexity Analysis:
-            The addition and multiplication operations to calculate the boundaries take O(1) time.
-
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
-
-        Auxiliary Space Complexity/Space Complexity: O(1)
-
-        Auxiliary Space/Space Complexity Analysis:
-            No additional space is used to calculate the boundaries, leading to an auxiliary space complexity of O(1).
-
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        Auxiliary Space/Space Complexity: O(1)
         """
-        # Calculate the boundaries for the leader, people, places, and sink nodes
-        return self.num_people + 1,\
-            self.num_people + self.num_places + 1, \
-            2 * self.num_places + self.num_people + 1, \
-            3 * self.num_places + self.num_people + 1
+        if self._draft is not None:
+            self.root = self._draft
+            self._draft = None
+            self._fresh = set()
+            # The replaced version ranks the words removed in the draft, so their word ids are freed once no search holds it
+            replaced = self.version
+            replaced.newer = self.version = TrieVersion()
+            if self._removed_ids:
+                weakref.finalize(replaced, self._release, self._removed_ids)
+                self._removed_ids = []
 
-    def add_sink_edges(self, boundary_places, boundary_sink):
+    def _char_to_index(self, char):
         """
-        Function Description: This function adds the sink edges to the graph.
-
-        Approach Description: The function iterates over each activity and adds an edge from the activity node to the sink node with the capacity of the activity.
+        Function Description: Converts a character to its index in the alphabet of the Trie.
 
+        Approach Description: This method looks up the index of the character in the alphabet dictionary. A character that has not been seen before is added to the end of the alphabet, so any Unicode character can be stored.
+        
         Input:
-            boundary_places (int): The boundary for the places in the graph.
-            boundary_sink (int): The boundary for the sink in the graph.
+            char: a character to be converted to an index
 
         Output:
-            sink_edges (list): A list of tuples representing the sink edges in the graph.
-
-        Time Complexity: O(m), where m is the number of places
+            index: an integer representing the index of the character in the alphabet
 
+        Time Complexity: O(1)
+    
         Time Complexity Analysis:
-            The function iterates over each activity and adds an edge from the activity node to the sink node with the capacity of the activity. Therefore, the time complexity is O(m), where m is the number of places.
+            Looking up and adding to the alphabet dictionary has a constant time complexity of O(1).
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
 
-        Auxiliary Space Complexity/Space Complexity: O(m), where m is the number of places
+        Auxiliary Space/Space Complexity: O(1)
 
         Auxiliary Space/Space Complexity Analysis:
-            The function creates a list of tuples representing the sink edges in the graph, leading to an auxiliary space complexity of O(m), where m is the number of places.
+            The space for the index is fixed at a costant 1 element leading to O(1) space complexity.
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
         """
-        # Initialise a fixed size list for the sink edges
-        sink_edges = [None for _ in range(self.num_places)]
-        # Iterate over each activity and add an edge from the activity node to the sink node with the capacity of the activity
-        for activity_index in range(self.num_places):
-            sink_edges[activity_index] = ((boundary_places + activity_index, boundary_sink, self.places[activity_index]))
-        return sink_edges
+        index = self.alphabet.get(char)
+        if index is None:
+            index = self.alphabet[char] = len(self.letters)
+            self.letters.append(char)
+        return index
 
-    def add_non_leader_edges(self, boundary_people, boundary_places, boundary_leader):
+    def _child(self, node, char):
         """
-        Function Description: This function adds the non-leader edges to the graph.
+        Function Description: Finds the child of a node along the edge with the given character.
 
-        Approach Description: The function iterates over each activity and adds edges from the people and leader nodes to the activity node with the capacity of the activity minus 2.
+        Approach Description: A leaf has no children, a node with few children looks the character up in its dictionary, and a node with many children looks the index of the character up in its list.
 
         Input:
-            boundary_people (int): The boundary for the people in the graph.
-            boundary_places (int): The boundary for the places in the graph.
-            boundary_leader (int): The boundary for the leader in the graph.
+            node: a TrieNode representing the parent
+            char: a character on the edge to the child
 
         Output:
-            people_edges (list): A list of tuples representing the non-leader edges in the graph.
+            child: a TrieNode representing the child, or None if there is no such child
 
-        Time Complexity: O(m), where m is the number of places
+        Time Complexity: O(1)
 
-        Time Complexity Analysis:
-            The function iterates over each activity and adds edges from the people and leader nodes to the activity node with the capacity of the activity minus 2. Therefore, the time complexity is O(m), where m is the number of places.
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        children = node.children
+        if type(children) is dict:
+            return children.get(char)
+        if children is None:
+            return None
+        index = self.alphabet.get(char)
+        return children[index] if index is not None and index < len(children) else None
+
+    def _add_child(self, node, char):
+        """
+        Function Description: Adds a new child to a node along the edge with the given character.
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        Approach Description: The first child of a leaf is stored in a new dictionary. Once the children of a node cover enough of the alphabet that a list with a place for every character of the alphabet is smaller than the dictionary, the children are moved into a list indexed by the alphabet. The list is extended when characters are added to the alphabet after it was made.
 
-        Auxiliary Space Complexity/Space Complexity: O(m), where m is the number of places
+        Input:
+            node: a TrieNode representing the parent
+            char: a character on the edge to the new child
 
-        Auxiliary Space/Space Complexity Analysis:
-            The function creates a list of tuples representing the non-leader edges in the graph, leading to an auxiliary space complexity of O(m), where m is the number of places.
+        Output:
+            child: a TrieNode representing the new child
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
-        """
-        # Initialise a fixed size list for the non-leader edges
-        people_edges = [None for _ in range(2 * self.num_places)]
-        # Iterate over each activity and add edges from the people and leader nodes to the activity node with the capacity of the activity minus 2
-        for activity_index in range(self.num_places):
-            people_edges[2 * activity_index] = ((boundary_people + activity_index, boundary_places + activity_index, self.places[activity_index] - 2))
-            people_edges[2 * activity_index + 1] = ((boundary_leader + activity_index, boundary_people + activity_index, self.places[activity_index] - 2))
-        return people_edges
+        Time Complexity: O(1) amortised, as moving the children into a list takes O(A) time for an alphabet of A characters and only happens once the node has at least A/DENSE_FILL children
 
-    def add_leader_edges(self, boundary_leader, boundary_places):
+        Auxiliary Space/Space Complexity: O(A) where A is the number of characters in the alphabet, when the children are moved into a list
         """
-        Function Description: This function adds the leader edges to the graph.
+        child = TrieNode()
+        if self._draft is not None:
+            self._fresh.add(child)
+        index = self._char_to_index(char)
+        children = node.children
+        if children is None:
+            node.children = {char: child}
+        elif type(children) is dict:
+            children[char] = child
+            if len(children) >= SPARSE_CHILDREN and len(children) * DENSE_FILL >= len(self.letters):
+                dense = [None] * len(self.letters)
+                for other, other_child in children.items():
+                    dense[self.alphabet[other]] = other_child
+                node.children = dense
+        else:
+            if index >= len(children):
+                children.extend([None] * (len(self.letters) - len(children)))
+            children[index] = child
+        return child
+
+    def _remove_child(self, node, char):
+        """
+        Function Description: Removes the child of a node along the edge with the given character.
 
-        Approach Description: The function iterates over each activity and adds an edge from the leader node to the activity node with a capacity of 2.
+        Approach Description: The child is removed from the dictionary or the list of the node. A node left without children becomes a leaf again, and a node whose list is left mostly empty moves its children back into a dictionary.
 
         Input:
-            boundary_leader (int): The boundary for the leader in the graph.
-            boundary_places (int): The boundary for the places in the graph.
+            node: a TrieNode representing the parent
+            char: a character on the edge to the child
 
         Output:
-            leader_edges (list): A list of tuples representing the leader edges in the graph.
+            None
 
-        Time Complexity: O(m), where m is the number of places
+        Time Complexity: O(1) for a dictionary, O(A) for a list where A is the number of characters in the alphabet
 
-        Time Complexity Analysis:
-            The function iterates over each activity and adds an edge from the leader node to the activity node with a capacity of 2. Therefore, the time complexity is O(m), where m is the number of places.
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        children = node.children
+        if type(children) is dict:
+            del children[char]
+            if not children:
+                node.children = None
+            return
+        children[self.alphabet[char]] = None
+        if (len(children) - children.count(None)) * DENSE_FILL * 2 < len(self.letters):
+            node.children = {self.letters[index]: child for index, child in enumerate(children) if child} or None
+
+    def _children(self, node):
+        """
+        Function Description: Returns the children of a node.
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        Input:
+            node: a TrieNode representing the parent
 
-        Auxiliary Space Complexity/Space Complexity: O(m), where m is the number of places
+        Output:
+            children: a list of (character, child) tuples
 
-        Auxiliary Space/Space Complexity Analysis:
-            The function creates a list of tuples representing the leader edges in the graph, leading to an auxiliary space complexity of O(m), where m is the number of places.
+        Time Complexity: O(C) for a dictionary of C children, O(A) for a list where A is the number of characters in the alphabet
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        Auxiliary Space/Space Complexity: O(C) where C is the number of children of the node
         """
-        # Initialise a fixed size list for the leader edges
-        leader_edges = [None for _ in range(self.num_places)]
-        # Iterate over each activity and add an edge from the leader node to the activity node with a capacity of 2
-        for activity_index in range(self.num_places):
-            leader_edges[activity_index] = ((boundary_leader + activity_index, boundary_places + activity_index, 2))
-        return leader_edges
+        children = node.children
+        if children is None:
+            return []
+        if type(children) is dict:
+            return list(children.items())
+        letters = self.letters
+        return [(letters[index], child) for index, child in enumerate(children) if child]
 
-    def add_people_edges(self):
+    def _word_id(self, word):
         """
-        Function Description: This function adds the people edges to the graph.
+        Function Description: Returns the word id of a word, adding the word to the word table if it is new.
 
-        Approach Description: The function iterates over each person and adds an edge from the source node to the person node with a capacity of 1.
+        Input:
+            word: a string representing the word
+
+        Output:
+            word_id: an integer representing the word id of the word
+
+        Time Complexity: O(W) where W is the number of characters in the word, to hash the word
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        word_id = self.word_ids.get(word)
+        if word_id is None:
+            if self._free_ids:
+                word_id = self.word_ids[word] = self._free_ids.pop()
+                self.words[word_id] = word
+                return word_id
+            word_id = self.word_ids[word] = len(self.words)
+            self.words.append(word)
+            self.frequency.append(0)
+            self.order.append(0)
+        return word_id
+
+    def _remove_word_id(self, word):
+        """
+        Function Description: Removes a word from the word table, so its word id can be reused.
+
+        Approach Description: Without copy on write no node refers to the word id once the word is removed, so it is freed at once. With copy on write the published version still ranks the word, so the word id is only freed once no search can read that version, as publish arranges.
 
         Input:
+            word: a string representing the removed word
+
+        Output:
             None
 
+        Time Complexity: O(W) where W is the number of characters in the word, to hash the word
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        word_id = self.word_ids.pop(word)
+        if self.copy_on_write:
+            self._removed_ids.append(word_id)
+        else:
+            self._release([word_id])
+
+    def _release(self, word_ids):
+        """
+        Function Description: Frees word ids for reuse by new words.
+
+        Time Complexity: O(R) where R is the number of word ids
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        for word_id in word_ids:
+            self.words[word_id] = None
+        self._free_ids.extend(word_ids)
+
+    def _rank_insert(self, ranking, word_id, depth):
+        """
+        Function Description: Inserts a word into the ranking of a node based on frequency and ASCCI character value.
+
+        Approach Description: This method follows the same rules as Ranking.insert, working on the list of word ids of the node. The frequency and order of the word are already up to date in the arrays of the Trie, and the key of each ranked word is read from them and from the word table. The frequency of the word can only have gone up, so if the word is already ranked it is moved up to the position found by binary search among the words before it. Otherwise it is inserted at the position found by binary search if it is in the top words.
+
+        Input:
+            ranking: a list of the word ids ranked at the node, best first
+            word_id: an integer representing the word id of the word
+            depth: an integer representing the depth of the node, which gives the index of the character after the prefix
+
         Output:
-            people_edges (list): A list of tuples representing the people edges in the graph.
+            changed: a boolean representing whether the ranked words or their order changed
 
-        Time Complexity: O(n), where n is the number of people
+        Time Complexity: O(log k) where k is the size of the ranking
 
         Time Complexity Analysis:
-            The function iterates over each person and adds an edge from the source node to the person node with a capacity of 1. Therefore, the time complexity is O(n), where n is the number of people.
+            Finding the position of the word is a binary search over at most k word ids, leading to O(log k) time complexity.
+            Finding the ranked word, removing and inserting it are single list operations over at most k word ids, which are negligible for the sizes of rankings.
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        frequency = self.frequency
+        order = self.order
+        words = self.words
+        def key(ranked):
+            return (-frequency[ranked], words[ranked][depth:depth+1], order[ranked])
+        word_key = key(word_id)
+        if word_id in ranking:
+            # The frequency only goes up, so a ranked word can only move up past the words before it
+            old_index = ranking.index(word_id)
+            if not old_index or key(ranking[old_index-1]) < word_key:
+                return False
+            index = bisect_left(ranking, word_key, 0, old_index, key=key)
+            del ranking[old_index]
+            ranking.insert(index, word_id)
+            return True
+        if len(ranking) == self.rank_size and key(ranking[-1]) < word_key:
+            return False
+        ranking.insert(bisect_left(ranking, word_key, key=key), word_id)
+        if len(ranking) > self.rank_size:
+            ranking.pop()
+        return True
 
-        Auxiliary Space Complexity/Space Complexity: O(n), where n is the number of people
+    def insert(self, word):
+        """
+        Function Description: Inserts a word into the Trie.
 
-        Auxiliary Space/Space Complexity Analysis:
-            The function creates a list of tuples representing the people edges in the graph, leading to an auxiliary space complexity of O(n), where n is the number of people.
+        Approach Description: This method iterates over each character in the inputed word and inserts a new trie node if there is no child node for the character. The method then increments the frequency of the word in place in the frequency array, marks the last node as the end of the word, and updates the ranking of every node on the path based on the frequency and ASCCI character value.
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        Input:
+            word: a string representing the word to be inserted into the trie
+
+        Output:
+            changed: an integer representing the depth of the shallowest node whose ranking, children or end of word changed, or None if no search result changed
+
+        Time Complexity: O(W) where W is the number of characters in the input word
+
+        Time Complexity Analysis: O(W), where W is the number of characters in the input word
+            Initiliasing the node as the root node has a constant time complexity of O(1).
+            Similarly, initialising the previous_nodes list has a constant time complexity of O(1).
+            The for loop iterates over each character in the input word leading to O(W) time complexity.
+            The _char_to_index method has a constant time complexity of O(1) leading to O(W*1), O(W) time complexity.
+            Each of creating a new trie node, assigning the new child node and appending the node to the previous_nodes list has a constant time complexity of O(1) leading to O(W*1), O(W) time complexity.
+            The for loop iterates over each node in the previous_nodes list leading to O(W+W), O(W) time complexity.
+            The _rank_insert method called inside the for loop has a time complexity of O(log k) leading to O(W*log(k)) time complexity, which is O(W) for a constant k.
+            Incrementing the frequency of the word and setting the word id of the last node have a constant time complexity of O(1) leading to O(W+1), O(W) time complexity.
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+
+        Space Complexity: O(W)
+
+        Space Complexity Analysis:
+            The space for the node is fixed at a costant 1 element leading to O(1) space complexity.
+            The space for the previous_nodes list is proportional to the number of characters in the input word leading to O(W) space complexity.
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+            
+        Auxiliary Space Complexity: O(1)
+
+        Auxiliary Space Complexity Analysis:
+            The auxiliary space complexity is equal to space complexity - input size, therefore the auxiliary space complexity is O(W) - O(W) = O(1).
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
         """
-        # Initialise a fixed size list for the people edges
-        people_edges = [None for _ in range(self.num_people)]
-        # Iterate over each person and add an edge from the source node to the person node with a capacity of 1
-        for people_index in range(self.num_people):
-            people_edges[people_index] = ((0, people_index + 1, 1))
-        return people_edges
-    
-    def add_place_nodes(self, boundary_leader, boundary_people):
+        # Initialise the node as the root node
+        node = self._writable_root()
+        copy_on_write = self.copy_on_write
+        # Keep track of the previous nodes to allow for backtracking of nodes
+        previous_nodes = []
+        # Keep track of the shallowest node that changed
+        changed = None
+        # Count the new nodes and words and the changed rankings for the stats
+        created = new_word = updated = 0
+        # Iterate over each character in the word
+        for char in word:
+            # Find the child node for the character
+            child = self._child(node, char)
+            # If there is no trie node for the character, insert a new trie node
+            if not child:
+                child = self._add_child(node, char)
+                created += 1
+                changed = changed or len(previous_nodes) + 1
+            elif copy_on_write:
+                child = self._writable_child(node, char, child)
+            # Move to the child node
+            node = child
+            # Keep track of the previous nodes
+            previous_nodes.append(node)
+        # Mark the last node as the end of the word and increment the frequency of the word
+        if node.word_id == -1:
+            node.word_id = self._word_id(word)
+            new_word = 1
+            changed = min(changed or len(word), len(word))
+        word_id = node.word_id
+        self.frequency[word_id] += 1
+        self.order[word_id] = self.clock
+        self.clock += 1
+        # Update the ranking of the word based on the frequency and ASCCI character value
+        for prefixIndex, prev_node in enumerate(previous_nodes):
+            if self._rank_insert(prev_node.ranking, word_id, prefixIndex+1):
+                updated += 1
+                changed = min(changed or prefixIndex+1, prefixIndex+1)
+        if self.stats is not None:
+            self.stats.record(inserts=1, insert_nodes=len(previous_nodes), nodes_allocated=created, words_allocated=new_word, ranking_updates=updated)
+        return changed
+
+    def set_frequency(self, word, frequency):
         """
-        Function Description: Adds references to the leader and people nodes in the graph.
+        Function Description: Sets the frequency of a word in the Trie, adding the word if it is new and removing it if the frequency is 0.
 
-        Approach Description: Iterates over each place and adds the leader and people nodes to the list of nodes.
+        Approach Description: Only the rankings on the path of the word can change. If the frequency goes up, the word can only move up, so it is inserted into the ranking of every node on its path with _rank_insert, in the same way as insert. If the frequency goes down, the ranking of a node only changes if the word is in it, and the word may drop out in favour of a word that is not ranked yet, so those rankings are recomputed from the best words below each child with _rerank, from the deepest node to the shallowest. When a word is removed, the nodes left without any word below them are deleted and its word id is freed. The change counts as the latest occurrence of the word when breaking ties, so the Trie ends up the same as building it from the new counts.
 
         Input:
-            boundary_leader (int): The boundary for the leader in the graph.
-            boundary_people (int): The boundary for the people in the graph.
+            word: a string representing the word
+            frequency: an integer representing the new frequency of the word
 
         Output:
-            None
-        
-        Time Complexity: O(m), where m is the number of places
+            changed: an integer representing the depth of the shallowest node whose ranking, children or end of word changed, or None if no search result changed
+
+        Time Complexity: O(W*log(k)) where W is the number of characters in the word and k is the size of the ranking
 
         Time Complexity Analysis:
-            The function iterates over each place and adds the leader and people nodes to the list of nodes. Therefore, the time complexity is O(m), where m is the number of places.
+            Walking the path of the word takes O(W) time.
+            If the frequency goes up, each of the W rankings is updated in O(log(k)) time, leading to O(W*log(k)) time complexity.
+            If the frequency goes down, at most W rankings are recomputed, each from the C children of the node with k ranked words, leading to O(W*C*k*log(k)) time complexity. If words have the same frequency as the lowest ranked word of a child, the words with that frequency below the child are also visited.
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        Auxiliary Space/Space Complexity: O(W) where W is the number of characters in the word
+        """
+        if frequency < 0:
+            raise ValueError("The frequency of a word can not be negative")
+        path = []
+        root = node = self._writable_root()
+        changed = None
+        for char in word:
+            child = self._child(node, char)
+            if not child:
+                if not frequency:
+                    return
+                child = self._add_child(node, char)
+                changed = changed or len(path) + 1
+            elif self.copy_on_write:
+                child = self._writable_child(node, char, child)
+            node = child
+            path.append(node)
+        current = self.frequency[node.word_id] if node.word_id != -1 else 0
+        if not path or frequency == current:
+            return
+        decreased = frequency < current
+        word_id = self._word_id(word)
+        if current == 0 or frequency == 0:
+            changed = min(changed or len(word), len(word))
+        node.word_id = word_id if frequency else -1
+        self.frequency[word_id] = frequency
+        self.order[word_id] = self.clock
+        self.clock += 1
+        if not decreased:
+            for prefixIndex, prev_node in enumerate(path):
+                if self._rank_insert(prev_node.ranking, word_id, prefixIndex+1):
+                    changed = min(changed or prefixIndex+1, prefixIndex+1)
+            return changed
+        # Delete the nodes that no longer lead to any word
+        depth = len(path)
+        while depth and path[depth-1].word_id == -1 and not path[depth-1].children:
+            parent = path[depth-2] if depth > 1 else root
+            self._remove_child(parent, word[depth-1])
+            changed = depth
+            depth -= 1
+        # Recompute the rankings the word was in, from the deepest node to the shallowest
+        for depth in range(depth, 0, -1):
+            prev_node = path[depth-1]
+            if word_id in prev_node.ranking:
+                ranked = list(prev_node.ranking)
+                self._rerank(prev_node)
+                if prev_node.ranking != ranked:
+                    changed = min(changed or depth, depth)
+        if not frequency:
+            self._remove_word_id(word)
+        return changed
+
+    def word_frequency(self, word):
+        """
+        Function Description: Returns the frequency of a word in the Trie.
 
-        Auxiliary Space Complexity/Space Complexity: O(m), where m is the number of places
+        Input:
+            word: a string representing the word
 
-        Auxiliary Space/Space Complexity Analysis:
-            The function adds the leader and people nodes to the list of nodes, leading to an auxiliary space complexity of O(m), where m is the number of places.
+        Output:
+            frequency: a number representing the frequency of the word, 0 if it is not in the Trie
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        Time Complexity: O(W) where W is the number of characters in the word, to hash the word
+
+        Auxiliary Space/Space Complexity: O(1)
         """
-        # Iterate over each place and add the leader and people nodes to the list of nodes
-        for place_index in range(self.num_places):
-            leader = boundary_leader + place_index
-            people = boundary_people + place_index
-            self.place_nodes[place_index] = ((leader,people))
+        word_id = self.word_ids.get(word)
+        return self.frequency[word_id] if word_id is not None else 0
 
-    def add_preferences(self, boundary_leader, boundary_people):
+    def scale(self, factor):
         """
-        Function Description: This function adds the preference edges to the graph.
+        Function Description: Multiplies the frequency of every word in the Trie by a factor.
 
-        Approach Description: The function iterates over each person and their preferences for each activity. It then adds an edge from the person node to the activity node with a capacity of 1 if the person is interested in the activity and a capacity of 2 if the person is interested in leading the activity.
+        Approach Description: The rankings order words by frequency, so multiplying every frequency by the same factor keeps every ranking the same, and only the frequency array is updated. The factor should be a power of 2, so the frequencies of a weighted Trie are scaled exactly and words with the same frequency stay tied.
 
         Input:
-            boundary_leader (int): The boundary for the leader in the graph.
-            boundary_people (int): The boundary for the people in the graph.
+            factor: a number representing the factor
 
         Output:
-            preferences_edges (list): A list of tuples representing the preference edges in the graph.
+            None
 
-        Time Complexity: O(n * m), where n is the number of people and m is the number of activities
+        Time Complexity: O(U) where U is the number of words in the word table
+
+        Auxiliary Space/Space Complexity: O(U) where U is the number of words in the word table
+        """
+        self.frequency = array(self.frequency.typecode, [frequency * factor for frequency in self.frequency])
+
+    def _rerank(self, node):
+        """
+        Function Description: Recomputes the ranking of a node from the word ending at the node and the rankings of its children.
+
+        Approach Description: The ranking of a child holds every word below it with a higher frequency than its lowest ranked word. Words with the same frequency as the lowest ranked word may be missing, as the child breaks ties by its own next character, so they are only collected from the subtree with _tied_words if they could make it into the ranking of the node. The ranking is then chosen with Ranking.rank_subtree, using word ids in place of the words.
+
+        Input:
+            node: a TrieNode whose ranking is recomputed
+
+        Output:
+            None
+
+        Time Complexity: O(C*k*log(k)) where C is the number of children of the node, if there are no ties with the lowest ranked word of a child
 
         Time Complexity Analysis:
-            The counting of the amont of edges needed for the preferences takes O(n * m) time, where n is the number of people and m is the number of activities.
-            Initialising the preferences_edges list takes O(n * m) time as the list is of the same size as the amount of edges needed for the preferences.
-            The function iterates over each person and their preferences for each activity. Therefore, the time complexity is O(n * m), where n is the number of people and m is the number of activities.
+            The node has C children with k ranked words each, leading to O(C*k*log(k)) time complexity. Collecting tied words visits the nodes below the child whose best word has at least the tied frequency.
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        Auxiliary Space/Space Complexity: O(1) if there are no ties with the lowest ranked word of a child
+        """
+        frequency = self.frequency
+        order = self.order
+        children = []
+        for char, child in self._children(node):
+            children.append((char, child, [(-frequency[ranked], order[ranked], ranked) for ranked in child.ranking]))
+        own = (frequency[node.word_id], order[node.word_id], node.word_id) if node.word_id != -1 else None
+        _, ranked = Ranking.rank_subtree(own, [(char, best) for char, _, best in children], self.rank_size)
+        # The lowest key a word missing from a child would need to beat to be ranked
+        threshold = (-ranked[-1][0], ranked[-1][2]) if len(ranked) == self.rank_size else (float('inf'), '')
+        exact = False
+        for i, (char, child, best) in enumerate(children):
+            lowest = -best[-1][0]
+            if len(best) == self.rank_size and (-lowest, char) <= threshold:
+                tied = self._tied_words(child, lowest)
+                children[i] = (char, child, [rank for rank in best if rank[0] < -lowest] + tied)
+                exact = True
+        if exact:
+            _, ranked = Ranking.rank_subtree(own, [(char, best) for char, _, best in children], self.rank_size)
+        node.ranking = [rank[1] for rank in ranked]
+
+    def _tied_words(self, node, frequency):
+        """
+        Function Description: Collects the words below a node with a given frequency.
 
-        Auxiliary Space Complexity/Space Complexity: 
-            Best Case: O(n), where n is the number of people
-            Average/Worst Case: O(n * m), where n is the number of people and m is the number of activities
+        Approach Description: The nodes below the node are visited depth first, skipping the children whose best ranked word has a lower frequency, as no word below them can have the frequency.
 
-        Auxiliary Space/Space Complexity Analysis:
-            The preference_edge_count variable takes up O(1) space.
+        Input:
+            node: a TrieNode to search below
+            frequency: an integer representing the frequency of the words to collect
 
-            Best Case:
-                The preferences_edges list will at a minimum have a size of n because each participant will have at least one preference. Therefore, the auxiliary space complexity is O(n), where n is the number of people.
+        Output:
+            words: a list of (-frequency, order, word id) tuples
 
-            Average/Worst Case:
-                The preferences_edges list will have a size of n * m because each participant will have m preferences. Therefore, the auxiliary space complexity is O(n * m), where n is the number of people and m is the number of activities.
+        Time Complexity: O(N) where N is the number of nodes below the node whose best word has at least the frequency
+
+        Auxiliary Space/Space Complexity: O(N) where N is the number of nodes below the node whose best word has at least the frequency
         """
-        # Find the amount of edges needed for the preferences
-        preferences_edge_count = 0
-        for preference in self.preferences:
-            # Count the amount of 1's and 2's in the preference list
-            preferences_edge_count += preference.count(1)
-            preferences_edge_count += preference.count(2)
-        # Initialise a fixed size list for the preference edges
-        preferences_edges = [None for _ in range(preferences_edge_count)]
-        # Create an index to keep track of the current edge
-        preference_edge_index = 0
-        # Iterate over each person and their preferences for each activity
-        for person_index, preference in enumerate(self.preferences):
-            # Iterate over each activity and add an edge from the person node to the activity node with a capacity of 1 if the person is interested in the activity and a capacity of 2 if the person is interested in leading the activity
-            for activity_index, interest in enumerate(preference):
-                # Add an edge from the person node to the activity node with a capacity of 1 if the person is interested in the activity or leading the activity
-                if interest == 1:
-                    preferences_edges[preference_edge_index] = ((person_index + 1, boundary_people + activity_index, 1))
-                    preference_edge_index += 1
-                # If the person is interested in leading the activity,change the boundary to the leader node
-                elif interest == 2:
-                    preferences_edges[preference_edge_index] = ((person_index + 1, boundary_leader + activity_index, 1))
-                    preference_edge_index += 1
-        return preferences_edges
+        words = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.word_id != -1 and self.frequency[node.word_id] == frequency:
+                words.append((-frequency, self.order[node.word_id], node.word_id))
+            for _, child in self._children(node):
+                if child.ranking and self.frequency[child.ranking[0]] >= frequency:
+                    stack.append(child)
+        return words
 
-    def graph_setup(self):
+    def search(self, word):
         """
-        Function Description: This function sets up the graph for the Ford-Fulkerson algorithm.
+        Function Description: Searches for a word in the Trie and returns the top k words based on prefix similarity, frequency and ASCCI character value.
 
-        Approach Description: The function initializes the source and sink vertices and the number of vertices in the graph. It then creates an adjacency list representation of the graph and adds the edges to the graph.
+        Approach Description: This method searches for a word in the Trie and returns the top k words based on prefix similarity, frequency and ASCCI character value. The method iterates over each character in the input word and checks if there is a child node for the character, keeping track of the nodes matched so far. If there is no child node for the character, the longest prefix of the word in the trie has been found. The ranking is then built from the rankings of the matched nodes with _path_ranking, which returns None if the whole word is found and is the end of a word.
 
         Input:
-            None
+            word: a string representing the word to be searched in the trie
 
         Output:
-            None
-        
-        Time Complexity:
-            Best Case: O(n * m), where n is the number of people and m is the number of activities
-            Average/Worst Case: O(n * m), where n is the number of people and m is the number of activities
+            ranking: a Ranking object representing the top k words based on prefix similarity, frequency and ASCCI character value
+            None: if the exact word is found in the trie
+
+        Time Complexity: O(M) where M is the number of characters in the input word
+
+        Time Complexity Analysis: where M is the number of characters in the input word
+            The initialisation of the node and previous_nodes has a constant time complexity of O(1).
+            The for loop iterates over each character in the input word leading to O(M) time complexity.
+            The _child method has a constant time complexity of O(1) leading to O(M*1), O(M) time complexity.
+            The _path_ranking method iterates over the previous_nodes list which can have a max length of M leading to O(M + M), O(M) time complexity.
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+
+        Space Complexity: O(M) where M is the number of characters in the input word
+
+        Space Complexity Analysis:
+            The space for the node is fixed at a costant 1 element leading to O(1) space complexity.
+            The space for the previous_nodes list is proportional to the number of characters in the input word leading to O(M) space complexity.
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+            
+        Auxiliary Space Complexity: O(1)
+
+        Auxiliary Space Complexity Analysis:
+            The auxiliary space complexity is equal to space complexity - input size, therefore the auxiliary space complexity is O(M) - O(M) = O(1).
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+        """
+        # Only held to keep the TrieVersion alive, taken before the root, so the word ids the root ranks are not reused during the search
+        _version = self.version
+        # Initialise the node as the root node
+        node = self.root
+        # Keep track of the previous nodes to allow for backtracking of nodes
+        previous_nodes = []
+        # Iterate over each character in the word
+        for char in word:
+            # Find the child node for the character, if there is none the longest matching prefix is found
+            node = self._child(node, char)
+            if not node:
+                break
+            # Keep track of the previous nodes
+            previous_nodes.append(node)
+        if self.stats is not None:
+            self.stats.record(searches=1, search_nodes=len(previous_nodes))
+        # Build the ranking from the rankings of the previous nodes
+        return self._path_ranking(word, previous_nodes)
+
+    def search_many(self, words):
+        """
+        Function Description: Searches for many words in the Trie, reusing the path shared by consecutive words.
+
+        Approach Description: This method expects the words to be sorted, so that consecutive words share long prefixes. It keeps the nodes on the path of the previous word and only walks the characters after the prefix shared with the previous word. The ranking of each word is then built from its path in the same way as search.
+
+        Input:
+            words: an iterable of sorted strings representing the words to be searched in the trie
+
+        Output:
+            results: a generator of (word, ranking) tuples, where ranking is what search returns for the word
+
+        Time Complexity: O(S) where S is the number of characters in the words after the prefix shared with the previous word
 
         Time Complexity Analysis:
-            The for loop iterates over each edge in the input list to find the maximum vertex value. Therefore, the time complexity is O(E), where E is the number of edges.
-            The graph initilisation creates a list of lists for each vertex, leading to O(V) time complexity, where V is the number of vertices.
+            Finding the shared prefix with the previous word and walking the remaining characters takes time proportional to the characters compared, and merging the rankings of the path takes O(M) time, leading to O(S + N*M), where N is the number of words and M is the number of characters in the longest word.
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        Auxiliary Space/Space Complexity: O(M) where M is the number of characters in the longest word
+        """
+        path = []
+        previous = ''
+        # Every word is searched in the same version of the trie, whose TrieVersion is held so its word ids are not reused
+        _version = self.version
+        root = self.root
+        stats = self.stats
+        for word in words:
+            # Keep the nodes of the prefix shared with the previous word
+            shared = 0
+            limit = min(len(previous), len(word), len(path))
+            while shared < limit and previous[shared] == word[shared]:
+                shared += 1
+            del path[shared:]
+            node = path[-1] if path else root
+            for char in word[shared:]:
+                child = self._child(node, char)
+                if not child:
+                    break
+                node = child
+                path.append(node)
+            if stats is not None:
+                stats.record(searches=1, search_nodes=len(path) - shared)
+            previous = word
+            yield word, self._path_ranking(word, path)
+
+    def suggest_many(self, words):
+        """
+        Function Description: Finds the suggestions for many words in the Trie, reusing the path and the merged rankings shared by consecutive words.
 
-        Auxiliary Space Complexity/Space Complexity: O(V), where V is the number of vertices
+        Approach Description: This method expects the words to be sorted, like search_many. The suggestions of a word only depend on the deepest node its path reaches, and are the ranking of that node filled from the suggestions of the node before it, which is what _path_ranking does one node at a time. So the suggestions of every node on the path of the previous word are kept, and only the nodes after the prefix shared with the previous word are walked and merged, each from the node before it in O(k) time. A word whose path ends on a node already merged, such as a misspelling of the previous word, takes its suggestions without merging anything. Only the list of suggested words is made for each word, so the words sharing the suggestions of a node do not merge them again.
 
-        Auxiliary Space/Space Complexity Analysis:
-            The function uses a list of lists to represent the graph, leading to an auxiliary space complexity of O(V), where V is the number of vertices.
+        Input:
+            words: an iterable of sorted strings representing the words to be searched in the trie
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        Output:
+            results: a generator of (word, suggestions) tuples, where suggestions is a new list of the suggested words in rank order, which is empty if the exact word is found
+
+        Time Complexity: O(S*k) where S is the number of characters in the words after the prefix shared with the previous word and k is the size of the ranking
+
+        Auxiliary Space/Space Complexity: O(M*k) where M is the number of characters in the longest word and k is the size of the ranking
         """
-        # Find the maximum vertex value
-        vertex_max = 0
+        k = self.rank_size
+        all_words = self.words
+        stats = self.stats
+        child_of = self._child
+        path = []
+        # The word ids suggested for a path ending at each node of the path, None until they are needed
+        merged = []
+        # The word ids suggested for the last node of the path, merged once for every word ending there
+        suggested = None
+        previous = ''
+        # Every word is searched in the same version of the trie, whose TrieVersion is held so its word ids are not reused
+        _version = self.version
+        root = self.root
+        for word in words:
+            shared = 0
+            limit = min(len(previous), len(word), len(path))
+            while shared < limit and previous[shared] == word[shared]:
+                shared += 1
+            previous = word
+            if shared < len(path):
+                del path[shared:], merged[shared:]
+                suggested = None
+            node = path[-1] if path else root
+            for char in word[shared:]:
+                children = node.children
+                node = children.get(char) if type(children) is dict else child_of(node, char)
+                if not node:
+                    break
+                path.append(node)
+                merged.append(None)
+                suggested = None
+            if stats is not None:
+                stats.record(searches=1, search_nodes=len(path) - shared)
+            if not path or len(path) == len(word) and path[-1].word_id != -1:
+                yield word, []
+                continue
+            if suggested is None:
+                # Merge from the deepest node whose suggestions are known or whose ranking is full, which needs nothing from the nodes before it
+                depth = len(path) - 1
+                start = depth
+                while start and merged[start] is None and len(path[start].ranking) < k:
+                    start -= 1
+                if merged[start] is None:
+                    merged[start] = path[start].ranking
+                ranked = merged[start]
+                for i in range(start + 1, depth + 1):
+                    own = path[i].ranking
+                    # Fill the ranking from the suggestions of the node before it, skipping the words already ranked
+                    ranked = merged[i] = own if len(own) >= k else own + [word_id for word_id in ranked if word_id not in own][:k - len(own)]
+                if stats is not None:
+                    stats.record(ranking_merges=depth - start + 1)
+                suggested = ranked
+            yield word, [all_words[word_id] for word_id in suggested]
+
+    def iter_suggestions(self, word):
+        """
+        Function Description: Iterates over every suggestion for a word in the Trie, in the order of search.
+
+        Approach Description: The suggestions are the words below the deepest node matched by the word, then the words below each shallower node on the path that were not suggested yet, which is the order of search without the limit of k words. The words below a node are found with a best first search over a heap, ordered by frequency, the character after the prefix and the order of the last change. A subtree is pushed with the frequency of the best word ranked at its root, which is the highest frequency below it, and an order before every word, so it is only expanded once no word left in the heap can rank before any of its words. The first n suggestions therefore only visit the nodes on the way to them and their siblings, not the whole subtree.
+
+        Input:
+            word: a string representing the word to be searched in the trie
+
+        Output:
+            suggestions: a generator of strings representing the suggestions in rank order, which is empty if the exact word is found in the trie
+
+        Time Complexity: O(M + n*W*C*log(n*W*C)) for the first n suggestions, where M is the number of characters in the input word, W is the number of characters in the longest word and C is the number of children of a node, if the suggestions do not share frequencies
+
+        Time Complexity Analysis:
+            Walking the path of the word takes O(M) time.
+            Each suggestion expands at most the W nodes on the way to it, each pushing its C children onto the heap in O(log(n*W*C)) time. Subtrees whose best word has the same frequency as a suggestion may also need to be expanded to find the word with the earliest order.
+
+        Auxiliary Space/Space Complexity: O(n*W*C) for the first n suggestions, where W is the number of characters in the longest word and C is the number of children of a node
+        """
+        path = []
+        # Only held to keep the TrieVersion alive while the suggestions are read, so the word ids they rank are not reused
+        _version = self.version
+        node = self.root
+        for char in word:
+            node = self._child(node, char)
+            if not node:
+                break
+            path.append(node)
+        if len(path) == len(word) and path and path[-1].word_id != -1:
+            return
+        words = self.words
+        frequency = self.frequency
+        order = self.order
+        # The subtree of the deeper node on the path, whose words were already suggested
+        skip = None
+        for depth in range(len(path), 0, -1):
+            node = path[depth-1]
+            # Heap entries are (-frequency, next character, order, tie breaker, subtree or None, word id), where a subtree has order -1
+            heap = []
+            if node.word_id != -1:
+                heap.append((-frequency[node.word_id], '', order[node.word_id], 0, None, node.word_id))
+            for char, child in self._children(node):
+                if child is not skip and child.ranking:
+                    heappush(heap, (-frequency[child.ranking[0]], char, -1, len(heap), child, -1))
+            pushed = len(heap)
+            while heap:
+                _, char, _, _, subtree, word_id = heappop(heap)
+                if subtree is None:
+                    yield words[word_id]
+                    continue
+                # Expand the subtree into the word ending at its root and its children, which have the same next character
+                if subtree.word_id != -1:
+                    heappush(heap, (-frequency[subtree.word_id], char, order[subtree.word_id], 0, None, subtree.word_id))
+                for _, child in self._children(subtree):
+                    if child.ranking:
+                        pushed += 1
+                        heappush(heap, (-frequency[child.ranking[0]], char, -1, pushed, child, -1))
+            skip = node
+
+    def _path_ranking(self, word, path):
+        """
+        Function Description: Builds the ranking for a word from the nodes on its path.
+
+        Approach Description: If the whole word is on the path and is a word in the trie, there is nothing to suggest. Otherwise the word ids ranked at the deepest node on the path are copied and the remaining places are filled from the rankings of the nodes before it, from the deepest to the shallowest, skipping the words already found. Only the word ids of the result are turned into words, in a Ranking object of (prefix similarity, frequency, word, next character, order) tuples.
+
+        Input:
+            word: a string representing the searched word
+            path: a list of the TrieNodes matched by the characters of the word, starting after the root
+
+        Output:
+            ranking: a Ranking object representing the top k words based on prefix similarity, frequency and ASCCI character value
+            None: if the exact word is found in the trie
+
+        Time Complexity: O(M*k) where M is the number of nodes on the path and k is the size of the ranking
+
+        Auxiliary Space/Space Complexity: O(k) where k is the size of the ranking
+        """
+        ranking = Ranking(size=self.rank_size)
+        if not path:
+            return ranking
+        if len(path) == len(word) and path[-1].word_id != -1:
+            return
+        # The word ids of the suggestions and the depth of the node they were ranked at
+        ranked = [(word_id, len(path)) for word_id in path[-1].ranking]
+        found = set(path[-1].ranking)
+        merged = 1
+        for depth in range(len(path) - 1, 0, -1):
+            if len(ranked) >= self.rank_size:
+                break
+            # Backtrack to a shallower node on the path to fill the ranking
+            merged += 1
+            for word_id in path[depth-1].ranking:
+                if word_id not in found:
+                    ranked.append((word_id, depth))
+                    found.add(word_id)
+                    if len(ranked) >= self.rank_size:
+                        break
+        if self.stats is not None:
+            self.stats.record(ranking_merges=merged)
+        words = self.words
+        ranking.ranking = [(len(path) if depth == len(path) else -float('inf'), self.frequency[word_id], words[word_id], words[word_id][depth:depth+1], self.order[word_id]) for word_id, depth in ranked]
+        return ranking
+
+    def build(self, counts):
+        """
+        Function Description: Builds an empty Trie from word counts.
+
+        Approach Description: This method first inserts the path of every distinct word, adds the word to the word table and sets its frequency, without touching any rankings. It then visits the nodes in post order and computes the ranking of each node once from the best words below its children using Ranking.rank_subtree, using word ids in place of the words. The result is the same as inserting every occurrence of every word in order with insert.
+
+        Input:
+            counts: a dictionary from word to frequency, ordered by the last occurrence of each word
+
+        Output:
+            None
+
+        Time Complexity: O(U*W) where U is the number of distinct words and W is the number of characters in the longest word
+
+        Time Complexity Analysis:
+            Inserting the path of each distinct word takes O(W) time, leading to O(U*W) time complexity.
+            The post order traversal visits each of the at most U*W nodes once, and ranking a node takes time proportional to its number of children, which add up to the number of nodes, leading to O(U*W + U*W), O(U*W) time complexity.
+
+        Auxiliary Space/Space Complexity: O(U*W) where U is the number of distinct words and W is the number of characters in the longest word
+
+        Auxiliary Space/Space Complexity Analysis:
+            The stack and the best words of the children waiting to be ranked hold at most O(U*W) entries.
+        """
+        if self.root.children:
+            raise ValueError("build can only be used on an empty Trie")
+        for order, (word, frequency) in enumerate(counts.items()):
+            node = self.root
+            for char in word:
+                node = self._child(node, char) or self._add_child(node, char)
+            node.word_id = self._word_id(word)
+            self.frequency[node.word_id] = frequency
+            self.order[node.word_id] = order
+        self.clock = len(counts)
+        # Visit the nodes in post order, so the best words of every child are known before its parent is ranked
+        best_of = {}
+        stack = [(self.root, False)]
+        while stack:
+            node, visited = stack.pop()
+            if not visited:
+                stack.append((node, True))
+                for _, child in self._children(node):
+                    stack.append((child, False))
+                continue
+            own = (self.frequency[node.word_id], self.order[node.word_id], node.word_id) if node.word_id != -1 else None
+            children = [(char, best_of.pop(child)) for char, child in self._children(node)]
+            best, ranked = Ranking.rank_subtree(own, children, self.rank_size)
+            best_of[node] = best
+            if node is not self.root:
+                node.ranking = [rank[1] for rank in ranked]
+
+    def export_nodes(self):
+        """
+        Function Description: Iterates over the nodes of the Trie in breadth first order.
+
+        Approach Description: This method visits the nodes with a queue, starting from the root, and visits the children of each node in order of character value. For each node it yields the prefix of the node, the frequency of the word ending at the node and the ranked words with the character after the prefix. It is used to convert the Trie into other structures, such as a snapshot.
+
+        Input:
+            None
+
+        Output:
+            nodes: a generator of (prefix, frequency, ranked) tuples, where ranked is a list of (word, next character) tuples in rank order
+
+        Time Complexity: O(N) where N is the number of nodes in the trie
+
+        Time Complexity Analysis:
+            Each node is added to and removed from the queue once, and its children and k ranks are checked, leading to O(N*k) time complexity.
+
+        Auxiliary Space/Space Complexity: O(N*W) where N is the number of nodes in the trie and W is the number of characters in the longest word
+
+        Auxiliary Space/Space Complexity Analysis:
+            The queue can store the prefix of every node at the deepest level of the trie, leading to O(N*W) space complexity.
+        """
+        queue = deque([('', self.root)])
+        words = self.words
+        while queue:
+            prefix, node = queue.popleft()
+            depth = len(prefix)
+            yield prefix, self.frequency[node.word_id] if node.word_id != -1 else 0, [(words[word_id], words[word_id][depth:depth+1]) for word_id in node.ranking]
+            for char, child in sorted(self._children(node), key=lambda item: item[0]):
+                queue.append((prefix + char, child))
+
+
+class Ranking:
+    def __init__(self, ranking=None, depth=0, size=RANK_SIZE):
+        """
+        Function Description: Initialises a Ranking instance.
+
+        Approach Description: This method initialises the ranking list, which stores the top words based on prefix similarity, frequency and ASCCI character value, up to the size of the ranking. Each word is stored as a tuple of the form (prefix similarity, frequency, word, next character, order), and the list is kept sorted by rank_key, so the best word is first.
+
+        Input:
+            ranking: a list of tuples representing the ranking of words
+            depth: an integer representing the depth of the word in the trie or the length of the prefix similarity between the input word and the word in the trie
+            size: an integer representing the maximum number of words in the ranking
+
+        Output:
+            None
+
+        Time Complexity: O(k) where k is the size of the ranking
+
+        Time Complexity Analysis:
+            Copying the given ranking iterates over at most k elements leading to O(k) time complexity.
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space/Space Complexity: O(k) where k is the size of the ranking
+
+        Auxiliary Space/Space Complexity Analysis:
+            The space for the ranking list is at most k elements leading to O(k) space complexity.
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+        """
+        self.size = size if not isinstance(ranking, Ranking) else ranking.size
+        self.ranking = [] if not ranking else [(depth,) + word[1:] for word in ranking if word[2]]
+
+    @property
+    def rank_count(self):
+        return len(self.ranking)
+
+    def insert(self, word_obj, previous=None):
+        """
+        Function Description: Inserts a word into the ranking list based on prefix similarity, frequency and ASCCI character value.
+
+        Approach Description: This method inserts a word into the ranking list based on the frequency, the ASCCI character value of the next character and the order of the last change to the word. Every word has a different order, so the ranking key of each word is unique, and the ranking list is sorted by it. If the word had a frequency before, its old entry can be found by binary searching its old key, and it is removed. The word is then inserted at the position found by binary search if it is in the top words, and the word pushed past the size of the ranking is dropped.
+
+        Input:
+            word_obj: a tuple representing the word to be inserted into the ranking list
+            previous: a (frequency, order) tuple of the word before the change, or None if the word is new
+
+        Output:
+            changed: a boolean representing whether the ranked words or their order changed
+
+        Time Complexity: O(log k) where k is the size of the ranking
+
+        Time Complexity Analysis:
+            Finding the old entry and the new position are binary searches over at most k elements leading to O(log k) time complexity.
+            Removing and inserting an element of the list moves the elements after it in a single memory move, which is negligible for the sizes of rankings.
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space/Space Complexity: O(1)
+
+        Auxiliary Space/Space Complexity Analysis: O(1)
+            The method uses a constant amount of space to store the word_obj, leading to O(1) space complexity.
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+
+        """
+        ranking = self.ranking
+        old_index = None
+        # Find and remove the old entry of the word, if it is ranked
+        if previous:
+            old_index = bisect_left(ranking, (-previous[0], word_obj[3], previous[1]), key=rank_key)
+            if old_index < len(ranking) and ranking[old_index][2] == word_obj[2]:
+                del ranking[old_index]
+            else:
+                old_index = None
+        # Insert the word if it is in the top words and drop the word pushed out of the ranking
+        key = rank_key(word_obj)
+        if len(ranking) == self.size and key > rank_key(ranking[-1]):
+            return old_index is not None
+        index = bisect_left(ranking, key, key=rank_key)
+        ranking.insert(index, word_obj)
+        if len(ranking) > self.size:
+            ranking.pop()
+        return index != old_index
+
+    def append(self, other_ranking):
+        """
+        Function Description: Appends the ranks from another ranking object to the end current ranking object.
+
+        Approach Description: This method appends the ranks from another ranking object to the end current ranking object. The method iterates over each word in the other ranking object and appends the word to the current ranking object if the word is not already in the ranking list, which is checked with a set of the ranked words.
+
+        Input:
+            other_ranking: a Ranking object representing the ranking object to append to the current ranking object
+
+        Output:
+            full: a boolean representing whether the current ranking object is full
+
+        Time Complexity: O(k) where k is the size of the ranking
+
+        Time Complexity Analysis:
+            Building the set of ranked words takes O(k) time.
+            The for loop iterates over each word in the other_ranking object, checking the set in O(1) time, leading to O(k + k), O(k) time complexity.
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space/Space Complexity: O(k) where k is the size of the ranking
+
+        Auxiliary Space/Space Complexity Analysis:
+            The set of ranked words stores at most k words, leading to O(k) space complexity.
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+        """
+        ranked_words = {word[2] for word in self.ranking}
+        # Iterates over each word in the other ranking object
+        for word in other_ranking.ranking:
+            if len(self.ranking) >= self.size:
+                return True
+            # If the word is already in the ranking list, continue to the next word
+            if word[2] in ranked_words:
+                continue
+            self.ranking.append(word)
+            ranked_words.add(word[2])
+        return len(self.ranking) >= self.size
+
+    def __getitem__(self, indicies):
+        return self.ranking[indicies]
+
+    @staticmethod
+    def rank_subtree(own, children, size=RANK_SIZE):
+        """
+        Function Description: Computes the ranking of a node from the word ending at the node and the best words below each of its children.
+
+        Approach Description: Words are ranked by frequency, then by the character after the prefix, then by which word was last seen first, which is the order Ranking.insert keeps when words are inserted one occurrence at a time. Below a child every word has the same character after the prefix, so only the best k words of each child by frequency and order can be in the ranking of the node. The method returns these best k words of the whole subtree for the parent, along with the ranking of the node.
+
+        Input:
+            own: a (frequency, order, word) tuple for the word ending at the node, or None, where order is the position of the word in the counts ordered by last occurrence
+            children: a list of (character, best) tuples for each child, where best is the list returned for the child
+            size: an integer representing the size k of the ranking
+
+        Output:
+            best: a list of the best k (-frequency, order, word) tuples in the subtree of the node
+            ranked: a list of the top k (frequency, word, next character, order) tuples in rank order
+
+        Time Complexity: O(C*k*log(k)) where C is the number of children of the node and k is the size of the ranking
+
+        Time Complexity Analysis:
+            Each child contributes at most k candidates, and selecting the best k candidates with a heap takes O(C*k*log(k)) time.
+
+        Auxiliary Space/Space Complexity: O(C*k) where C is the number of children of the node and k is the size of the ranking
+        """
+        candidates = [(negative_frequency, char, order, word) for char, best in children for negative_frequency, order, word in best]
+        if own:
+            candidates.append((-own[0], '', own[1], own[2]))
+        ranked = nsmallest(size, candidates)
+        best = nsmallest(size, [(negative_frequency, order, word) for negative_frequency, _, order, word in candidates])
+        return best, [(-negative_frequency, word, char, order) for negative_frequency, char, order, word in ranked]
+    
+class ArrayTrie:
+    # The most rebuilt words kept for the rankings of later searches
+    WORD_CACHE_SIZE = 4096
+
+    def __init__(self, k=RANK_SIZE):
+        """
+        Function Description: Initialises an ArrayTrie instance.
+
+        Approach Description: The ArrayTrie stores the same information as the Trie, but instead of a TrieNode object per node it stores every node field in flat parallel arrays indexed by an integer node id. Children are kept as a first child/next sibling list, so a node only pays for the children it actually has. The top k ranking of each node is stored as k slots of word ids, where the id of a word is the id of the node where the word ends, and the frequency of a ranked word is read from the frequency array of that node. Node 0 is the root.
+
+        Input:
+            k: an integer representing the number of words ranked at each node, which is the most suggestions a search returns
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Time Complexity Analysis:
+            Creating the arrays and appending the root node has a constant time complexity of O(1).
+
+        Auxiliary Space/Space Complexity: O(1)
+
+        Auxiliary Space/Space Complexity Analysis:
+            The arrays only store the root node, leading to O(1) space complexity.
+        """
+        # The parent node and the character on the edge into each node, used to rebuild words from word ids
+        self.parent = array('i')
+        self.char = array('I')
+        # The children of each node stored as a linked list of siblings
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        # The amount of times the word ending at each node features in the input file, 0 if no word ends at the node
+        self.frequency = array('I')
+        # The top k ranking of each node, stored as word ids and the character following the prefix (0 for the end of the word)
+        self.rank_size = k
+        self.rank_word = array('i')
+        self.rank_next = array('I')
+        self._empty_words = array('i', [-1] * k)
+        self._empty_next = array('I', [0] * k)
+        # The words rebuilt for the rankings of searches by word id, which never change as nodes are only added
+        self._words = {}
+        self._add_node(-1, 0)
+
+    def __len__(self):
+        return len(self.parent)
+
+    def _add_node(self, parent, code):
+        """
+        Function Description: Appends a new node to the arrays and links it to its parent.
+
+        Approach Description: The new node is given the next free node id, its fields are appended to each array and it is pushed to the front of the sibling list of its parent.
+
+        Input:
+            parent: an integer representing the node id of the parent, -1 for the root
+            code: an integer representing the code point of the character on the edge into the node
+
+        Output:
+            node: an integer representing the node id of the new node
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        node = len(self.parent)
+        self.parent.append(parent)
+        self.char.append(code)
+        self.first_child.append(-1)
+        self.next_sibling.append(self.first_child[parent] if parent >= 0 else -1)
+        if parent >= 0:
+            self.first_child[parent] = node
+        self.frequency.append(0)
+        self.rank_word.extend(self._empty_words)
+        self.rank_next.extend(self._empty_next)
+        return node
+
+    def _child(self, node, code):
+        """
+        Function Description: Finds the child of a node along the edge with the given character.
+
+        Approach Description: The method walks the sibling list of the children of the node until it finds the child with the given character code.
+
+        Input:
+            node: an integer representing the node id of the parent
+            code: an integer representing the code point of the character
+
+        Output:
+            child: an integer representing the node id of the child, or -1 if there is no such child
+
+        Time Complexity: O(C) where C is the number of children of the node, which is at most the size of the alphabet leading to O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        char = self.char
+        next_sibling = self.next_sibling
+        child = self.first_child[node]
+        while child != -1 and char[child] != code:
+            child = next_sibling[child]
+        return child
+
+    def word(self, node):
+        """
+        Function Description: Rebuilds the word that ends at a node.
+
+        Approach Description: The method follows the parent array from the node to the root, collecting the characters on each edge, and reverses them.
+
+        Input:
+            node: an integer representing the node id (word id) of the word
+
+        Output:
+            word: a string representing the word ending at the node
+
+        Time Complexity: O(W) where W is the number of characters in the word
+
+        Auxiliary Space/Space Complexity: O(W) where W is the number of characters in the word
+        """
+        char = self.char
+        parent = self.parent
+        codes = []
+        while node > 0:
+            codes.append(char[node])
+            node = parent[node]
+        codes.reverse()
+        return ''.join(map(chr, codes))
+
+    def _rank_insert(self, node, word_id, next_code):
+        """
+        Function Description: Inserts a word into the ranking of a node based on frequency and ASCCI character value.
+
+        Approach Description: This method follows the same rules as Ranking.insert, working on the k ranking slots of the node, which are sorted by frequency and then by the character after the prefix. If the word is already ranked its frequency is already up to date in the frequency array, so it is moved up past the words it now outranks. Otherwise the word is inserted before the first word it outranks and the lower ranked words are shifted down. The position is found by binary search over the slots, and the words are shifted with a single slice assignment.
+
+        Input:
+            node: an integer representing the node id of the ranking
+            word_id: an integer representing the word id of the word to be inserted
+            next_code: an integer representing the code point of the character after the prefix plus 1, or 0 if the word ends at the node
+
+        Output:
+            changed: a boolean representing whether the ranked words or their order changed
+
+        Time Complexity: O(log k) where k is the size of the ranking
+
+        Time Complexity Analysis:
+            Finding the position of the word is a binary search over at most k slots, leading to O(log k) time complexity.
+            Finding the slot of a ranked word and shifting the slots are single array operations over at most k slots, which are negligible for the sizes of rankings.
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        rank_word = self.rank_word
+        rank_next = self.rank_next
+        frequency = self.frequency
+        base = node * self.rank_size
+        end = base + self.rank_size
+        # Empty slots are ranked after every word
+        def key(i):
+            ranked = rank_word[i]
+            return (-frequency[ranked], rank_next[i]) if ranked != -1 else (1, 0)
+        # Check if the word is already in the ranking, it can only move up past the words before it
+        try:
+            end = rank_word.index(word_id, base, end)
+            ranked = True
+        except ValueError:
+            ranked = False
+            # Most words do not make it into the ranking, which only needs the lowest ranked word to check
+            if key(end - 1) <= (-frequency[word_id], next_code):
+                return False
+        # Words with the same frequency and next character keep their order, so the word goes after them
+        i = bisect_right(range(base, end), (-frequency[word_id], next_code), key=key) + base
+        if i == end:
+            return False
+        if ranked:
+            rank_word[i+1:end+1] = rank_word[i:end]
+            rank_next[i+1:end+1] = rank_next[i:end]
+        else:
+            rank_word[i+1:end] = rank_word[i:end-1]
+            rank_next[i+1:end] = rank_next[i:end-1]
+        rank_word[i] = word_id
+        rank_next[i] = next_code
+        return True
+
+    def insert(self, word):
+        """
+        Function Description: Inserts a word into the ArrayTrie.
+
+        Approach Description: This method walks the word from the root, appending a new node for every character without a child. The frequency of the word is then incremented in the frequency array and the word is inserted into the ranking of every node on its path, in the same way as Trie.insert.
+
+        Input:
+            word: a string representing the word to be inserted into the trie
+
+        Output:
+            changed: an integer representing the depth of the shallowest node whose ranking, children or end of word changed, or None if no search result changed
+
+        Time Complexity: O(W) where W is the number of characters in the input word
+
+        Time Complexity Analysis:
+            The loop iterates over each character in the word, finding or adding the child in O(1) time, leading to O(W) time complexity.
+            The ranking of each of the W nodes on the path is updated in O(1) time, leading to O(W + W), O(W) time complexity.
+
+        Auxiliary Space Complexity: O(W) where W is the number of characters in the input word
+
+        Auxiliary Space Complexity Analysis:
+            The path list stores the W node ids on the path of the word, and at most W new nodes are added.
+        """
+        node = 0
+        path = []
+        changed = None
+        for char in word:
+            code = ord(char)
+            child = self._child(node, code)
+            if child == -1:
+                child = self._add_node(node, code)
+                changed = changed or len(path) + 1
+            node = child
+            path.append(node)
+        if not self.frequency[node]:
+            changed = min(changed or len(word), len(word))
+        self.frequency[node] += 1
+        for prefixIndex, prev_node in enumerate(path):
+            if self._rank_insert(prev_node, node, ord(word[prefixIndex+1]) + 1 if prefixIndex+1 < len(word) else 0):
+                changed = min(changed or prefixIndex+1, prefixIndex+1)
+        return changed
+
+    def ranking(self, node, depth=0):
+        """
+        Function Description: Materialises the ranking of a node as a Ranking object.
+
+        Approach Description: The word ids in the k ranking slots of the node are turned back into words and stored as (prefix similarity, frequency, word, next character) tuples, matching the rankings stored by the Trie.
+
+        Input:
+            node: an integer representing the node id
+            depth: an integer representing the prefix similarity of the ranked words
+
+        Output:
+            ranking: a Ranking object representing the top k words of the node
+
+        Time Complexity: O(k*W) where k is the size of the ranking and W is the number of characters in the longest ranked word
+
+        Auxiliary Space/Space Complexity: O(k*W) where k is the size of the ranking and W is the number of characters in the longest ranked word
+        """
+        ranked = []
+        for i in range(node * self.rank_size, (node + 1) * self.rank_size):
+            word_id = self.rank_word[i]
+            if word_id == -1:
+                break
+            next_code = self.rank_next[i]
+            ranked.append((depth, self.frequency[word_id], self.word(word_id), chr(next_code - 1) if next_code else ''))
+        return Ranking(ranked, depth, self.rank_size)
+
+    def search(self, word):
+        """
+        Function Description: Searches for a word in the ArrayTrie and returns the top k words based on prefix similarity, frequency and ASCCI character value.
+
+        Approach Description: This method walks the longest prefix of the word that is in the trie. If the whole word is in the trie as a word it returns None. Otherwise it starts with the ranking of the deepest node reached and fills the remaining places from the rankings of the nodes before it, from the deepest to the shallowest, in the same way as Trie.search.
+
+        Input:
+            word: a string representing the word to be searched in the trie
+
+        Output:
+            ranking: a Ranking object representing the top k words based on prefix similarity, frequency and ASCCI character value
+            None: if the exact word is found in the trie
+
+        Time Complexity: O(M) where M is the number of characters in the input word
+
+        Time Complexity Analysis:
+            The loop iterates over each character in the input word, finding the child in O(1) time, leading to O(M) time complexity.
+            Merging the rankings of the nodes on the path visits at most M nodes, leading to O(M + M), O(M) time complexity.
+
+        Auxiliary Space Complexity: O(M) where M is the number of characters in the input word
+        """
+        node = 0
+        path = []
+        for char in word:
+            node = self._child(node, ord(char))
+            if node == -1:
+                break
+            path.append(node)
+        return self._path_ranking(word, path)
+
+    def search_many(self, words):
+        """
+        Function Description: Searches for many words in the ArrayTrie, reusing the path shared by consecutive words.
+
+        Approach Description: This method works in the same way as Trie.search_many, keeping the node ids on the path of the previous word and only walking the characters after the prefix shared with it.
+
+        Input:
+            words: an iterable of sorted strings representing the words to be searched in the trie
+
+        Output:
+            results: a generator of (word, ranking) tuples, where ranking is what search returns for the word
+
+        Time Complexity: O(S + N*M) where S is the number of characters in the words after the prefix shared with the previous word, N is the number of words and M is the number of characters in the longest word
+
+        Auxiliary Space/Space Complexity: O(M) where M is the number of characters in the longest word
+        """
+        path = []
+        previous = ''
+        for word in words:
+            shared = 0
+            limit = min(len(previous), len(word), len(path))
+            while shared < limit and previous[shared] == word[shared]:
+                shared += 1
+            del path[shared:]
+            node = path[-1] if path else 0
+            for char in word[shared:]:
+                node = self._child(node, ord(char))
+                if node == -1:
+                    break
+                path.append(node)
+            previous = word
+            yield word, self._path_ranking(word, path)
+
+    def _path_ranking(self, word, path):
+        """
+        Function Description: Builds the ranking for a word from the node ids on its path.
+
+        Approach Description: This method works in the same way as Trie._path_ranking. The word ids in the ranking slots of the nodes on the path are merged from the deepest node to the shallowest until k words are found, skipping the words already found, and only the word ids of the result are turned back into words. A search rebuilds at most k words from the parent array, and the first WORD_CACHE_SIZE words rebuilt are kept by word id, since the suggestions of most searches are the same few frequent words.
+
+        Input:
+            word: a string representing the searched word
+            path: a list of the node ids matched by the characters of the word, starting after the root
+
+        Output:
+            ranking: a Ranking object representing the top k words based on prefix similarity, frequency and ASCCI character value
+            None: if the exact word is found in the trie
+
+        Time Complexity: O(M*k + k*W) where M is the number of nodes on the path, k is the size of the ranking and W is the number of characters in the longest ranked word
+
+        Auxiliary Space/Space Complexity: O(k*W) where k is the size of the ranking and W is the number of characters in the longest ranked word
+        """
+        if len(path) == len(word) and path and self.frequency[path[-1]]:
+            return
+        size = self.rank_size
+        rank_word = self.rank_word
+        rank_next = self.rank_next
+        # The word ids of the suggestions, the character after the prefix and the depth of the node they were ranked at
+        ranked = []
+        found = set()
+        for depth in range(len(path), 0, -1):
+            base = path[depth-1] * size
+            for i in range(base, base + size):
+                word_id = rank_word[i]
+                if word_id == -1:
+                    break
+                if word_id not in found:
+                    ranked.append((word_id, rank_next[i], depth))
+                    found.add(word_id)
+            if len(ranked) >= size:
+                break
+        ranking = Ranking(size=size)
+        words = self._words
+        for word_id, next_code, depth in ranked[:size]:
+            # The same few words are suggested over and over, so the first WORD_CACHE_SIZE rebuilt words are kept
+            text = words.get(word_id)
+            if text is None:
+                text = self.word(word_id)
+                if len(words) < self.WORD_CACHE_SIZE:
+                    words[word_id] = text
+            ranking.ranking.append((depth, self.frequency[word_id], text, chr(next_code - 1) if next_code else ''))
+        return ranking
+
+    def nbytes(self):
+        """
+        Function Description: Returns the number of bytes used by the arrays of the ArrayTrie.
+
+        Approach Description: The method sums the size of the buffer of each array.
+
+        Input:
+            None
+
+        Output:
+            nbytes: an integer representing the number of bytes used by the arrays
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        return sum(values.itemsize * len(values) for values in (self.parent, self.char, self.first_child, self.next_sibling, self.frequency, self.rank_word, self.rank_next))
+
+    def build(self, counts):
+        """
+        Function Description: Builds an empty ArrayTrie from word counts.
+
+        Approach Description: This method works in the same way as Trie.build. It appends the path of every distinct word and sets its frequency, then computes the ranking slots of each node once in post order using Ranking.rank_subtree.
+
+        Input:
+            counts: a dictionary from word to frequency, ordered by the last occurrence of each word
+
+        Output:
+            None
+
+        Time Complexity: O(U*W) where U is the number of distinct words and W is the number of characters in the longest word
+
+        Auxiliary Space/Space Complexity: O(U*W) where U is the number of distinct words and W is the number of characters in the longest word
+        """
+        if len(self) > 1:
+            raise ValueError("build can only be used on an empty ArrayTrie")
+        orders = {}
+        word_ids = {}
+        for order, (word, frequency) in enumerate(counts.items()):
+            node = 0
+            for char in word:
+                code = ord(char)
+                child = self._child(node, code)
+                if child == -1:
+                    child = self._add_node(node, code)
+                node = child
+            self.frequency[node] = frequency
+            orders[node] = (order, word)
+            word_ids[word] = node
+        # Children are always added after their parent, so visiting the node ids in reverse is a post order
+        best_of = {}
+        for node in range(len(self) - 1, 0, -1):
+            own = (self.frequency[node], orders[node][0], orders[node][1]) if node in orders else None
+            children = [(chr(self.char[child]), best_of.pop(child)) for child in self._children(node)]
+            best, ranked = Ranking.rank_subtree(own, children, self.rank_size)
+            best_of[node] = best
+            base = node * self.rank_size
+            for i, (_, word, char, _) in enumerate(ranked):
+                self.rank_word[base + i] = word_ids[word]
+                self.rank_next[base + i] = ord(char) + 1 if char else 0
+
+    def export_nodes(self):
+        """
+        Function Description: Iterates over the nodes of the ArrayTrie in breadth first order.
+
+        Approach Description: This method works in the same way as Trie.export_nodes, visiting the nodes with a queue and the children of each node in order of character value.
+
+        Input:
+            None
+
+        Output:
+            nodes: a generator of (prefix, frequency, ranked) tuples, where ranked is a list of (word, next character) tuples in rank order
+
+        Time Complexity: O(N) where N is the number of nodes in the trie
+
+        Auxiliary Space/Space Complexity: O(N*W) where N is the number of nodes in the trie and W is the number of characters in the longest word
+        """
+        queue = deque([('', 0)])
+        while queue:
+            prefix, node = queue.popleft()
+            yield prefix, self.frequency[node], [(rank[2], rank[3]) for rank in self.ranking(node).ranking if rank[2]]
+            for child in sorted(self._children(node), key=lambda child: self.char[child]):
+                queue.append((prefix + chr(self.char[child]), child))
+
+    def _children(self, node):
+        """
+        Function Description: Returns the node ids of the children of a node.
+
+        Approach Description: The method walks the sibling list of the children of the node.
+
+        Input:
+            node: an integer representing the node id
+
+        Output:
+            children: a list of integers representing the node ids of the children
+
+        Time Complexity: O(C) where C is the number of children of the node
+
+        Auxiliary Space/Space Complexity: O(C) where C is the number of children of the node
+        """
+        children = []
+        child = self.first_child[node]
+        while child != -1:
+            children.append(child)
+            child = self.next_sibling[child]
+        return children
+
+class FrozenTrie(ArrayTrie):
+    # The snapshot file starts with a header of the magic bytes, the format version, a byte order mark, the number of nodes and the ranking size
+    MAGIC = b'SPCK'
+    VERSION = 1
+    HEADER = struct.Struct('=4sIIII')
+    BYTE_ORDER_MARK = 0x01020304
+
+    def __init__(self, buffer):
+        """
+        Function Description: Initialises a read-only FrozenTrie over a snapshot buffer.
+
+        Approach Description: The snapshot stores the trie in breadth first order, so the children of a node are the consecutive node ids from child_start[node] to child_start[node+1], sorted by character value. Every array of the snapshot is a 4 byte aligned section of the buffer, and the FrozenTrie uses typed memoryviews over these sections directly, so nothing is deserialised. The header gives the length of every section, so a buffer that is too short for them, such as a truncated file, is rejected before it is read. The buffer can be bytes, a memory map of a snapshot file or shared memory. Searching works in the same way as the ArrayTrie, which the FrozenTrie inherits from.
+
+        Input:
+            buffer: a buffer holding a snapshot written by FrozenTrie.to_bytes
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Time Complexity Analysis:
+            Unpacking the header and creating the memoryviews takes constant time, leading to O(1) time complexity.
+
+        Auxiliary Space/Space Complexity: O(1)
+
+        Auxiliary Space/Space Complexity Analysis:
+            The memoryviews share the memory of the buffer, leading to O(1) space complexity.
+        """
+        if len(buffer) < self.HEADER.size:
+            raise ValueError("Not a SpellChecker snapshot")
+        magic, version, byte_order_mark, node_count, rank_size = self.HEADER.unpack_from(buffer)
+        if magic != self.MAGIC:
+            raise ValueError("Not a SpellChecker snapshot")
+        if version != self.VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}, expected {self.VERSION}")
+        if byte_order_mark != self.BYTE_ORDER_MARK:
+            raise ValueError("The snapshot was written on a machine with a different byte order")
+        sections = self._sections(node_count, rank_size)
+        # Shared memory may be rounded up to a whole page, so the buffer can be longer than the snapshot
+        if self.HEADER.size + sum(4 * length for _, length in sections) > len(buffer):
+            raise ValueError("Not a SpellChecker snapshot, it is truncated")
+        view = memoryview(buffer)
+        self._views = [view]
+        offset = self.HEADER.size
+        views = []
+        for typecode, length in sections:
+            section = view[offset:offset + 4 * length].cast(typecode)
+            self._views.append(section)
+            views.append(section)
+            offset += 4 * length
+        self.char, self.parent, self.child_start, self.frequency, self.rank_word, self.rank_next = views
+        self.rank_size = rank_size
+        self._words = {}
+
+    @staticmethod
+    def _sections(node_count, rank_size):
+        """
+        Function Description: Returns the typecode and length of each array in the snapshot, in the order they are stored.
+
+        Input:
+            node_count: an integer representing the number of nodes
+            rank_size: an integer representing the number of ranking slots per node
+
+        Output:
+            sections: a list of (typecode, length) tuples
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        return [('I', node_count), ('i', node_count), ('I', node_count + 1), ('I', node_count),
+                ('i', rank_size * node_count), ('I', rank_size * node_count)]
+
+    @classmethod
+    def to_bytes(cls, trie):
+        """
+        Function Description: Serialises a trie into the snapshot format read by the FrozenTrie.
+
+        Approach Description: The nodes of the trie are numbered in breadth first order using its export_nodes method, so the children of each node get consecutive node ids. A dictionary from prefix to node id is used to find the parent of each node and the word id of each ranked word. The rankings are stored as they are, so the decayed frequencies of a weighted Trie, which are larger than 32 bits between rescales, are scaled down to fit without changing any result. The arrays are then written after the header.
+
+        Input:
+            trie: a Trie, ArrayTrie or FrozenTrie
+
+        Output:
+            snapshot: a bytes object holding the snapshot
+
+        Time Complexity: O(N*W) where N is the number of nodes in the trie and W is the number of characters in the longest word
+
+        Time Complexity Analysis:
+            export_nodes visits each node once, and building and hashing the prefix of each node takes O(W) time, leading to O(N*W) time complexity.
+
+        Auxiliary Space/Space Complexity: O(N*W) where N is the number of nodes in the trie and W is the number of characters in the longest word
+
+        Auxiliary Space/Space Complexity Analysis:
+            The dictionary from prefix to node id stores the prefix of every node, leading to O(N*W) space complexity.
+        """
+        node_ids = {}
+        char, parent, frequencies = array('I'), array('i'), []
+        child_count = array('I')
+        ranked_nodes = []
+        for prefix, node_frequency, ranked in trie.export_nodes():
+            node = len(char)
+            node_ids[prefix] = node
+            child_count.append(0)
+            if prefix:
+                char.append(ord(prefix[-1]))
+                parent.append(node_ids[prefix[:-1]])
+                child_count[parent[-1]] += 1
+            else:
+                char.append(0)
+                parent.append(-1)
+            frequencies.append(node_frequency)
+            ranked_nodes.append(ranked)
+        # The frequencies of a weighted Trie can outgrow 32 bits between rescales, so they are scaled down to fit, keeping their order, and rounded up, so every word keeps a frequency
+        factor = min(1.0, 0xFFFFFFFF / max(max(frequencies), 1))
+        frequency = array('I', [min(0xFFFFFFFF, math.ceil(node_frequency * factor)) for node_frequency in frequencies])
+        # Children are numbered right after each other in breadth first order, starting after the root
+        child_start = array('I', [1])
+        for count in child_count:
+            child_start.append(child_start[-1] + count)
+        rank_word, rank_next = array('i'), array('I')
+        for ranked in ranked_nodes:
+            for i in range(trie.rank_size):
+                if i < len(ranked):
+                    rank_word.append(node_ids[ranked[i][0]])
+                    rank_next.append(ord(ranked[i][1]) + 1 if ranked[i][1] else 0)
+                else:
+                    rank_word.append(-1)
+                    rank_next.append(0)
+        header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, cls.BYTE_ORDER_MARK, len(char), trie.rank_size)
+        return b''.join([header] + [values.tobytes() for values in (char, parent, child_start, frequency, rank_word, rank_next)])
+
+    @classmethod
+    def open(cls, path):
+        """
+        Function Description: Opens a snapshot file as a FrozenTrie without reading it into memory.
+
+        Approach Description: The file is memory mapped read-only, so the operating system only loads the pages that are used by searches and processes that open the same file share one copy in the page cache.
+
+        Input:
+            path: a string representing the path of the snapshot file
+
+        Output:
+            trie: a FrozenTrie over the memory mapped file
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            trie = cls(mapped)
+        except ValueError:
+            mapped.close()
+            raise
+        trie._mapped = mapped
+        return trie
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Function Description: Attaches a FrozenTrie to a snapshot published in shared memory.
+
+        Approach Description: The shared memory block is opened by name and searched in place, so no part of the snapshot is copied and every process attached to the block shares the same physical pages. Before Python 3.13 opening a block registers it with the resource tracker of the process, which would remove the block when the process exits while other processes still use it, so the block is unregistered again. The process that published the block is responsible for removing it.
+
+        Input:
+            name: a string representing the name of the shared memory block
+
+        Output:
+            trie: a FrozenTrie over the shared memory block
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        try:
+            shared = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            shared = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(shared._name, 'shared_memory')
+        try:
+            trie = cls(shared.buf)
+        except ValueError:
+            shared.close()
+            raise
+        trie._shared_memory = shared
+        return trie
+
+    def close(self):
+        """
+        Function Description: Releases the memoryviews over the buffer and closes the memory map or the shared memory block, if the FrozenTrie was opened from a file or attached to shared memory.
+
+        Input:
+            None
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        self.char = self.parent = self.child_start = self.frequency = self.rank_word = self.rank_next = None
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        mapped = getattr(self, '_mapped', None)
+        if mapped is not None:
+            mapped.close()
+            self._mapped = None
+        shared = getattr(self, '_shared_memory', None)
+        if shared is not None:
+            shared.close()
+            self._shared_memory = None
+
+    def _child(self, node, code):
+        """
+        Function Description: Finds the child of a node along the edge with the given character.
+
+        Approach Description: The children of the node are consecutive node ids sorted by character value, so the method binary searches their characters.
+
+        Input:
+            node: an integer representing the node id of the parent
+            code: an integer representing the code point of the character
+
+        Output:
+            child: an integer representing the node id of the child, or -1 if there is no such child
+
+        Time Complexity: O(log C) where C is the number of children of the node
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        end = self.child_start[node + 1]
+        child = bisect_left(self.char, code, self.child_start[node], end)
+        return child if child < end and self.char[child] == code else -1
+
+    def _children(self, node):
+        return list(range(self.child_start[node], self.child_start[node + 1]))
+
+    def insert(self, word):
+        raise TypeError("A FrozenTrie is read-only")
+
+    def build(self, counts):
+        raise TypeError("A FrozenTrie is read-only")
+
+    def nbytes(self):
+        return sum(values.nbytes for values in (self.char, self.parent, self.child_start, self.frequency, self.rank_word, self.rank_next))
+
+
+class RadixNode:
+    __slots__ = ('label', 'children', 'ranking', 'edge_ranking', 'is_end_of_word', 'frequency', 'order')
+
+    def __init__(self, label, rank_size=RANK_SIZE):
+        """
+        Function Description: Initialises a RadixNode instance.
+
+        Approach Description: A RadixNode stands for the end of an edge labelled with one or more characters, which replaces a chain of TrieNodes that each have a single child and no word ending at them. It stores the ranking of the prefix ending at the node and, if the label has more than one character, the ranking shared by the prefixes inside the edge. Every word below a prefix inside the edge has the same character after the prefix, so these prefixes rank the same words in the same order.
+
+        Input:
+            label: a string representing the characters on the edge into the node
+            rank_size: an integer representing the number of words ranked at the node
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        self.label = label
+        # The children are None for a leaf or a dictionary from the first character of their label to the child
+        self.children = None
+        self.ranking = Ranking(size=rank_size)
+        # The ranking of the prefixes inside the edge, None if the label is a single character
+        self.edge_ranking = Ranking(size=rank_size) if len(label) > 1 else None
+        self.is_end_of_word = False
+        self.frequency = 0
+        self.order = 0
+
+
+class RadixTrie:
+    def __init__(self, k=RANK_SIZE):
+        """
+        Function Description: Initialises a RadixTrie instance.
+
+        Approach Description: The RadixTrie stores the same words as the Trie, but every chain of nodes with a single child and no word ending at them is collapsed into one edge labelled with a string, which is stored in a RadixNode. Long and rare words, such as URLs and hashes, therefore take a single node instead of a node per character. Searches follow the edges one character at a time, so a search gives the same suggestions as the Trie, including filling the ranking from the prefixes before the deepest matched one.
+
+        Input:
+            k: an integer representing the number of words ranked at each node, which is the most suggestions a search returns
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        self.rank_size = k
+        self.root = RadixNode('', k)
+        self.node_count = 1
+        # Counts the changes to word frequencies, giving the order of each change
+        self.clock = 0
+
+    def __len__(self):
+        return self.node_count
+
+    def _insert_path(self, word):
+        """
+        Function Description: Makes sure a word ends at a RadixNode, adding and splitting edges as needed.
+
+        Approach Description: The edges matching the word are followed from the root. If the word leaves an edge part way, the edge is split in two at that point with a new RadixNode, whose ranking is made from the ranking shared by the prefixes inside the edge, as the words below the split all have the same next character. If the word goes on past the last matching node, a single leaf is added with the rest of the word as its label.
+
+        Input:
+            word: a string representing the word
+
+        Output:
+            node: the RadixNode where the word ends
+            path: a list of (RadixNode, depth) tuples for each node on the path of the word after the root, where depth is the number of characters before the label of the node
+            changed: an integer representing the depth of the first new character node, or None if no node was added
+
+        Time Complexity: O(W) where W is the number of characters in the word
+
+        Auxiliary Space/Space Complexity: O(W) where W is the number of characters in the word
+        """
+        node = self.root
+        path = []
+        changed = None
+        depth = 0
+        while depth < len(word):
+            child = node.children.get(word[depth]) if node.children else None
+            if not child:
+                child = RadixNode(word[depth:], self.rank_size)
+                if node.children is None:
+                    node.children = {}
+                node.children[word[depth]] = child
+                self.node_count += 1
+                changed = changed or depth + 1
+            label = child.label
+            shared = 1
+            limit = min(len(label), len(word) - depth)
+            while shared < limit and label[shared] == word[depth + shared]:
+                shared += 1
+            if shared < len(label):
+                child = self._split(node, child, shared)
+            path.append((child, depth))
+            node = child
+            depth += shared
+        return node, path, changed
+
+    def _split(self, parent, child, length):
+        """
+        Function Description: Splits the edge into a RadixNode after the first length characters of its label.
+
+        Input:
+            parent: the RadixNode above the edge
+            child: the RadixNode at the end of the edge
+            length: an integer representing the number of characters of the label before the split
+
+        Output:
+            middle: the new RadixNode at the split
+
+        Time Complexity: O(k + L) where k is the size of the ranking and L is the number of characters in the label
+
+        Auxiliary Space/Space Complexity: O(k + L) where k is the size of the ranking and L is the number of characters in the label
+        """
+        label = child.label
+        middle = RadixNode(label[:length], self.rank_size)
+        ranked = child.edge_ranking.ranking
+        middle.ranking.ranking = [rank[:3] + (label[length],) + rank[4:] for rank in ranked]
+        if middle.edge_ranking is not None:
+            middle.edge_ranking.ranking = list(ranked)
+        child.label = label[length:]
+        if len(child.label) == 1:
+            child.edge_ranking = None
+        middle.children = {child.label[0]: child}
+        parent.children[label[0]] = middle
+        self.node_count += 1
+        return middle
+
+    def insert(self, word):
+        """
+        Function Description: Inserts a word into the RadixTrie.
+
+        Approach Description: The path of the word is made with _insert_path, then the word is inserted into the ranking of each node on its path, and into the ranking inside the edge of each node with a label of more than one character, in the same way as Trie.insert. Words inside an edge all have the same next character, so it is left empty in the rankings inside edges.
+
+        Input:
+            word: a string representing the word to be inserted into the trie
+
+        Output:
+            changed: an integer representing the depth of the shallowest node whose ranking, children or end of word changed, or None if no search result changed
+
+        Time Complexity: O(W*log(k)) where W is the number of characters in the word and k is the size of the ranking
+
+        Auxiliary Space/Space Complexity: O(W) where W is the number of characters in the word
+        """
+        node, path, changed = self._insert_path(word)
+        previous = (node.frequency, node.order) if node.is_end_of_word else None
+        frequency = node.frequency + 1
+        for prev_node, depth in path:
+            if prev_node.edge_ranking is not None and prev_node.edge_ranking.insert((-float('inf'), frequency, word, '', self.clock), previous):
+                changed = min(changed or depth + 1, depth + 1)
+            end = depth + len(prev_node.label)
+            if prev_node.ranking.insert((-float('inf'), frequency, word, word[end] if end < len(word) else '', self.clock), previous):
+                changed = min(changed or end, end)
+        if not node.is_end_of_word:
+            changed = min(changed or len(word), len(word))
+        node.is_end_of_word = True
+        node.frequency = frequency
+        node.order = self.clock
+        self.clock += 1
+        return changed
+
+    def _walk(self, word, path):
+        """
+        Function Description: Extends the path of a word by following the edges matching the rest of its characters.
+
+        Input:
+            word: a string representing the searched word
+            path: a list of (RadixNode, offset) tuples for the characters of the word already matched, where offset is the number of characters of the label of the node matched
+
+        Output:
+            None
+
+        Time Complexity: O(M) where M is the number of characters in the word
+
+        Auxiliary Space/Space Complexity: O(M) where M is the number of characters in the word
+        """
+        node, offset = path[-1] if path else (self.root, 0)
+        for char in word[len(path):]:
+            if offset < len(node.label):
+                if node.label[offset] != char:
+                    break
+                offset += 1
+            else:
+                child = node.children.get(char) if node.children else None
+                if not child:
+                    break
+                node, offset = child, 1
+            path.append((node, offset))
+
+    def search(self, word):
+        """
+        Function Description: Searches for a word in the RadixTrie and returns the top k words based on prefix similarity, frequency and ASCCI character value.
+
+        Approach Description: This method walks the longest prefix of the word that is in the trie, one character at a time, and builds the ranking from the matched prefixes with _path_ranking.
+
+        Input:
+            word: a string representing the word to be searched in the trie
+
+        Output:
+            ranking: a Ranking object representing the top k words based on prefix similarity, frequency and ASCCI character value
+            None: if the exact word is found in the trie
+
+        Time Complexity: O(M) where M is the number of characters in the input word
+
+        Auxiliary Space/Space Complexity: O(M) where M is the number of characters in the input word
+        """
+        path = []
+        self._walk(word, path)
+        return self._path_ranking(word, path)
+
+    def search_many(self, words):
+        """
+        Function Description: Searches for many words in the RadixTrie, reusing the path shared by consecutive words.
+
+        Approach Description: This method works in the same way as Trie.search_many, keeping the path of the previous word and only walking the characters after the prefix shared with it.
+
+        Input:
+            words: an iterable of sorted strings representing the words to be searched in the trie
+
+        Output:
+            results: a generator of (word, ranking) tuples, where ranking is what search returns for the word
+
+        Time Complexity: O(S + N*M) where S is the number of characters in the words after the prefix shared with the previous word, N is the number of words and M is the number of characters in the longest word
+
+        Auxiliary Space/Space Complexity: O(M) where M is the number of characters in the longest word
+        """
+        path = []
+        previous = ''
+        for word in words:
+            shared = 0
+            limit = min(len(previous), len(word), len(path))
+            while shared < limit and previous[shared] == word[shared]:
+                shared += 1
+            del path[shared:]
+            self._walk(word, path)
+            previous = word
+            yield word, self._path_ranking(word, path)
+
+    def iter_suggestions(self, word):
+        """
+        Function Description: Iterates over every suggestion for a word in the RadixTrie, in the order of search.
+
+        Approach Description: This method works in the same way as Trie.iter_suggestions, using the frequency of the best word ranked at a RadixNode as the highest frequency below it. A prefix inside an edge has the same words below it as the node at the end of the edge, which all have the same next character, so its words are found from the node, and the prefixes inside an edge only need to be visited once.
+
+        Input:
+            word: a string representing the word to be searched in the trie
+
+        Output:
+            suggestions: a generator of strings representing the suggestions in rank order, which is empty if the exact word is found in the trie
+
+        Time Complexity: O(M + n*E*C*log(n*E*C)) for the first n suggestions, where M is the number of characters in the input word, E is the number of edges in the longest word and C is the number of children of a node, if the suggestions do not share frequencies
+
+        Auxiliary Space/Space Complexity: O(n*E*C) for the first n suggestions, where E is the number of edges in the longest word and C is the number of children of a node
+        """
+        path = []
+        self._walk(word, path)
+        if path:
+            node, offset = path[-1]
+            if len(path) == len(word) and offset == len(node.label) and node.is_end_of_word:
+                return
+        skip = None
+        for depth in range(len(path), 0, -1):
+            node, offset = path[depth-1]
+            heap = []
+            if offset < len(node.label):
+                # Every word below a prefix inside the edge is below the node
+                if node is not skip:
+                    heap.append((-node.ranking.ranking[0][1], node.label[offset], -1, 0, node, ''))
+            else:
+                if node.is_end_of_word:
+                    heap.append((-node.frequency, '', node.order, 0, None, ''))
+                for char, child in (node.children or {}).items():
+                    if child is not skip and child.ranking.ranking:
+                        heappush(heap, (-child.ranking.ranking[0][1], char, -1, len(heap), child, ''))
+            pushed = len(heap)
+            # Heap entries are (-frequency, next character, order, tie breaker, subtree or None, suffix), where a subtree has order -1 and the suffix is the part of the word after the end of the node
+            prefix = word[:depth - offset] + node.label
+            while heap:
+                _, char, _, _, subtree, suffix = heappop(heap)
+                if subtree is None:
+                    yield prefix + suffix
+                    continue
+                if subtree is not node:
+                    suffix += subtree.label
+                if subtree.is_end_of_word:
+                    heappush(heap, (-subtree.frequency, char, subtree.order, 0, None, suffix))
+                for child in (subtree.children or {}).values():
+                    if child.ranking.ranking:
+                        pushed += 1
+                        heappush(heap, (-child.ranking.ranking[0][1], char, -1, pushed, child, suffix))
+            skip = node
+
+    def _path_ranking(self, word, path):
+        """
+        Function Description: Builds the ranking for a word from the prefixes on its path.
+
+        Approach Description: This method works in the same way as Trie._path_ranking. The ranking of each matched prefix is the ranking of its node if the prefix ends at the node, or the ranking inside the edge otherwise. The prefixes inside an edge share one ranking, which only needs to be merged once.
+
+        Input:
+            word: a string representing the searched word
+            path: a list of (RadixNode, offset) tuples for each matched character of the word
+
+        Output:
+            ranking: a Ranking object representing the top k words based on prefix similarity, frequency and ASCCI character value
+            None: if the exact word is found in the trie
+
+        Time Complexity: O(M + E*k) where M is the number of characters in the word, E is the number of edges on the path and k is the size of the ranking
+
+        Auxiliary Space/Space Complexity: O(k) where k is the size of the ranking
+        """
+        if not path:
+            return Ranking(size=self.rank_size)
+        node, offset = path[-1]
+        if len(path) == len(word) and offset == len(node.label) and node.is_end_of_word:
+            return
+        merged = node.ranking if offset == len(node.label) else node.edge_ranking
+        ranking = Ranking(merged, len(path))
+        for depth in range(len(path) - 1, 0, -1):
+            node, offset = path[depth-1]
+            prefix_ranking = node.ranking if offset == len(node.label) else node.edge_ranking
+            if prefix_ranking is merged:
+                continue
+            merged = prefix_ranking
+            if ranking.append(prefix_ranking):
+                break
+        return ranking
+
+    def build(self, counts):
+        """
+        Function Description: Builds an empty RadixTrie from word counts.
+
+        Approach Description: This method works in the same way as Trie.build. The path of every distinct word is made with _insert_path and its frequency is set, then the rankings of each node are computed once in post order using Ranking.rank_subtree. The best words of the subtree returned by rank_subtree are the ranking inside the edge of the node, as the words below a prefix inside the edge all have the same next character.
+
+        Input:
+            counts: a dictionary from word to frequency, ordered by the last occurrence of each word
+
+        Output:
+            None
+
+        Time Complexity: O(U*W) where U is the number of distinct words and W is the number of characters in the longest word
+
+        Auxiliary Space/Space Complexity: O(U*W) where U is the number of distinct words and W is the number of characters in the longest word
+        """
+        if self.root.children:
+            raise ValueError("build can only be used on an empty RadixTrie")
+        for order, (word, frequency) in enumerate(counts.items()):
+            node, _, _ = self._insert_path(word)
+            node.is_end_of_word = True
+            node.frequency = frequency
+            node.order = order
+        self.clock = len(counts)
+        best_of = {}
+        stack = [(self.root, '', False)]
+        while stack:
+            node, prefix, visited = stack.pop()
+            if not visited:
+                stack.append((node, prefix, True))
+                for child in (node.children or {}).values():
+                    stack.append((child, prefix + child.label, False))
+                continue
+            own = (node.frequency, node.order, prefix) if node.is_end_of_word else None
+            children = [(char, best_of.pop(child)) for char, child in (node.children or {}).items()]
+            best, ranked = Ranking.rank_subtree(own, children, self.rank_size)
+            best_of[node] = best
+            if node is not self.root:
+                node.ranking.ranking = [(-float('inf'),) + rank for rank in ranked]
+                if node.edge_ranking is not None:
+                    node.edge_ranking.ranking = [(-float('inf'), -negative_frequency, word, '', order) for negative_frequency, order, word in best]
+
+    def export_nodes(self):
+        """
+        Function Description: Iterates over the nodes of the uncompressed trie in breadth first order.
+
+        Approach Description: This method works in the same way as Trie.export_nodes, but every prefix inside an edge is yielded as a node of its own with the ranking inside the edge, so the output is the same as for a Trie with the same words.
+
+        Input:
+            None
+
+        Output:
+            nodes: a generator of (prefix, frequency, ranked) tuples, where ranked is a list of (word, next character) tuples in rank order
+
+        Time Complexity: O(N*k) where N is the number of nodes in the uncompressed trie and k is the size of the ranking
+
+        Auxiliary Space/Space Complexity: O(N*W) where N is the number of nodes in the uncompressed trie and W is the number of characters in the longest word
+        """
+        queue = deque([('', self.root, 0)])
+        while queue:
+            prefix, node, offset = queue.popleft()
+            if offset < len(node.label):
+                next_char = node.label[offset]
+                yield prefix, 0, [(rank[2], next_char) for rank in node.edge_ranking.ranking]
+                queue.append((prefix + next_char, node, offset + 1))
+                continue
+            yield prefix, node.frequency, [(rank[2], rank[3]) for rank in node.ranking.ranking]
+            for char, child in sorted((node.children or {}).items()):
+                queue.append((prefix + char, child, 1))
+
+
+class SortedArray:
+    def __init__(self, k=RANK_SIZE):
+        """
+        Function Description: Initialises an empty read-only SortedArray, which is filled once with build.
+
+        Approach Description: The SortedArray stores the words in sorted order, concatenated into one string with an array of the offset of each word, and the frequency and order of each word in parallel arrays, so a word costs a few bytes beyond its characters instead of the objects of a trie node per character. The words starting with a prefix are a contiguous range of the array, found by binary search. The ranking of a prefix is found by scanning its range, except for prefixes of more than SORTED_SCAN_LIMIT words, which are few and near the root, whose top k word indices are precomputed in a sparse table keyed by the start of the range and the length of the prefix. The word index of a word is its position in the sorted array.
+
+        Input:
+            k: an integer representing the number of words ranked for each prefix, which is the most suggestions a search returns
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        self.rank_size = k
+        self.text = ''
+        self.offsets = array('Q', [0])
+        self.frequency = array('I')
+        self.order = array('I')
+        # The sorted keys (start of range << 16 | prefix length) of the stored rankings, and k word indices for each key
+        self.table_keys = array('Q')
+        self.table_words = array('I')
+        # Prefixes of more words than this have a stored ranking, which always has k words
+        self.scan_limit = max(SORTED_SCAN_LIMIT, k)
+
+    def __len__(self):
+        return len(self.frequency)
+
+    def insert(self, word):
+        raise TypeError("A SortedArray is read-only, build it from word counts")
+
+    def set_frequency(self, word, frequency):
+        raise TypeError("A SortedArray is read-only, build it from word counts")
+
+    def _word(self, index):
+        """
+        Function Description: Returns the word at an index of the sorted array.
+
+        Input:
+            index: an integer representing the word index
+
+        Output:
+            word: a string representing the word
+
+        Time Complexity: O(W) where W is the number of characters in the word
+
+        Auxiliary Space/Space Complexity: O(W) where W is the number of characters in the word
+        """
+        return self.text[self.offsets[index]:self.offsets[index+1]]
+
+    def _char(self, index, depth):
+        """
+        Function Description: Returns the character of a word after a prefix of length depth, or an empty string if the word is the prefix.
+
+        Input:
+            index: an integer representing the word index
+            depth: an integer representing the length of the prefix
+
+        Output:
+            char: a string of the next character, or an empty string
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        start = self.offsets[index] + depth
+        return self.text[start] if start < self.offsets[index+1] else ''
+
+    def _widen(self, prefix, start, end):
+        """
+        Function Description: Finds the range of the words starting with a prefix, from a range of words known to start with it.
+
+        Approach Description: The words starting with the prefix are contiguous in sorted order, so the range grows out from the known range on both sides. Each side is found with a galloping search, which doubles its step until it passes a word without the prefix and then binary searches the last step, so it takes time logarithmic in the number of words added rather than in the number of words. Each word is checked with str.startswith on the concatenated words, without copying the word.
+
+        Input:
+            prefix: a string representing the prefix
+            start: an integer representing the first word index of a range of words starting with the prefix
+            end: an integer representing the end of a non-empty range of words starting with the prefix
+
+        Output:
+            range: a (start, end) tuple of the word indices of every word starting with the prefix
+
+        Time Complexity: O(W*log(R)) where W is the number of characters in the prefix and R is the number of words starting with the prefix
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        text, offsets, count = self.text, self.offsets, len(self.frequency)
+        def inside(index):
+            return text.startswith(prefix, offsets[index], offsets[index+1])
+        step = 1
+        while start - step >= 0 and inside(start - step):
+            step <<= 1
+        start = bisect_left(range(start), True, max(0, start - step), start - step // 2, key=inside)
+        last, step = end - 1, 1
+        while last + step < count and inside(last + step):
+            step <<= 1
+        end = bisect_left(range(count), True, last + step // 2 + 1, min(count, last + step), key=lambda index: not inside(index))
+        return start, end
+
+    def _top(self, start, end, depth):
+        """
+        Function Description: Returns the top k word indices of a prefix, in rank order.
+
+        Approach Description: Words are ranked by frequency, then by the character after the prefix, then by which word was last seen first, in the same way as the rankings of the Trie. The ranking is read from the sparse table if the prefix has one, otherwise the words of its range are scanned.
+
+        Input:
+            start: an integer representing the first word index of the prefix range
+            end: an integer representing the end of the prefix range
+            depth: an integer representing the length of the prefix
+
+        Output:
+            ranked: a list of up to k word indices, best first
+
+        Time Complexity: O(log(P)) for a stored ranking, where P is the number of stored rankings, otherwise O(R*log(k)) where R is the number of words of the prefix, which is at most SORTED_SCAN_LIMIT
+
+        Auxiliary Space/Space Complexity: O(k) where k is the size of the ranking
+        """
+        if end - start > self.scan_limit:
+            key = start << 16 | depth
+            position = bisect_left(self.table_keys, key)
+            if position < len(self.table_keys) and self.table_keys[position] == key:
+                k = self.rank_size
+                return list(self.table_words[position*k:position*k+k])
+        return self._scan(start, end, depth)
+
+    def _scan(self, start, end, depth):
+        """
+        Function Description: Ranks the words of a prefix range by scanning them.
+
+        Input:
+            start: an integer representing the first word index of the prefix range
+            end: an integer representing the end of the prefix range
+            depth: an integer representing the length of the prefix
+
+        Output:
+            ranked: a list of up to k word indices, best first
+
+        Time Complexity: O(R*log(k)) where R is the number of words in the range
+
+        Auxiliary Space/Space Complexity: O(k) where k is the size of the ranking
+        """
+        frequency, order, char = self.frequency, self.order, self._char
+        return [index for *_, index in nsmallest(self.rank_size, ((-frequency[i], char(i, depth), order[i], i) for i in range(start, end)))]
+
+    def build(self, counts):
+        """
+        Function Description: Builds the SortedArray from word counts.
+
+        Approach Description: The words are sorted and concatenated, and their frequency and their position in the counts, which are ordered by last occurrence, are stored as their frequency and order, as Trie.build does. The prefixes of more than SORTED_SCAN_LIMIT words are then found from the root down, splitting each range into the ranges of its next characters by binary search, and the ranking of each is computed by scanning its range and stored in the table. Smaller prefixes are not split further, as all their descendants are small too.
+
+        Input:
+            counts: a dictionary from word to frequency, ordered by the last occurrence of each word
+
+        Output:
+            None
+
+        Time Complexity: O(U*log(U)*W + H) where U is the number of distinct words, W is the number of characters in the longest word and H is the total number of words in the ranges of the stored prefixes, at most U*W
+
+        Auxiliary Space/Space Complexity: O(T + U) where T is the number of characters in the distinct words
+        """
+        if len(self):
+            raise ValueError("build can only be used on an empty SortedArray")
+        self.scan_limit = max(SORTED_SCAN_LIMIT, self.rank_size)
+        order_of = {word: order for order, word in enumerate(counts) if counts[word]}
+        words = sorted(order_of)
+        self.text = ''.join(words)
+        offsets = array('Q', [0])
+        for word in words:
+            offsets.append(offsets[-1] + len(word))
+        self.offsets = offsets
+        self.frequency = array('I', [counts[word] for word in words])
+        self.order = array('I', [order_of[word] for word in words])
+        table = []
+        stack = [(0, len(words), 0)]
+        while stack:
+            start, end, depth = stack.pop()
+            if depth:
+                table.append((start << 16 | depth, self._scan(start, end, depth)))
+            # The word equal to the prefix sorts first and has no child range
+            child = start + (self._char(start, depth) == '')
+            while child < end:
+                char = self._char(child, depth)
+                child_end = bisect_right(range(end), char, child, end, key=lambda i: self._char(i, depth))
+                if child_end - child > self.scan_limit:
+                    stack.append((child, child_end, depth + 1))
+                child = child_end
+        table.sort()
+        self.table_keys = array('Q', [key for key, _ in table])
+        self.table_words = array('I', [index for _, ranked in table for index in ranked])
+
+    def search(self, word):
+        """
+        Function Description: Searches for a word and returns the top k words based on prefix similarity, frequency and ASCCI character value, in the same way as Trie.search.
+
+        Approach Description: The longest prefix of the word that starts some word in the array is the longest common prefix of the word with one of the two words around its sorted position, so it is found with one binary search. The rankings of its prefixes are then merged from the longest to the shortest, skipping words already found, until k words are found, which is what the Trie does along the path of the word. The range of each shorter prefix contains the range of the longer one, so it is found by widening the range of the longer prefix with _widen.
+
+        Input:
+            word: a string representing the word to be searched
+
+        Output:
+            ranking: a Ranking object representing the top k words based on prefix similarity, frequency and ASCCI character value
+            None: if the exact word is found
+
+        Time Complexity: O(M*log(N) + M*(M*log(N) + L*log(k))) where M is the number of characters in the input word, N is the number of words and L is SORTED_SCAN_LIMIT
+
+        Auxiliary Space/Space Complexity: O(M + k) where M is the number of characters in the input word and k is the size of the ranking
+        """
+        ranking = Ranking(size=self.rank_size)
+        text, offsets, count = self.text, self.offsets, len(self.frequency)
+        position = bisect_left(range(count), word, key=lambda index: text[offsets[index]:offsets[index+1]])
+        # The word sharing the longest prefix with the input word is next to its sorted position
+        matched = nearest = 0
+        for neighbour in (position - 1, position):
+            if 0 <= neighbour < count:
+                other = self._word(neighbour)
+                length = 0
+                while length < len(word) and length < len(other) and word[length] == other[length]:
+                    length += 1
+                if length > matched:
+                    matched, nearest = length, neighbour
+        if not matched:
+            return ranking
+        if matched == len(word) and position < count and self._word(position) == word:
+            return
+        start, end = self._widen(word[:matched], nearest, nearest + 1)
+        ranked = [(index, matched) for index in self._top(start, end, matched)]
+        found = {index for index, _ in ranked}
+        for depth in range(matched - 1, 0, -1):
+            if len(ranked) >= self.rank_size:
+                break
+            start, end = self._widen(word[:depth], start, end)
+            for index in self._top(start, end, depth):
+                if index not in found:
+                    ranked.append((index, depth))
+                    found.add(index)
+                    if len(ranked) >= self.rank_size:
+                        break
+        ranking.ranking = []
+        for index, depth in ranked:
+            found_word = self._word(index)
+            ranking.ranking.append((matched if depth == matched else -float('inf'), self.frequency[index], found_word, found_word[depth:depth+1], self.order[index]))
+        return ranking
+
+    def search_many(self, words):
+        """
+        Function Description: Searches for many words, in the same way as Trie.search_many.
+
+        Input:
+            words: an iterable of strings representing the words to be searched
+
+        Output:
+            results: a generator of (word, ranking) tuples, where ranking is what search returns for the word
+
+        Time Complexity: O(N*S) where N is the number of words and S is the time of one search
+
+        Auxiliary Space/Space Complexity: O(M + k) where M is the number of characters in the longest word and k is the size of the ranking
+        """
+        for word in words:
+            yield word, self.search(word)
+
+    def export_nodes(self):
+        """
+        Function Description: Iterates over the prefixes of the words in breadth first order, in the same way as Trie.export_nodes.
+
+        Approach Description: Each prefix is a node of the equivalent trie. The children of a prefix are found by splitting its range by the next character with binary search, and its ranking with _top. This converts the SortedArray into other structures, such as a snapshot.
+
+        Input:
+            None
+
+        Output:
+            nodes: a generator of (prefix, frequency, ranked) tuples, where ranked is a list of (word, next character) tuples in rank order
+
+        Time Complexity: O(P*(log(N) + L*log(k))) where P is the number of prefixes, N is the number of words and L is SORTED_SCAN_LIMIT
+
+        Auxiliary Space/Space Complexity: O(P*W) where P is the number of prefixes at the widest depth and W is the number of characters in the longest word
+        """
+        queue = deque([('', 0, len(self))])
+        while queue:
+            prefix, start, end = queue.popleft()
+            depth = len(prefix)
+            own = start < end and self._char(start, depth) == ''
+            ranked = [(self._word(index), self._char(index, depth)) for index in self._top(start, end, depth)] if depth else []
+            yield prefix, self.frequency[start] if own else 0, ranked
+            child = start + own
+            while child < end:
+                char = self._char(child, depth)
+                child_end = bisect_right(range(end), char, child, end, key=lambda i: self._char(i, depth))
+                queue.append((prefix + char, child, child_end))
+                child = child_end
+
+    def nbytes(self):
+        return sys.getsizeof(self.text) + sum(values.itemsize * len(values) for values in (self.offsets, self.frequency, self.order, self.table_keys, self.table_words))
+
+
+class Dawg:
+    def __init__(self, k=RANK_SIZE):
+        """
+        Function Description: Initialises an empty read-only Dawg, which is filled once with build.
+
+        Approach Description: The Dawg is a minimal acyclic word graph, a trie in which every set of nodes that end the same set of suffixes is merged into one node, so the endings shared by many words, such as plurals and "-ing", are stored once. A node is therefore reached by many prefixes and cannot hold the frequency of a word or the ranking of a prefix. Instead each node stores the number of words reachable from it, which numbers the words in sorted order as they are read along their path, and the frequency and order of each word are stored in side arrays by this word index. The words starting with a prefix are then the range of word indices from the index reached by the prefix to that plus the count of its node, so a prefix is identified by its start index and its length, which key its ranking. As in the SortedArray, the top k word indices are stored in a sparse table for the prefixes of more than SORTED_SCAN_LIMIT words, and the rankings of smaller prefixes are found by scanning their range. The nodes and edges are stored in flat arrays, with the edges of each node sorted by character.
+
+        Input:
+            k: an integer representing the number of words ranked for each prefix, which is the most suggestions a search returns
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        self.rank_size = k
+        # Whether a word ends at each node, the number of words reachable from it, and where its edges start
+        self.final = bytearray()
+        self.counts = array('I')
+        self.edge_start = array('I', [0])
+        # The character and target node of each edge, and the number of words of its node ordered before its target's
+        self.edge_chars = ''
+        self.edge_targets = array('I')
+        self.edge_offsets = array('I')
+        self.root = 0
+        # The frequency and order of each word, by word index
+        self.frequency = array('I')
+        self.order = array('I')
+        # The sorted keys (start of range << 16 | prefix length) of the stored rankings, and k word indices for each key
+        self.table_keys = array('Q')
+        self.table_words = array('I')
+        # Prefixes of more words than this have a stored ranking, which always has k words
+        self.scan_limit = max(SORTED_SCAN_LIMIT, k)
+
+    def __len__(self):
+        return len(self.final)
+
+    def insert(self, word):
+        raise TypeError("A Dawg is read-only, build it from word counts")
+
+    def set_frequency(self, word, frequency):
+        raise TypeError("A Dawg is read-only, build it from word counts")
+
+    def _edge(self, node, char):
+        """
+        Function Description: Finds the edge of a node labelled with a character, by binary search over the sorted edges of the node.
+
+        Input:
+            node: an integer representing the node
+            char: a string representing the character
+
+        Output:
+            edge: an integer representing the edge, or -1 if the node has no edge labelled with the character
+
+        Time Complexity: O(log(C)) where C is the number of edges of the node
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        start, end = self.edge_start[node], self.edge_start[node+1]
+        edge = bisect_left(self.edge_chars, char, start, end)
+        return edge if edge < end and self.edge_chars[edge] == char else -1
+
+    def _word(self, index):
+        """
+        Function Description: Returns the word with a word index, by following the edge whose range of word indices contains it from the root.
+
+        Input:
+            index: an integer representing the word index
+
+        Output:
+            word: a string representing the word
+
+        Time Complexity: O(W*log(C)) where W is the number of characters in the word and C is the number of edges of a node
+
+        Auxiliary Space/Space Complexity: O(W) where W is the number of characters in the word
+        """
+        node, chars = self.root, []
+        while index or not self.final[node]:
+            edge = bisect_right(self.edge_offsets, index, self.edge_start[node], self.edge_start[node+1]) - 1
+            index -= self.edge_offsets[edge]
+            chars.append(self.edge_chars[edge])
+            node = self.edge_targets[edge]
+        return ''.join(chars)
+
+    def _top(self, node, start, depth):
+        """
+        Function Description: Returns the top k word indices of a prefix, in rank order, in the same way as SortedArray._top.
+
+        Input:
+            node: an integer representing the node reached by the prefix
+            start: an integer representing the first word index of the prefix range
+            depth: an integer representing the length of the prefix
+
+        Output:
+            ranked: a list of up to k word indices, best first
+
+        Time Complexity: O(log(P)) for a stored ranking, where P is the number of stored rankings, otherwise O(C + R*log(k)) where C is the number of edges of the node and R is the number of words of the prefix, which is at most SORTED_SCAN_LIMIT
+
+        Auxiliary Space/Space Complexity: O(k) where k is the size of the ranking
+        """
+        if self.counts[node] > self.scan_limit:
+            key = start << 16 | depth
+            position = bisect_left(self.table_keys, key)
+            if position < len(self.table_keys) and self.table_keys[position] == key:
+                k = self.rank_size
+                return list(self.table_words[position*k:position*k+k])
+        return self._scan(node, start)
+
+    def _scan(self, node, start):
+        """
+        Function Description: Ranks the words of a prefix range by scanning them.
+
+        Approach Description: The word ending at the node, if any, has the first index of the range and no next character, and the words through each edge are the consecutive indices from its offset, with the character of the edge as their next character, so no word is read.
+
+        Input:
+            node: an integer representing the node reached by the prefix
+            start: an integer representing the first word index of the prefix range
+
+        Output:
+            ranked: a list of up to k word indices, best first
+
+        Time Complexity: O(C + R*log(k)) where C is the number of edges of the node and R is the number of words in the range
+
+        Auxiliary Space/Space Complexity: O(C + k) where C is the number of edges of the node and k is the size of the ranking
+        """
+        frequency, order, counts, targets = self.frequency, self.order, self.counts, self.edge_targets
+        ranges = [('', start, start + 1)] if self.final[node] else []
+        for edge in range(self.edge_start[node], self.edge_start[node+1]):
+            first = start + self.edge_offsets[edge]
+            ranges.append((self.edge_chars[edge], first, first + counts[targets[edge]]))
+        return [index for *_, index in nsmallest(self.rank_size, ((-frequency[i], char, order[i], i) for char, first, end in ranges for i in range(first, end)))]
+
+    def build(self, counts):
+        """
+        Function Description: Builds the Dawg from word counts.
+
+        Approach Description: The graph is built incrementally from the words in sorted order. The nodes along the path of the last word are kept unfinished, and when the next word branches off the path, the nodes below the branch can no longer change, so each is replaced by an equal finished node if there is one, found in a register keyed by whether a word ends at the node and its edges, or registered otherwise. Every node is therefore registered after its children, and the graph is minimal once the last path is finished. The word counts of the nodes and the offsets of the edges are then computed in the order the nodes were registered. The frequency and order of each word are stored by its position in sorted order, which is its word index, as Trie.build does. The rankings of the prefixes of more than SORTED_SCAN_LIMIT words are found from the root down and stored in the table.
+
+        Input:
+            counts: a dictionary from word to frequency, ordered by the last occurrence of each word
+
+        Output:
+            None
+
+        Time Complexity: O(U*log(U)*W + H) where U is the number of distinct words, W is the number of characters in the longest word and H is the total number of words in the ranges of the stored prefixes, at most U*W
+
+        Auxiliary Space/Space Complexity: O(N + U) where N is the number of nodes and U is the number of distinct words
+        """
+        if len(self.frequency):
+            raise ValueError("build can only be used on an empty Dawg")
+        self.scan_limit = max(SORTED_SCAN_LIMIT, self.rank_size)
+        order_of = {word: order for order, word in enumerate(counts) if counts[word]}
+        words = sorted(order_of)
+        register = {}
+        nodes = []
+        # The unfinished nodes along the path of the last word, as [final, edges] lists, the root first
+        path = [[False, []]]
+
+        def finish(depth):
+            # Replaces the nodes of the path below depth by registered nodes, deepest first
+            while len(path) > depth + 1:
+                final, edges = path.pop()
+                key = (final, tuple(edges))
+                node = register.get(key)
+                if node is None:
+                    node = register[key] = len(nodes)
+                    nodes.append(key)
+                parent_edges = path[-1][1]
+                parent_edges[-1] = (parent_edges[-1][0], node)
+
+        previous = ''
+        for word in words:
+            common = 0
+            while common < len(previous) and previous[common] == word[common]:
+                common += 1
+            finish(common)
+            for char in word[common:]:
+                path[-1][1].append((char, None))
+                path.append([False, []])
+            path[-1][0] = True
+            previous = word
+        finish(0)
+        final, edges = path.pop()
+        key = (final, tuple(edges))
+        self.root = register.get(key, len(nodes))
+        if self.root == len(nodes):
+            nodes.append(key)
+        node_counts, edge_start, chars, targets, offsets = array('I'), array('I', [0]), [], array('I'), array('I')
+        for final, edges in nodes:
+            total = int(final)
+            for char, target in edges:
+                chars.append(char)
+                targets.append(target)
+                offsets.append(total)
+                total += node_counts[target]
+            node_counts.append(total)
+            edge_start.append(len(targets))
+        self.final = bytearray(final for final, _ in nodes)
+        self.counts, self.edge_start, self.edge_chars, self.edge_targets, self.edge_offsets = node_counts, edge_start, ''.join(chars), targets, offsets
+        self.frequency = array('I', [counts[word] for word in words])
+        self.order = array('I', [order_of[word] for word in words])
+        table = []
+        stack = [(self.root, 0, 0)]
+        while stack:
+            node, start, depth = stack.pop()
+            if depth:
+                table.append((start << 16 | depth, self._scan(node, start)))
+            for edge in range(edge_start[node], edge_start[node+1]):
+                if node_counts[targets[edge]] > self.scan_limit:
+                    stack.append((targets[edge], start + offsets[edge], depth + 1))
+        table.sort()
+        self.table_keys = array('Q', [key for key, _ in table])
+        self.table_words = array('I', [index for _, ranked in table for index in ranked])
+
+    def search(self, word):
+        """
+        Function Description: Searches for a word and returns the top k words based on prefix similarity, frequency and ASCCI character value, in the same way as Trie.search.
+
+        Approach Description: The word is followed from the root as far as the graph has edges for its characters, adding the offset of each edge to find the first word index of each prefix. The rankings of the prefixes are then merged from the longest to the shortest, skipping words already found, until k words are found, which is what the Trie does along the path of the word.
+
+        Input:
+            word: a string representing the word to be searched
+
+        Output:
+            ranking: a Ranking object representing the top k words based on prefix similarity, frequency and ASCCI character value
+            None: if the exact word is found
+
+        Time Complexity: O(M*log(C) + M*(log(P) + L*log(k)) + k*W*log(C)) where M is the number of characters in the input word, C is the number of edges of a node, P is the number of stored rankings, L is SORTED_SCAN_LIMIT and W is the number of characters in the longest word
+
+        Auxiliary Space/Space Complexity: O(M + k) where M is the number of characters in the input word and k is the size of the ranking
+        """
+        ranking = Ranking(size=self.rank_size)
+        if not len(self):
+            return ranking
+        node, start = self.root, 0
+        # The node and first word index reached by each matched prefix
+        path = []
+        for char in word:
+            edge = self._edge(node, char)
+            if edge < 0:
+                break
+            node, start = self.edge_targets[edge], start + self.edge_offsets[edge]
+            path.append((node, start))
+        matched = len(path)
+        if not matched:
+            return ranking
+        if matched == len(word) and self.final[node]:
+            return
+        ranked, found = [], set()
+        for depth in range(matched, 0, -1):
+            node, start = path[depth-1]
+            for index in self._top(node, start, depth):
+                if index not in found:
+                    ranked.append((index, depth))
+                    found.add(index)
+                    if len(ranked) >= self.rank_size:
+                        break
+            if len(ranked) >= self.rank_size:
+                break
+        ranking.ranking = []
+        for index, depth in ranked:
+            found_word = self._word(index)
+            ranking.ranking.append((matched if depth == matched else -float('inf'), self.frequency[index], found_word, found_word[depth:depth+1], self.order[index]))
+        return ranking
+
+    def search_many(self, words):
+        """
+        Function Description: Searches for many words, in the same way as Trie.search_many.
+
+        Input:
+            words: an iterable of strings representing the words to be searched
+
+        Output:
+            results: a generator of (word, ranking) tuples, where ranking is what search returns for the word
+
+        Time Complexity: O(N*S) where N is the number of words and S is the time of one search
+
+        Auxiliary Space/Space Complexity: O(M + k) where M is the number of characters in the longest word and k is the size of the ranking
+        """
+        for word in words:
+            yield word, self.search(word)
+
+    def export_nodes(self):
+        """
+        Function Description: Iterates over the prefixes of the words in breadth first order, in the same way as Trie.export_nodes.
+
+        Approach Description: Each prefix is a node of the equivalent trie, and is found by following the edges of the graph from the root without merging the prefixes that reach the same node. This converts the Dawg into other structures, such as a snapshot.
+
+        Input:
+            None
+
+        Output:
+            nodes: a generator of (prefix, frequency, ranked) tuples, where ranked is a list of (word, next character) tuples in rank order
+
+        Time Complexity: O(P*(log(S) + L*log(k) + k*W*log(C))) where P is the number of prefixes, S is the number of stored rankings, L is SORTED_SCAN_LIMIT, W is the number of characters in the longest word and C is the number of edges of a node
+
+        Auxiliary Space/Space Complexity: O(P*W) where P is the number of prefixes at the widest depth and W is the number of characters in the longest word
+        """
+        if not len(self):
+            yield '', 0, []
+            return
+        queue = deque([('', self.root, 0)])
+        while queue:
+            prefix, node, start = queue.popleft()
+            depth = len(prefix)
+            ranked = []
+            if depth:
+                for index in self._top(node, start, depth):
+                    found_word = self._word(index)
+                    ranked.append((found_word, found_word[depth:depth+1]))
+            yield prefix, self.frequency[start] if self.final[node] else 0, ranked
+            for edge in range(self.edge_start[node], self.edge_start[node+1]):
+                queue.append((prefix + self.edge_chars[edge], self.edge_targets[edge], start + self.edge_offsets[edge]))
+
+    def nbytes(self):
+        return sys.getsizeof(self.edge_chars) + len(self.final) + sum(values.itemsize * len(values) for values in (self.counts, self.edge_start, self.edge_targets, self.edge_offsets, self.frequency, self.order, self.table_keys, self.table_words))
+
+
+class DeletionIndex:
+    def __init__(self, frequencies=(), max_distance=1):
+        """
+        Function Description: Initialises a DeletionIndex, which finds the words within an edit distance of a word.
+
+        Approach Description: Two words are within edit distance d of each other only if deleting at most d characters from each of them gives the same string, as each insertion, deletion, substitution or swap of adjacent characters can be undone by deleting one character from one or both words. The index stores every word under each string that can be made by deleting up to max_distance of its characters. A lookup then makes the same deletions from the input word and only compares the words found under them, instead of comparing the input word with the whole dictionary. Most strings are made from one word, so the index stores a single word as a string and only uses a list when several words share a string.
+
+        Input:
+            frequencies: an iterable of (word, frequency) tuples
+            max_distance: an integer representing the largest edit distance that can be looked up
+
+        Output:
+            None
+
+        Time Complexity: O(U*D) where U is the number of words and D is the number of deletions of a word, which is O(W^d) for words of W characters and a max_distance of d
+
+        Auxiliary Space/Space Complexity: O(U*D) where U is the number of words and D is the number of deletions of a word
+        """
+        if max_distance < 0:
+            raise ValueError("The max_distance can not be negative")
+        self.max_distance = max_distance
+        self.frequency = {}
+        self.index = {}
+        for word, frequency in frequencies:
+            self.set_frequency(word, frequency)
+
+    def __len__(self):
+        return len(self.frequency)
+
+    @staticmethod
+    def deletions(word, max_distance):
+        """
+        Function Description: Returns the strings made by deleting up to max_distance characters from a word, including the word itself.
+
+        Approach Description: The deletions are made one level at a time, deleting one character from each string of the previous level. A set removes the strings that can be made in more than one way.
+
+        Input:
+            word: a string representing the word
+            max_distance: an integer representing the most characters to delete
+
+        Output:
+            deletions: a set of strings
+
+        Time Complexity: O(W^d) where W is the number of characters in the word and d is the max_distance
+
+        Auxiliary Space/Space Complexity: O(W^d) where W is the number of characters in the word and d is the max_distance
+        """
+        deletions = {word}
+        level = deletions
+        for _ in range(max_distance):
+            level = {deleted[:i] + deleted[i+1:] for deleted in level for i in range(len(deleted))}
+            deletions |= level
+        return deletions
+
+    def set_frequency(self, word, frequency):
+        """
+        Function Description: Sets the frequency of a word, adding the word to the index if it is new and removing it if the frequency is 0.
+
+        Input:
+            word: a string representing the word
+            frequency: an integer representing the new frequency of the word
+
+        Output:
+            None
+
+        Time Complexity: O(D) where D is the number of deletions of the word, plus the number of words sharing a deletion when the word is removed
+
+        Auxiliary Space/Space Complexity: O(D) where D is the number of deletions of the word
+        """
+        index = self.index
+        if frequency > 0:
+            if word not in self.frequency:
+                for deleted in self.deletions(word, self.max_distance):
+                    words = index.get(deleted)
+                    if words is None:
+                        index[deleted] = word
+                    elif type(words) is str:
+                        index[deleted] = [words, word]
+                    else:
+                        words.append(word)
+            self.frequency[word] = frequency
+        elif self.frequency.pop(word, None) is not None:
+            for deleted in self.deletions(word, self.max_distance):
+                words = index[deleted]
+                if type(words) is str:
+                    del index[deleted]
+                else:
+                    words.remove(word)
+                    if len(words) == 1:
+                        index[deleted] = words[0]
+
+    def lookup(self, word, max_distance=None, count=RANK_SIZE):
+        """
+        Function Description: Finds the most frequent words within an edit distance of a word.
+
+        Approach Description: The words stored under each deletion of the word are collected as candidates, and the edit distance of each candidate is computed with edit_distance, which stops as soon as the distance is over max_distance. The candidates within max_distance are ranked by edit distance, then by frequency, with the more frequent word first, then by the word.
+
+        Input:
+            word: a string representing the word to look up
+            max_distance: an integer representing the largest edit distance of the results, at most the max_distance of the index, or None to use the max_distance of the index
+            count: an integer representing the maximum number of results
+
+        Output:
+            results: a list of up to count (distance, word) tuples in rank order
+
+        Time Complexity: O(D + C*log(count)) where D is the number of deletions of the word and C is the number of candidates, each compared in time proportional to the characters they do not share with the word at the start and end
+
+        Auxiliary Space/Space Complexity: O(D + C) where D is the number of deletions of the word and C is the number of candidates
+        """
+        if max_distance is None:
+            max_distance = self.max_distance
+        if not 0 <= max_distance <= self.max_distance:
+            raise ValueError(f"The max_distance must be between 0 and {self.max_distance}")
+        index = self.index
+        candidates = set()
+        for deleted in self.deletions(word, max_distance):
+            words = index.get(deleted)
+            if words is None:
+                continue
+            if type(words) is str:
+                candidates.add(words)
+            else:
+                candidates.update(words)
+        results = []
+        frequency = self.frequency
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, max_distance)
+            # A word removed by another thread since it was found is skipped
+            candidate_frequency = frequency.get(candidate)
+            if distance <= max_distance and candidate_frequency is not None:
+                results.append((distance, -candidate_frequency, candidate))
+        return [(distance, candidate) for distance, _, candidate in nsmallest(count, results)]
+
+
+class SpellStats:
+    def __init__(self, callback=None):
+        """
+        Function Description: Initialises the opt-in statistics of a SpellChecker
+
+        Approach Description: The statistics are a set of named counters, the time spent in each named phase, and sources that are read when a snapshot is taken, such as the cache statistics of the SpellChecker. A SpellChecker without stats only checks that its stats are None once per call, so counting costs nothing when it is disabled. With stats, Trie.insert counts the nodes visited and allocated, the new words and the rankings updated, Trie.search counts the nodes visited and the rankings merged while backtracking to shallower nodes, and load_words times the load, tokenize and insert phases. The other backends are not counted node by node. The callback is called with a snapshot by export, so the statistics can be sent to any metrics system.
+
+        Input:
+            callback: a function called with each exported snapshot, or None
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        self.callback = callback
+        self.counts = Counter()
+        self.timings = Counter()
+        self.calls = Counter()
+        # The functions returning the dictionaries of statistics added to each snapshot, by name
+        self.sources = {}
+
+    def record(self, **amounts):
+        """
+        Function Description: Adds amounts to the named counters
+
+        Input:
+            amounts: the amount to add to each counter, by name
+
+        Output:
+            None
+
+        Time Complexity: O(C) where C is the number of counters given
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        self.counts.update(amounts)
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Function Description: Times a phase, adding its duration to the time of the named phase
+
+        Input:
+            name: a string representing the name of the phase
+
+        Output:
+            context: a context manager timing the code it runs
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - start
+            self.calls[name] += 1
+
+    def timed(self, name, items):
+        """
+        Function Description: Iterates over items, adding the time taken to produce each item to the time of the named phase
+
+        Approach Description: Only the time spent inside the iterator is counted, not the time the caller spends on each item, so a generator that reads and tokenizes a file can be timed separately from the code inserting its words.
+
+        Input:
+            name: a string representing the name of the phase
+            items: an iterable to time
+
+        Output:
+            items: a generator of the items
+
+        Time Complexity: O(N) where N is the number of items
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        iterator = iter(items)
+        while True:
+            with self.phase(name):
+                item = next(iterator, _END)
+            if item is _END:
+                return
+            yield item
+
+    def snapshot(self):
+        """
+        Function Description: Returns the current statistics
+
+        Input:
+            None
+
+        Output:
+            snapshot: a dictionary with the counters, the seconds and number of calls of each phase, and the statistics of each source
+
+        Time Complexity: O(C) where C is the number of counters, phases and sources
+
+        Auxiliary Space/Space Complexity: O(C) where C is the number of counters, phases and sources
+        """
+        snapshot = {
+            'counts': dict(self.counts),
+            'phases': {name: {'seconds': seconds, 'calls': self.calls[name]} for name, seconds in self.timings.items()},
+        }
+        for name, source in self.sources.items():
+            snapshot[name] = source()
+        return snapshot
+
+    def export(self):
+        """
+        Function Description: Takes a snapshot and passes it to the callback
+
+        Input:
+            None
+
+        Output:
+            snapshot: a dictionary of the statistics, as returned by snapshot
+
+        Time Complexity: O(C) where C is the number of counters, phases and sources, not counting the callback
+
+        Auxiliary Space/Space Complexity: O(C) where C is the number of counters, phases and sources
+        """
+        snapshot = self.snapshot()
+        if self.callback is not None:
+            self.callback(snapshot)
+        return snapshot
+
+    def reset(self):
+        """
+        Function Description: Sets every counter and phase time back to 0
+
+        Input:
+            None
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        self.counts = Counter()
+        self.timings = Counter()
+        self.calls = Counter()
+
+
+class SpellChecker:
+    # The trie structures that can store the words, selected with the backend argument
+    BACKENDS = {'trie': Trie, 'array': ArrayTrie, 'radix': RadixTrie, 'sorted': SortedArray, 'dawg': Dawg}
+
+    def __init__(self, file_name=None, backend='trie', bulk=False, workers=None, cache_size=0, k=RANK_SIZE, half_life=None, window=None, concurrent=False, stats=None):
+        """
+        Function Description: Initialises the SpellChecker object by loading words from the input file
+
+        Approach Description: The SpellChecker object is initialised by creating a Trie object and loading words from the input file. The load_words function is used to clean and split the input line into words, which are then inserted into the Trie object. The backend argument selects the trie structure, 'array' stores the trie in flat arrays to use less memory, 'radix' collapses chains of single child nodes into one node, 'sorted' stores a read-only sorted array of the words, which uses the least memory, and 'dawg' stores a read-only minimal word graph, which stores the shared endings of words once. The 'sorted' and 'dawg' backends are always built from the word counts. If bulk is True the words are counted first and the trie is built once from the counts. If workers is given the words are counted by that many processes. If cache_size is given, the results of check are kept in a least recently used cache of that many words. The k argument sets how many suggestions check returns. The half_life and window arguments select how the messages given to ingest are counted, with decaying counts or over a sliding window. If concurrent is True, the trie copies the nodes it changes instead of changing them in place, so check can be called from many threads while another thread changes the dictionary. The stats argument turns on the counters and phase timings of a SpellStats object.
+
+        Input:
+            file_name: a string, path, glob pattern or binary stream representing the input, a list of them, or None to start with an empty dictionary
+            backend: a string representing the trie structure to use, one of SpellChecker.BACKENDS
+            bulk: a boolean representing whether to build the trie from word counts
+            workers: an integer representing the number of processes counting the words, or None to count in this process
+            cache_size: an integer representing the maximum number of results of check to cache, 0 to disable the cache
+            k: an integer representing the maximum number of suggestions returned for a word
+            half_life: a number representing the number of ingested messages after which the weight of an occurrence halves, or None to not decay the counts
+            window: an integer representing the number of most recent ingested messages that are counted, or None to count every message
+            concurrent: a boolean representing whether searches in other threads see each change to the dictionary as a whole
+            stats: a SpellStats object to count the work of the SpellChecker in, or None to not count
+
+        Output:
+            None
+
+        Time Complexity: O(T) where T is the number of characters in the input file
+
+        Time Complexity Analysis: O(T), where T is the number of characters in the input file
+
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {sorted(self.BACKENDS)}")
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        if half_life is not None and window is not None:
+            raise ValueError("Only one of half_life and window can be given")
+        if (half_life is not None or window is not None) and backend != 'trie':
+            raise ValueError("Streaming with half_life or window needs the 'trie' backend")
+        if half_life is not None and half_life <= 0:
+            raise ValueError("half_life must be positive")
+        if window is not None and window < 1:
+            raise ValueError("window must be at least 1")
+        if concurrent and backend != 'trie':
+            raise ValueError("Concurrent reads need the 'trie' backend")
+        if concurrent and cache_size:
+            raise ValueError("The result cache can not be used with concurrent reads")
+        if half_life is not None or concurrent:
+            self.trie = Trie(k, weighted=half_life is not None, copy_on_write=concurrent)
+        else:
+            self.trie = self.BACKENDS[backend](k)
+        # Changes to the dictionary are made by one thread at a time, and published as a whole if concurrent is True
+        self.concurrent = concurrent
+        self._write_lock = threading.RLock()
+        # The cached results of check, from least to most recently used, and the cached words by first character
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cached_words = {}
+        self._cache_stats = [0, 0, 0, 0]
+        # The DeletionIndex used by check_edits, built the first time it is needed
+        self._edits = None
+        # The shared memory blocks published by share, removed by close
+        self._shared = []
+        # How the messages given to ingest are counted
+        self.half_life = half_life
+        self.window = window
+        # The word counts of the ingested messages in the window, oldest first
+        self._messages = deque()
+        # The number of ingested messages since the frequencies were last scaled down, which sets the weight of a new occurrence
+        self._ticks = 0
+        self.set_stats(stats)
+        if file_name is not None:
+            self.load_words(file_name, bulk, workers)
+
+    def load_words(self, file_name, bulk=False, workers=None):
+        """
+        Function Description: Loads words from the input file
+
+        Approach Description: This method loads words from the input file by splitting it into words using the tokenize method. The method then inserts the words into the Trie object. If bulk is True, the words are counted with count_words instead and the trie is built from the counts, which updates each ranking once rather than once per occurrence of a word. Counting in worker processes and the read-only 'sorted' and 'dawg' backends always build the trie from the counts.
+
+        Input:
+            file_name: a string, path, glob pattern or binary stream representing the input, or a list of them
+            bulk: a boolean representing whether to build the trie from word counts
+            workers: an integer representing the number of processes counting the words, or None to count in this process
+
+        Output:
+            None
+
+        Time Complexity: O(T) where T is the number of characters in the input file, N is the number of lines in the input file, W is the number of words in each line
+
+        Time Complexity Analysis: O(T), where T is the number of characters in the input file
+            The open method has a constant time complexity of O(1).
+            The first for loop iterates over each line in the input file leading to O(N) time complexity.
+            The clean_and_split method has a time complexity of O(W) leading to O(N*W), O(T) time complexity.
+            The nested for loop iterates over each word in the line leading to O(N*(W+W)), O(N*W) time complexity.
+            The insert method called in the for loop has a constant time complexity of O(W) leading to O(N*(W+W)), O(N*W) time complexity.
+            The amount of lines multipled by the amount of words in each line is equal to the amount of characters in the input file leading to O(T) time complexity.
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+
+        Space Complexity: O(W) where W is the number of characters in each line
+
+        Space Complexity Analysis:
+            The space for the words list is proportional to the number of characters in each line leading to O(W) space complexity.
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+            
+        Auxiliary Space Complexity: O(1)
+
+        Auxiliary Space Complexity Analysis:
+            The auxiliary space complexity is equal to space complexity - input size, therefore the auxiliary space complexity is O(W) - O(W) = O(1).
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+        """
+        self._edits = None
+        phase = self._phase
+        # A SortedArray or Dawg can only be built from word counts
+        if bulk or workers or isinstance(self.trie, (SortedArray, Dawg)):
+            # Counting covers the reading and tokenizing, and building covers the inserting
+            with phase('load'):
+                with phase('tokenize'):
+                    counts = self.count_words(file_name, workers)
+                with phase('insert'):
+                    self.trie.build(counts)
+            return
+        # Load words from the input file
+        insert = self.trie.insert
+        with phase('load'):
+            for name in self._file_names(file_name):
+                chunks = self.tokenize(name)
+                for words in chunks if self.stats is None else self.stats.timed('tokenize', chunks):
+                    with phase('insert'):
+                        for word in words:
+                            insert(word)
+        self._publish()
+
+    def set_stats(self, stats):
+        """
+        Function Description: Turns the statistics of the SpellChecker on with a SpellStats object, or off with None
+
+        Approach Description: The stats are given to the trie, which counts the work of insert and search in them, and the cache statistics are added as a source, so they are read when a snapshot is taken instead of being counted twice.
+
+        Input:
+            stats: a SpellStats object, or None to stop counting
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        self.stats = stats
+        self.trie.stats = stats
+        if stats is not None:
+            stats.sources['cache'] = lambda: self.cache_info()._asdict()
+
+    def _phase(self, name):
+        """
+        Function Description: Returns a context manager timing a phase in the stats, which does nothing when the stats are off
+
+        Input:
+            name: a string representing the name of the phase
+
+        Output:
+            context: a context manager
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        return nullcontext() if self.stats is None else self.stats.phase(name)
+
+    def count_words(self, file_name, workers=None):
+        """
+        Function Description: Counts the words in the input file
+
+        Approach Description: This method cleans and splits each line of the input file into words and counts how many times each word features. Each word is moved to the end of the dictionary when it is counted, so the dictionary is ordered by the last occurrence of each word, which is needed to break ties in the same way as inserting one word at a time. If workers is given, each file is split into ranges at line boundaries with split_file, the ranges are counted by a pool of worker processes with count_range and the counts are merged in order with merge_counts, which gives the same result. At most two ranges per worker are in flight, and the counts of each are merged as soon as the ranges before it are, so only a few counts of ranges are held at once however large the input is. Compressed files cannot be split, so each one is counted whole by a worker process with count_input, and streams are counted in this process while the workers run. Otherwise each input is counted with count_input, which reads plain files from the end to the start in large chunks with read_backwards and counts the words of each chunk in reverse by one Counter, in C instead of a Python loop over the words.
+
+        Input:
+            file_name: a string, path, glob pattern or binary stream representing the input, or a list of them
+            workers: an integer representing the number of processes counting the words, or None to count in this process
+
+        Output:
+            counts: a dictionary from word to frequency, ordered by the last occurrence of each word
+
+        Time Complexity: O(T) where T is the number of characters in the input file
+
+        Auxiliary Space/Space Complexity: O(U) where U is the number of characters in the distinct words of the input file
+        """
+        sources = self._file_names(file_name)
+        if not workers:
+            return merge_counts(count_input(source) for source in sources)
+        def parts():
+            # Each part of the input in order, as the function and arguments that count it, or a stream
+            for source in sources:
+                if is_stream(source):
+                    yield source
+                elif is_compressed(source):
+                    yield count_input, source
+                else:
+                    for start, end in split_file(source, max(workers, os.path.getsize(source) // RANGE_SIZE + 1)):
+                        yield count_range, source, start, end
+
+        def results(executor):
+            # At most two parts per worker are in flight, and each is merged as soon as the parts before it are
+            pending = deque()
+            for part in parts():
+                if len(pending) == 2 * workers:
+                    yield counted(pending.popleft())
+                pending.append(executor.submit(*part) if type(part) is tuple else part)
+            while pending:
+                yield counted(pending.popleft())
+
+        def counted(part):
+            # A stream is counted in this process when its turn comes, while the workers count the parts after it
+            return count_input(part) if is_stream(part) else part.result()
+
+        with ProcessPoolExecutor(workers) as executor:
+            return merge_counts(results(executor))
+
+    @staticmethod
+    def _file_names(file_name):
+        """
+        Function Description: Returns the list of inputs for a file name, glob pattern, stream or a list of them
+
+        Approach Description: A glob pattern is expanded to the files it matches in sorted order, so the order of the inputs, which breaks ties between words, does not depend on the file system. A pattern that matches no files raises FileNotFoundError, as a missing file would.
+
+        Input:
+            file_name: a string, path, glob pattern or binary stream representing the input, or a list of them
+
+        Output:
+            sources: a list of names of input files and binary streams
+
+        Time Complexity: O(F log F) where F is the number of input files
+
+        Auxiliary Space/Space Complexity: O(F) where F is the number of input files
+        """
+        sources = []
+        for source in [file_name] if isinstance(file_name, (str, os.PathLike)) or is_stream(file_name) else file_name:
+            if isinstance(source, str) and glob.has_magic(source):
+                matches = sorted(glob.glob(source))
+                if not matches:
+                    raise FileNotFoundError(f"No files match {source!r}")
+                sources += matches
+            else:
+                sources.append(source)
+        return sources
+
+    def tokenize(self, file_name, chunk_size=CHUNK_SIZE):
+        """
+        Function Description: Splits the input file into words, a large chunk at a time
+
+        Approach Description: This method reads the input with tokenize_input, which decompresses compressed files while they are read and finds the words of each chunk with split_words, in the same way as clean_and_split. If a chunk ends with an alphanumeric character its last word may continue in the next chunk, so it is held back and joined to the start of the next chunk.
+
+        Input:
+            file_name: a string or path representing the name of the input file, or a binary stream
+            chunk_size: an integer representing the number of characters to read at a time
+
+        Output:
+            words: a generator of lists of strings representing the words of each chunk, in the order they appear in the file
+
+        Time Complexity: O(T) where T is the number of characters in the input file
+
+        Auxiliary Space/Space Complexity: O(C) where C is the chunk size
+        """
+        return tokenize_input(file_name, chunk_size=chunk_size)
+
+    def clean_and_split(self, line):
+        """
+        Function Description: Cleans and splits a line into words
+
+        Approach Description: This method cleans and splits a line into words using split_words, which finds every run of alphanumeric characters. Non-alphanumeric characters are ignored.
+
+        Input:
+            line: a string representing the line to be cleaned and split into words
+
+        Output:
+            words: a list of strings representing the words in the line
+
+        Time Complexity: O(W) where W is the number of characters in the input line
+
+        Time Complexity Analysis: O(W), where W is the number of characters in the input line
+            split_words scans each character in the input line once leading to O(W) time complexity.
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+
+        Space Complexity: O(W)
+
+        Space Complexity Analysis:
+            The space for the word list is proportional to the number of characters in the input line leading to O(W) space complexity.
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space Complexity: O(1)
+
+        Auxiliary Space Complexity Analysis:
+            The auxiliary space complexity is equal to space complexity - input size, therefore the auxiliary space complexity is O(W) - O(W) = O(1).
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+        """
+        return split_words(line)
+
+    def check(self, input_word):
+        """
+        Function Description: Checks for suggestions based on the input word
+
+        Approach Description: This method checks for suggestions based on the input word by searching for the input word in the Trie object. The method then returns the top k words based on prefix similarity, frequency and ASCCI character value.
+
+        Input:
+            input_word: a string representing the word to check for suggestions
+
+        Output:
+            suggestions: a list of strings representing the top k words based on prefix similarity, frequency and ASCCI character value
+
+        Time Complexity: O(M) where M is the number of characters in the input word
+
+        Time Complexity Analysis: O(M), where M is the number of characters in the input word
+            The search method called in the method has a time complexity of O(M) leading to O(M) time complexity.
+            Iterating over the ranking list has a constant time complexity of O(3) leading to O(3), O(1) time complexity.
+            
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space/Space Complexity: O(1)
+
+        Auxiliary Space/Space Complexity Analysis:
+            The space for the suggestions list is at most k elements leading to O(k) space complexity.
+
+            The big Θ notation is the same as the big O notation as the time complexity is the same in the best and worst case scenarios
+        """
+        if self.cache_size:
+            suggestions = self._cache.get(input_word)
+            if suggestions is not None:
+                self._cache.move_to_end(input_word)
+                self._cache_stats[0] += 1
+                return list(suggestions)
+            self._cache_stats[1] += 1
+        # Check for suggestions based on the input word
+        ranking = self.trie.search(input_word)
+        suggestions = [word[2] for word in ranking.ranking if word[2]] if ranking else []
+        if self.cache_size:
+            self._cache_store(input_word, suggestions)
+        return suggestions
+
+    def iter_suggestions(self, input_word):
+        """
+        Function Description: Iterates over every suggestion for the input word, best first
+
+        Approach Description: The suggestions are found lazily with the iter_suggestions method of the trie, so they come in the same order as check, which returns the first k of them, and further suggestions can be read without changing k or rebuilding the dictionary. Only the nodes needed for the suggestions read so far are visited. The dictionary must not be changed while the suggestions are read.
+
+        Input:
+            input_word: a string representing the word to check for suggestions
+
+        Output:
+            suggestions: a generator of strings representing the suggestions based on prefix similarity, frequency and ASCCI character value
+
+        Time Complexity: O(M + n*W*C*log(n*W*C)) for the first n suggestions, where M is the number of characters in the input word, W is the number of characters in the longest word and C is the number of children of a node
+
+        Auxiliary Space/Space Complexity: O(n*W*C) for the first n suggestions, where W is the number of characters in the longest word and C is the number of children of a node
+        """
+        if not hasattr(self.trie, 'iter_suggestions'):
+            raise TypeError(f"The {type(self.trie).__name__} backend does not support iterating over suggestions")
+        return self.trie.iter_suggestions(input_word)
+
+    def _cache_store(self, input_word, suggestions):
+        """
+        Function Description: Stores the suggestions for a word in the result cache
+
+        Approach Description: The suggestions are stored as the most recently used entry and the word is indexed by its first character. If the cache is over its size, the least recently used entry is evicted.
+
+        Input:
+            input_word: a string representing the checked word
+            suggestions: a list of strings representing the suggestions for the word
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        self._cache[input_word] = tuple(suggestions)
+        self._cached_words.setdefault(input_word[:1], set()).add(input_word)
+        if len(self._cache) > self.cache_size:
+            evicted, _ = self._cache.popitem(last=False)
+            self._cached_words[evicted[:1]].discard(evicted)
+            self._cache_stats[2] += 1
+
+    def _invalidate(self, word, changed):
+        """
+        Function Description: Drops the cached results that a change to a word may have affected
+
+        Approach Description: A search only uses the nodes on the path of the searched word, so if the shallowest node changed by a word is at depth changed, only the words starting with the first changed characters of the word can have a different result. Only the cached words with the same first character are compared.
+
+        Input:
+            word: a string representing the changed word
+            changed: an integer representing the depth of the shallowest changed node, or None if no search result changed
+
+        Output:
+            None
+
+        Time Complexity: O(C) where C is the number of cached words starting with the first character of the word
+
+        Auxiliary Space/Space Complexity: O(C) where C is the number of cached words starting with the first character of the word
+        """
+        if changed is None or not self._cache:
+            return
+        prefix = word[:changed]
+        cached_words = self._cached_words.get(word[:1], ())
+        for cached_word in [cached_word for cached_word in cached_words if cached_word.startswith(prefix)]:
+            del self._cache[cached_word]
+            cached_words.discard(cached_word)
+            self._cache_stats[3] += 1
+
+    def cache_info(self):
+        """
+        Function Description: Returns the statistics of the result cache
+
+        Input:
+            None
+
+        Output:
+            info: a CacheInfo tuple of the number of hits, misses, evictions and invalidations, the number of cached results and the maximum number of cached results
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        return CacheInfo(*self._cache_stats, len(self._cache), self.cache_size)
+
+    def cache_clear(self):
+        """
+        Function Description: Empties the result cache and resets its statistics
+
+        Input:
+            None
+
+        Output:
+            None
+
+        Time Complexity: O(C) where C is the number of cached results
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        self._cache.clear()
+        self._cached_words.clear()
+        self._cache_stats = [0, 0, 0, 0]
+
+    def add_words(self, words):
+        """
+        Function Description: Adds one occurrence of each of the words to the dictionary
+
+        Approach Description: Each word is inserted into the trie, which updates only the rankings on the path of the word, and the cached results that may have changed are dropped.
+
+        Input:
+            words: an iterable of strings representing the words to add
+
+        Output:
+            None
+
+        Time Complexity: O(T) where T is the number of characters in the words
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        with self._write_lock:
+            for word in words:
+                self._invalidate(word, self.trie.insert(word))
+                if self._edits is not None:
+                    self._edits.set_frequency(word, self._edits.frequency.get(word, 0) + 1)
+            self._publish()
+
+    def remove_words(self, words):
+        """
+        Function Description: Removes the words from the dictionary
+
+        Approach Description: The frequency of each word is set to 0, which removes the word and repairs only the rankings on its path. Words that are not in the dictionary are ignored.
+
+        Input:
+            words: an iterable of strings representing the words to remove
+
+        Output:
+            None
+
+        Time Complexity: O(T) where T is the number of characters in the words
+
+        Auxiliary Space/Space Complexity: O(W) where W is the number of characters in the longest word
+        """
+        with self._write_lock:
+            for word in words:
+                self._set_frequency(word, 0)
+            self._publish()
+
+    def set_frequency(self, word, frequency):
+        """
+        Function Description: Sets how many times a word features in the dictionary
+
+        Approach Description: The frequency is set with the set_frequency method of the trie, which repairs only the rankings on the path of the word, and the cached results that may have changed are dropped. A frequency of 0 removes the word.
+
+        Input:
+            word: a string representing the word
+            frequency: an integer representing the new frequency of the word
+
+        Output:
+            None
+
+        Time Complexity: O(W) where W is the number of characters in the word
+
+        Auxiliary Space/Space Complexity: O(W) where W is the number of characters in the word
+        """
+        with self._write_lock:
+            self._set_frequency(word, frequency)
+            self._publish()
+
+    def _set_frequency(self, word, frequency):
+        """
+        Function Description: Sets the frequency of a word without publishing the change, for methods that make several changes under the write lock
+
+        Input:
+            word: a string representing the word
+            frequency: an integer representing the new frequency of the word
+
+        Output:
+            None
+
+        Time Complexity: O(W) where W is the number of characters in the word
+
+        Auxiliary Space/Space Complexity: O(W) where W is the number of characters in the word
+        """
+        if not hasattr(self.trie, 'set_frequency'):
+            raise TypeError(f"The {type(self.trie).__name__} backend does not support changing frequencies")
+        self._invalidate(word, self.trie.set_frequency(word, frequency))
+        if self._edits is not None:
+            self._edits.set_frequency(word, frequency)
+
+    def _publish(self):
+        """
+        Function Description: Publishes the changes made to the dictionary, if concurrent is True
+
+        Input:
+            None
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        if self.concurrent:
+            self.trie.publish()
+
+    def ingest(self, message):
+        """
+        Function Description: Adds the words of a message from a stream to the dictionary
+
+        Approach Description: The message is split into words in the same way as the input file. Without a half_life or window each word is added with add_words. With a window the word counts of each message are kept in a queue, and once more than window messages have been ingested the counts of the oldest message are taken away again with set_frequency, so words only used in old messages are removed. With a half_life the counts decay exponentially, which is done lazily by weighting each new occurrence by 2 to the power of the number of half lives since the last rescale, instead of decaying every count. Every count is then relative to the same point in time, so the rankings of the words that did not occur stay correct without being touched and ingesting a message only updates the rankings on the paths of its words. Once the weight reaches 2 to the power of DECAY_RESCALE, every frequency is scaled down by the same power of 2, which keeps every ranking the same, and the words whose frequency fell below DECAY_FLOOR are removed.
+
+        Input:
+            message: a string representing the message
+
+        Output:
+            None
+
+        Time Complexity: O(T*log(k)) where T is the number of characters in the message and k is the size of the ranking, amortised over the rescales if a half_life is given
+
+        Time Complexity Analysis:
+            Each word of the message updates the rankings on its path with set_frequency, and each word of the message that leaves the window does the same, leading to O(T*log(k)) time complexity if the frequencies go up.
+            A rescale takes O(U) time, where U is the number of words, once every DECAY_RESCALE half lives, and each removed word was ingested before, so it is amortised over the ingested messages.
+
+        Auxiliary Space/Space Complexity: O(T*window) where T is the number of characters in a message, if a window is given
+        """
+        words = self.clean_and_split(message)
+        if self.half_life is None and self.window is None:
+            self.add_words(words)
+            return
+        counts = Counter(words)
+        with self._write_lock:
+            weight = 2.0 ** (self._ticks / self.half_life) if self.half_life is not None else 1
+            for word, count in counts.items():
+                self._set_frequency(word, self.trie.word_frequency(word) + count * weight)
+            if self.window is not None:
+                self._messages.append(counts)
+                if len(self._messages) > self.window:
+                    for word, count in self._messages.popleft().items():
+                        self._set_frequency(word, self.trie.word_frequency(word) - count)
+            else:
+                self._ticks += 1
+                if self._ticks >= DECAY_RESCALE * self.half_life:
+                    self._rescale()
+            self._publish()
+
+    def _rescale(self):
+        """
+        Function Description: Scales the decayed frequencies down, so the weight of a new occurrence is close to 1 again
+
+        Approach Description: The frequencies are divided by 2 to the power of the whole number of half lives since the last rescale, which is exact for floats, so the rankings and the cached results stay the same. The words whose frequency is then below DECAY_FLOOR are removed with set_frequency, which frees their word ids, so only the words in the word table are visited.
+
+        Input:
+            None
+
+        Output:
+            None
+
+        Time Complexity: O(U + R*W) where U is the number of words stored, R is the number of removed words and W is the number of characters in the longest word
+
+        Auxiliary Space/Space Complexity: O(U) where U is the number of words stored
+        """
+        halvings = int(self._ticks // self.half_life)
+        factor = 2.0 ** -halvings
+        self._ticks -= halvings * self.half_life
+        self.trie.scale(factor)
+        if self._edits is not None:
+            frequency = self._edits.frequency
+            for word in frequency:
+                frequency[word] *= factor
+        frequency = self.trie.frequency
+        for word, word_id in list(self.trie.word_ids.items()):
+            if frequency[word_id] < DECAY_FLOOR:
+                self._set_frequency(word, 0)
+
+    def check_edits(self, input_word, max_distance=1):
+        """
+        Function Description: Checks for suggestions within an edit distance of the input word
+
+        Approach Description: Unlike check, which only suggests words sharing a prefix with the input word, this method finds the words that can be made from the input word with at most max_distance insertions, deletions, substitutions or swaps of adjacent characters, so a typo in the first character is also corrected. The words are looked up in a DeletionIndex of the dictionary, which is built from the trie the first time it is needed, or again if a larger max_distance is needed, and is kept up to date by add_words, remove_words and set_frequency. The suggestions are ranked by edit distance and then by frequency. Like check, it returns an empty list if the word is in the dictionary.
+
+        Input:
+            input_word: a string representing the word to check for suggestions
+            max_distance: an integer representing the largest edit distance of the suggestions
+
+        Output:
+            suggestions: a list of up to k strings representing the closest and most frequent words within max_distance of the input word
+
+        Time Complexity: O(D + C) where D is the number of deletions of the input word and C is the number of words found under them, after the index is built in O(U*D) time for U words in the dictionary
+
+        Auxiliary Space/Space Complexity: O(D + C) where D is the number of deletions of the input word and C is the number of words found under them
+        """
+        edits = self._edits
+        if edits is None or edits.max_distance < max_distance:
+            # Changes made while the index is built would be missed, so it is built under the write lock
+            with self._write_lock:
+                edits = self._edits
+                if edits is None or edits.max_distance < max_distance:
+                    with self._phase('edit_index'):
+                        words = ((prefix, frequency) for prefix, frequency, _ in self.trie.export_nodes() if frequency)
+                        edits = self._edits = DeletionIndex(words, max_distance)
+        if input_word in edits.frequency:
+            return []
+        return [word for _, word in edits.lookup(input_word, max_distance, self.trie.rank_size)]
+
+    def check_many(self, input_words):
+        """
+        Function Description: Checks for suggestions for many input words at once
+
+        Approach Description: This method removes duplicate input words and sorts the rest, so that words sharing a prefix are next to each other. The trie is then searched with search_many, which reuses the path of the prefix shared with the previous word instead of starting again from the root. A Trie is searched with suggest_many instead, which also reuses the suggestions merged along that path, so a word only merges the rankings of the nodes after the shared prefix. The suggestions are returned in the order of the input words.
+
+        Input:
+            input_words: an iterable of strings representing the words to check for suggestions
+
+        Output:
+            suggestions: a list with a list of suggestions for each input word, as returned by check
+
+        Time Complexity: O(N*log(N)*M + S) where N is the number of input words, M is the number of characters in the longest word and S is the number of characters of the distinct words after the prefix shared with the previous word
+
+        Time Complexity Analysis:
+            Sorting the distinct words compares O(N*log(N)) pairs of strings of up to M characters, and search_many walks S characters and merges N rankings, leading to O(N*log(N)*M + S) time complexity.
+
+        Auxiliary Space/Space Complexity: O(N) where N is the number of input words
+        """
+        input_words = list(input_words)
+        distinct = set(input_words)
+        if hasattr(self.trie, 'suggest_many'):
+            results = dict(self.trie.suggest_many(sorted(distinct)))
+        else:
+            results = {}
+            for word, ranking in self.trie.search_many(sorted(distinct)):
+                results[word] = [rank[2] for rank in ranking.ranking if rank[2]] if ranking else []
+        # The first occurrence of a word takes its list, and only repeated words are copied, which keeps the number of lists left for the garbage collector down
+        suggestions = []
+        for word in input_words:
+            if word in distinct:
+                distinct.remove(word)
+                suggestions.append(results[word])
+            else:
+                suggestions.append(list(results[word]))
+        return suggestions
+
+    def save(self, path):
+        """
+        Function Description: Saves the dictionary to a snapshot file
+
+        Approach Description: The trie is serialised with FrozenTrie.to_bytes and written to the file. The snapshot can be opened with SpellChecker.load without reading or tokenizing the input file again.
+
+        Input:
+            path: a string representing the path of the snapshot file
+
+        Output:
+            None
+
+        Time Complexity: O(N*W) where N is the number of nodes in the trie and W is the number of characters in the longest word
+
+        Auxiliary Space/Space Complexity: O(N*W) where N is the number of nodes in the trie and W is the number of characters in the longest word
+        """
+        with open(path, 'wb') as file:
+            file.write(FrozenTrie.to_bytes(self.trie))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Function Description: Loads a SpellChecker from a snapshot file
+
+        Approach Description: The snapshot file is memory mapped and searched in place by a FrozenTrie, so loading takes constant time and the pages of the file are shared by every process that loads it. The returned SpellChecker is read-only.
+
+        Input:
+            path: a string representing the path of a snapshot file written by SpellChecker.save
+
+        Output:
+            checker: a SpellChecker object using the snapshot
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        checker = cls()
+        checker.trie = FrozenTrie.open(path)
+        return checker
+
+    def share(self, name=None):
+        """
+        Function Description: Publishes the dictionary into shared memory, so that other processes can attach to it
+
+        Approach Description: The trie is serialised with FrozenTrie.to_bytes into a new shared memory block. Worker processes then use SpellChecker.attach with the name of the block, which searches the snapshot in place, so the dictionary is stored once per host instead of once per worker. The block stays available until close is called on this SpellChecker, which removes it. Workers that are already attached keep working after the block is removed, as the memory is only freed once every process has closed it.
+
+        Input:
+            name: a string representing the name of the shared memory block, or None for a random name
+
+        Output:
+            name: a string representing the name of the shared memory block
+
+        Time Complexity: O(N*W) where N is the number of nodes in the trie and W is the number of characters in the longest word
+
+        Auxiliary Space/Space Complexity: O(N*W) where N is the number of nodes in the trie and W is the number of characters in the longest word
+        """
+        snapshot = FrozenTrie.to_bytes(self.trie)
+        shared = shared_memory.SharedMemory(name=name, create=True, size=len(snapshot))
+        shared.buf[:len(snapshot)] = snapshot
+        self._shared.append(shared)
+        return shared.name
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Function Description: Attaches a read-only SpellChecker to a dictionary published with SpellChecker.share
+
+        Approach Description: The shared memory block is searched in place by a FrozenTrie, so attaching takes constant time and does not copy the dictionary. The returned SpellChecker is read-only, like one returned by SpellChecker.load.
+
+        Input:
+            name: a string representing the name returned by SpellChecker.share
+
+        Output:
+            checker: a SpellChecker object using the shared dictionary
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        checker = cls()
+        checker.trie = FrozenTrie.attach(name)
+        return checker
+
+    def close(self):
+        """
+        Function Description: Closes the snapshot file or shared memory of a SpellChecker returned by SpellChecker.load or SpellChecker.attach, and removes the shared memory published by SpellChecker.share
+
+        Input:
+            None
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        if isinstance(self.trie, FrozenTrie):
+            self.trie.close()
+        for shared in self._shared:
+            # An attached worker may have unregistered the block from a resource tracker shared with this process
+            resource_tracker.register(shared._name, 'shared_memory')
+            shared.close()
+            shared.unlink()
+        self._shared = []
+    
+class PreferenceManager:
+    def __init__(self, preferences, places):
+        """
+        Function Description: This function initialises the PreferenceManager object with the given preferences and places.
+
+        Approach Description: The function initialises the preferences, number of people, places, number of places, place nodes, and edges in the graph. It then creates the network for the Ford-Fulkerson algorithm and sets up the graph.
+
+        Input:
+            preferences (list): A list of lists representing the preferences of each participant for each activity.
+            places (list): A list of integers representing the number of places available in each activity.
+
+        Output:
+            None
+
+        Time Complexity: O(n * m), where n is the number of people and m is the number of places
+        """
+        self.preferences = preferences
+        self.num_people = len(preferences)
+        self.places = places
+        self.num_places = len(places)
+        self.place_nodes = [None for _ in range(self.num_places)]
+        self.edges = self.create_network()
+        self.graph_setup()
+        self.calculate_path()
+
+    def create_network(self):
+        """
+        Function Description: This function creates the network for the Ford-Fulkerson algorithm.
+
+        Approach Description: The function calculates the index boundaries for the leader, people, places, and sink nodes in the graph. It then adds the people, preferences, leaders, non-leaders, and sink edges to the graph.
+
+        Input:
+            None
+
+        Output:
+            people_edges + preference_edges + leaders_edges + non_leadeer_edges + sink_edges (list): A list of tuples representing the edges in the graph.
+
+        Time Complexity: O(n * m), where n is the number of people and m is the number of places
+
+        Time Complexity Analysis:
+            The calculate_boundaries function calculates the index boundaries for the leader, people, places, and sink nodes in the graph, leading to O(1) time complexity.
+            The people edges, node addition, preference edges, leader edges, non-leader edges, and sink edges are added to the graph, leading to O(n + m + n * m + m + m + m) time complexity.
+            Since n * m is the dominant term, the overall time complexity is O(n * m)
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space Complexity/Space Complexity: O(n * m), where n is the number of people and m is the number of places
+        
+        """
+        # Calculate the index boundaries for the leader, people, places, and sink nodes in the graph
+        boundary_leader, boundary_people, boundary_places, boundary_sink = self.calculate_boundaries()
+        # Add the people, preferences, leaders, non-leaders, and sink edges to the graph
+        people_edges = self.add_people_edges()
+        self.add_place_nodes(boundary_leader, boundary_people)
+        preference_edges = self.add_preferences(boundary_leader, boundary_people)
+        leaders_edges = self.add_leader_edges(boundary_leader, boundary_places)
+        non_leadeer_edges = self.add_non_leader_edges(boundary_people, boundary_places, boundary_leader)
+        sink_edges = self.add_sink_edges(boundary_places, boundary_sink)
+        # Return the edges in the graph
+        return people_edges + preference_edges + leaders_edges + non_leadeer_edges + sink_edges
+
+    def calculate_boundaries(self):
+        """
+        Function Description: This function calculates the beginning index of the leader, people, places, and sink nodes in the edges list.
+
+        Approach Description: The boundary for the leader accounts for the nodes for each person and the source node. The boundary for the people accounts for the nodes for each person, the source node, and the leader nodes. The boundary for the places accounts for the nodes for each person, the source node, the leader nodes, and the people nodes. The boundary for the sink accounts for the nodes for each person, the source node, the leader nodes, the people nodes, and the places nodes.
+
+        Input:
+            None
+
+        Output:
+            boundary_leader (int): The beginning index of the leader nodes in the edges list.
+            boundary_people (int): The beginning index of the people nodes in the edges list.
+            boundary_places (int): The beginning index of the places nodes in the edges list.
+            boundary_sink (int): The beginning index of the sink nodes in the edges list.
+
+        Time Complexity: O(1)
+
+        Time Complexity Analysis:
+            The addition and multiplication operations to calculate the boundaries take O(1) time.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space Complexity/Space Complexity: O(1)
+
+        Auxiliary Space/Space Complexity Analysis:
+            No additional space is used to calculate the boundaries, leading to an auxiliary space complexity of O(1).
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        """
+        # Calculate the boundaries for the leader, people, places, and sink nodes
+        return self.num_people + 1,\
+            self.num_people + self.num_places + 1, \
+            2 * self.num_places + self.num_people + 1, \
+            3 * self.num_places + self.num_people + 1
+
+    def add_sink_edges(self, boundary_places, boundary_sink):
+        """
+        Function Description: This function adds the sink edges to the graph.
+
+        Approach Description: The function iterates over each activity and adds an edge from the activity node to the sink node with the capacity of the activity.
+
+        Input:
+            boundary_places (int): The boundary for the places in the graph.
+            boundary_sink (int): The boundary for the sink in the graph.
+
+        Output:
+            sink_edges (list): A list of tuples representing the sink edges in the graph.
+
+        Time Complexity: O(m), where m is the number of places
+
+        Time Complexity Analysis:
+            The function iterates over each activity and adds an edge from the activity node to the sink node with the capacity of the activity. Therefore, the time complexity is O(m), where m is the number of places.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space Complexity/Space Complexity: O(m), where m is the number of places
+
+        Auxiliary Space/Space Complexity Analysis:
+            The function creates a list of tuples representing the sink edges in the graph, leading to an auxiliary space complexity of O(m), where m is the number of places.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        """
+        # Initialise a fixed size list for the sink edges
+        sink_edges = [None for _ in range(self.num_places)]
+        # Iterate over each activity and add an edge from the activity node to the sink node with the capacity of the activity
+        for activity_index in range(self.num_places):
+            sink_edges[activity_index] = ((boundary_places + activity_index, boundary_sink, self.places[activity_index]))
+        return sink_edges
+
+    def add_non_leader_edges(self, boundary_people, boundary_places, boundary_leader):
+        """
+        Function Description: This function adds the non-leader edges to the graph.
+
+        Approach Description: The function iterates over each activity and adds edges from the people and leader nodes to the activity node with the capacity of the activity minus 2.
+
+        Input:
+            boundary_people (int): The boundary for the people in the graph.
+            boundary_places (int): The boundary for the places in the graph.
+            boundary_leader (int): The boundary for the leader in the graph.
+
+        Output:
+            people_edges (list): A list of tuples representing the non-leader edges in the graph.
+
+        Time Complexity: O(m), where m is the number of places
+
+        Time Complexity Analysis:
+            The function iterates over each activity and adds edges from the people and leader nodes to the activity node with the capacity of the activity minus 2. Therefore, the time complexity is O(m), where m is the number of places.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space Complexity/Space Complexity: O(m), where m is the number of places
+
+        Auxiliary Space/Space Complexity Analysis:
+            The function creates a list of tuples representing the non-leader edges in the graph, leading to an auxiliary space complexity of O(m), where m is the number of places.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        """
+        # Initialise a fixed size list for the non-leader edges
+        people_edges = [None for _ in range(2 * self.num_places)]
+        # Iterate over each activity and add edges from the people and leader nodes to the activity node with the capacity of the activity minus 2
+        for activity_index in range(self.num_places):
+            people_edges[2 * activity_index] = ((boundary_people + activity_index, boundary_places + activity_index, self.places[activity_index] - 2))
+            people_edges[2 * activity_index + 1] = ((boundary_leader + activity_index, boundary_people + activity_index, self.places[activity_index] - 2))
+        return people_edges
+
+    def add_leader_edges(self, boundary_leader, boundary_places):
+        """
+        Function Description: This function adds the leader edges to the graph.
+
+        Approach Description: The function iterates over each activity and adds an edge from the leader node to the activity node with a capacity of 2.
+
+        Input:
+            boundary_leader (int): The boundary for the leader in the graph.
+            boundary_places (int): The boundary for the places in the graph.
+
+        Output:
+            leader_edges (list): A list of tuples representing the leader edges in the graph.
+
+        Time Complexity: O(m), where m is the number of places
+
+        Time Complexity Analysis:
+            The function iterates over each activity and adds an edge from the leader node to the activity node with a capacity of 2. Therefore, the time complexity is O(m), where m is the number of places.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space Complexity/Space Complexity: O(m), where m is the number of places
+
+        Auxiliary Space/Space Complexity Analysis:
+            The function creates a list of tuples representing the leader edges in the graph, leading to an auxiliary space complexity of O(m), where m is the number of places.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        """
+        # Initialise a fixed size list for the leader edges
+        leader_edges = [None for _ in range(self.num_places)]
+        # Iterate over each activity and add an edge from the leader node to the activity node with a capacity of 2
+        for activity_index in range(self.num_places):
+            leader_edges[activity_index] = ((boundary_leader + activity_index, boundary_places + activity_index, 2))
+        return leader_edges
+
+    def add_people_edges(self):
+        """
+        Function Description: This function adds the people edges to the graph.
+
+        Approach Description: The function iterates over each person and adds an edge from the source node to the person node with a capacity of 1.
+
+        Input:
+            None
+
+        Output:
+            people_edges (list): A list of tuples representing the people edges in the graph.
+
+        Time Complexity: O(n), where n is the number of people
+
+        Time Complexity Analysis:
+            The function iterates over each person and adds an edge from the source node to the person node with a capacity of 1. Therefore, the time complexity is O(n), where n is the number of people.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space Complexity/Space Complexity: O(n), where n is the number of people
+
+        Auxiliary Space/Space Complexity Analysis:
+            The function creates a list of tuples representing the people edges in the graph, leading to an auxiliary space complexity of O(n), where n is the number of people.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        """
+        # Initialise a fixed size list for the people edges
+        people_edges = [None for _ in range(self.num_people)]
+        # Iterate over each person and add an edge from the source node to the person node with a capacity of 1
+        for people_index in range(self.num_people):
+            people_edges[people_index] = ((0, people_index + 1, 1))
+        return people_edges
+    
+    def add_place_nodes(self, boundary_leader, boundary_people):
+        """
+        Function Description: Adds references to the leader and people nodes in the graph.
+
+        Approach Description: Iterates over each place and adds the leader and people nodes to the list of nodes.
+
+        Input:
+            boundary_leader (int): The boundary for the leader in the graph.
+            boundary_people (int): The boundary for the people in the graph.
+
+        Output:
+            None
+        
+        Time Complexity: O(m), where m is the number of places
+
+        Time Complexity Analysis:
+            The function iterates over each place and adds the leader and people nodes to the list of nodes. Therefore, the time complexity is O(m), where m is the number of places.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space Complexity/Space Complexity: O(m), where m is the number of places
+
+        Auxiliary Space/Space Complexity Analysis:
+            The function adds the leader and people nodes to the list of nodes, leading to an auxiliary space complexity of O(m), where m is the number of places.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        """
+        # Iterate over each place and add the leader and people nodes to the list of nodes
+        for place_index in range(self.num_places):
+            leader = boundary_leader + place_index
+            people = boundary_people + place_index
+            self.place_nodes[place_index] = ((leader,people))
+
+    def add_preferences(self, boundary_leader, boundary_people):
+        """
+        Function Description: This function adds the preference edges to the graph.
+
+        Approach Description: The function iterates over each person and their preferences for each activity. It then adds an edge from the person node to the activity node with a capacity of 1 if the person is interested in the activity and a capacity of 2 if the person is interested in leading the activity.
+
+        Input:
+            boundary_leader (int): The boundary for the leader in the graph.
+            boundary_people (int): The boundary for the people in the graph.
+
+        Output:
+            preferences_edges (list): A list of tuples representing the preference edges in the graph.
+
+        Time Complexity: O(n * m), where n is the number of people and m is the number of activities
+
+        Time Complexity Analysis:
+            The counting of the amont of edges needed for the preferences takes O(n * m) time, where n is the number of people and m is the number of activities.
+            Initialising the preferences_edges list takes O(n * m) time as the list is of the same size as the amount of edges needed for the preferences.
+            The function iterates over each person and their preferences for each activity. Therefore, the time complexity is O(n * m), where n is the number of people and m is the number of activities.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space Complexity/Space Complexity: 
+            Best Case: O(n), where n is the number of people
+            Average/Worst Case: O(n * m), where n is the number of people and m is the number of activities
+
+        Auxiliary Space/Space Complexity Analysis:
+            The preference_edge_count variable takes up O(1) space.
+
+            Best Case:
+                The preferences_edges list will at a minimum have a size of n because each participant will have at least one preference. Therefore, the auxiliary space complexity is O(n), where n is the number of people.
+
+            Average/Worst Case:
+                The preferences_edges list will have a size of n * m because each participant will have m preferences. Therefore, the auxiliary space complexity is O(n * m), where n is the number of people and m is the number of activities.
+        """
+        # Find the amount of edges needed for the preferences
+        preferences_edge_count = 0
+        for preference in self.preferences:
+            # Count the amount of 1's and 2's in the preference list
+            preferences_edge_count += preference.count(1)
+            preferences_edge_count += preference.count(2)
+        # Initialise a fixed size list for the preference edges
+        preferences_edges = [None for _ in range(preferences_edge_count)]
+        # Create an index to keep track of the current edge
+        preference_edge_index = 0
+        # Iterate over each person and their preferences for each activity
+        for person_index, preference in enumerate(self.preferences):
+            # Iterate over each activity and add an edge from the person node to the activity node with a capacity of 1 if the person is interested in the activity and a capacity of 2 if the person is interested in leading the activity
+            for activity_index, interest in enumerate(preference):
+                # Add an edge from the person node to the activity node with a capacity of 1 if the person is interested in the activity or leading the activity
+                if interest == 1:
+                    preferences_edges[preference_edge_index] = ((person_index + 1, boundary_people + activity_index, 1))
+                    preference_edge_index += 1
+                # If the person is interested in leading the activity,change the boundary to the leader node
+                elif interest == 2:
+                    preferences_edges[preference_edge_index] = ((person_index + 1, boundary_leader + activity_index, 1))
+                    preference_edge_index += 1
+        return preferences_edges
+
+    def graph_setup(self):
+        """
+        Function Description: This function sets up the graph for the Ford-Fulkerson algorithm.
+
+        Approach Description: The function initializes the source and sink vertices and the number of vertices in the graph. It then creates an adjacency list representation of the graph and adds the edges to the graph.
+
+        Input:
+            None
+
+        Output:
+            None
+        
+        Time Complexity:
+            Best Case: O(n * m), where n is the number of people and m is the number of activities
+            Average/Worst Case: O(n * m), where n is the number of people and m is the number of activities
+
+        Time Complexity Analysis:
+            The for loop iterates over each edge in the input list to find the maximum vertex value. Therefore, the time complexity is O(E), where E is the number of edges.
+            The graph initilisation creates a list of lists for each vertex, leading to O(V) time complexity, where V is the number of vertices.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space Complexity/Space Complexity: O(V), where V is the number of vertices
+
+        Auxiliary Space/Space Complexity Analysis:
+            The function uses a list of lists to represent the graph, leading to an auxiliary space complexity of O(V), where V is the number of vertices.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        """
+        # Find the maximum vertex value
+        vertex_max = 0
         # Iterate over the edges to find the maximum vertex value
         for start, end, _ in self.edges:
             vertex_max = max(vertex_max, start, end)
@@ -920,285 +4857,1029 @@ class PreferenceManager:
         # Add all edges to the graph
         self.add_edges()
     
-    def calculate_path(self):
-        self.ford_fulkerson()
-        self.reconstructed_graph = self.reconstruct_graph()
+    def calculate_path(self):
+        self.ford_fulkerson()
+        self.reconstructed_graph = self.reconstruct_graph()
+
+    def add_edges(self):
+        """
+        Function Description: This function adds edges to the graph, representing roads with capacities.
+
+        Approach Description: The graph is an adjacency list, where each index represents a location. Each location contains a list of edges, where each edge is represented by a list containing the destination and the capacity of the road. For each edge in the input list, the function adds a forward edge with the given capacity and a backward edge with zero capacity to the graph.
+
+        Input:
+            None
+
+        Output: 
+            None
+        
+        Time Complexity: O(E), where E is the number of edges
+
+        Time Complexity Analysis: 
+            The function iterates over each edge in the input list to add it to the graph. Therefore, the time complexity is O(E), where E is the number of edges.
+            The append operation for adding an edge to the adjacency list takes O(1) time leading to O(E + 1), O(E).
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        
+        Auxiliary Space Complexity/Space Complexity: O(1)
+
+        Auxiliary Space/Space Complexity Analysis: 
+            The function uses a constant amount of extra space for variables, resulting in an auxiliary space complexity of O(1).
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        """
+        for start, end, capacity in self.edges:
+            self.graph[start].append([end, capacity])
+            self.graph[end].append([start, 0])
+
+    def bfs(self, parent):
+        """
+        Function Description: This function performs a breadth-first search to find a path from the source to the sink in the graph.
+
+        Approach Description: The function initializes a list to keep track of visited vertices and a queue to store the vertices to visit. It then iterates over the queue, visiting each vertex and adding its neighbors to the queue if they have not been visited and have a positive capacity. If the sink is reached, the function returns True. Otherwise, it returns False.
+
+        Input:
+            parent (list): A list to store the parent of each vertex in the path
+
+        Output:
+            True if a path from the source to the sink is found, False otherwise
+
+        Time Complexity: O(n^2), where n is the number of participants
+
+        Time Complexity Analysis:
+            The initialisation of teh visited list takes O(V) time, where V is the number of vertices.
+            The time complexity of the breadth-first search function is O(V + E), where V is the number of vertices and E is the number of edges.
+            The number of vertices is equal to the the source (1), the number of participants (n), the sink (1), the number of places (m), the number of leaders (m), and the number of people (m), leading to a total of V = 3m + 2n + 2 vertices.
+        
+        Auxiliary Space Complexity/Space Complexity: O(V), where V is the number of vertices
+        
+        Auxiliary Space/Space Complexity Analysis:
+            The function uses a list to keep track of visited vertices and a queue to store the vertices to visit, leading to an auxiliary space complexity of O(V), where V is the number of vertices.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        """
+        # Initialize a list to keep track of visited vertices
+        visited = [False] * self.vertices
+        # Initialize a queue to store the vertices to visit
+        queue = [self.source]
+        # Mark the source vertex as visited
+        visited[self.source] = True
+
+        # Iterate over the queue
+        while queue:
+            # Get the current vertex
+            current = queue.pop()
+            # For each neighbor of the current vertex
+            for neighbor, capacity in self.graph[current]:
+                # If the neighbor has not been visited and has a positive capacity
+                if not visited[neighbor] and capacity > 0:
+                    # Set the parent of the neighbor to the current vertex
+                    parent[neighbor] = current
+                    # If the neighbor is the sink, return True
+                    if neighbor == self.sink:
+                        return True
+                    # If the neighbor is not the sink, mark it as visited and add it to the queue
+                    queue.append(neighbor)
+                    visited[neighbor] = True
+        # If none of the verticies with positive capacity reach the sink, return False
+        return False
+
+    def ford_fulkerson(self):
+        """
+        Function Description: This function implements the Ford-Fulkerson algorithm to find the maximum flow in the graph.
+
+        Approach Description: The function initializes a parent list to store the augmenting path and the max flow to zero. It then checks if there is a path from the source to the sink using the breadth-first search function. If a path is found, the function initializes the path flow to infinity and the current node to the sink. It then finds the path from the source to the sink with the minimum flow and updates the residual capacities of the edges on the path. The function returns the max flow.
+
+        Input:
+            None
+
+        Output:
+            max_flow (int): The maximum flow in the graph
+
+        Time Complexity: O(n^3), where n the number of participants
+
+        Time Complexity Analysis:
+            The initialisatin of the parent list takes O(V) time, where V is the number of vertices.
+            The time complexity of the breadth-first search function is O(V + E), where V is the number of vertices and E is the number of edges.
+            The amount of 
+
+        Auxiliary Space Complexity/Space Complexity: O(V), where V is the number of vertices
+
+        Auxiliary Space/Space Complexity Analysis:
+            The function uses a list to store the augmenting path of length V and the max flow, leading to an auxiliary space complexity of O(V), where V is the number of vertices.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        """
+        # Initialize parent list to store the augmenting path and max flow
+        parent = [-1] * self.vertices
+        max_flow = 0
+        # Check if there is a path from source to sink
+        while self.bfs(parent):
+            # Initialize path flow to infinity and the current node to the sink
+            path_flow = float("Inf")
+            current_node = self.sink
+
+            # Find the path from source to sink with minimum flow
+            while current_node != self.source:
+                prev_node = parent[current_node]
+                # Find the edge that connects current node and previous node with minimum capacity
+                for edge in self.graph[prev_node]:
+                    if edge[0] == current_node:
+                        path_flow = min(path_flow, edge[1])
+                current_node = prev_node
+
+            # Add the minimum capacity to the max flow
+            max_flow += path_flow
+
+            # Update the residual capacities of the edges on the path
+            current_node = self.sink
+            while current_node != self.source:
+                prev_node = parent[current_node]
+
+                # Decrease capacity of the forward edge
+                for edge in self.graph[prev_node]:
+                    if edge[0] == current_node:
+                        edge[1] -= path_flow
+
+                # Increase capacity of the backward edge
+                for edge in self.graph[current_node]:
+                    if edge[0] == prev_node:
+                        edge[1] += path_flow
+
+                current_node = prev_node
+
+        return max_flow
+
+    def reconstruct_graph(self):
+        """
+        Function Description: This function reconstructs the graph with only the forward edges used in the flow.
+
+        Approach Description: The function creates a new graph with the same number of vertices as the original graph. It then iterates over each vertex in the original graph and each edge in the adjacency list of the vertex. If the capacity of the edge is zero, the function adds the destination vertex to the reconstructed graph.
+
+        Input:
+            None
+
+        Output:
+            reconstructed_graph (list): A list of lists representing the reconstructed graph with only the forward edges used in the flow
+
+        Time Complexity: O(n^2), where n is the number of participants
+
+        Time Complexity Analysis:
+            The function creates a new graph with the same number of vertices as the original graph, leading to O(V) time complexity.
+            The function iterates over each vertex in the original graph and each edge in the adjacency list of the vertex, leading to O(V + E) time complexity.
+            The amount of vertices is equal to 3m + 2n + 2. The amount of of edges is at worst n * m, leading to O((3m + 2n + 2) + n * m), O(n * m).
+            The number of activities is equal to at most n/2, leading to O(n * n / 2), O(n^2).
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space Complexity/Space Complexity: O(n^2), where V is the number of vertices and E is the number of edges
+
+        Auxiliary Space/Space Complexity Analysis:
+            The function creates a new graph with the same number of vertices as the original graph and iterates over each vertex in the original graph and each edge in the adjacency list of the vertex, leading to an auxiliary space complexity of O(V + E), where V is the number of vertices and E is the number of edges.
+            Described in terms of the number of participants, the auxiliary space complexity is O(n^2), where n is the number of participants.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        """
+        # Create a new graph with the same number of vertices as the original graph
+        reconstructed_graph = [[] for _ in range(self.vertices)]
+        # Iterate over each vertex in the original graph
+        for start in range(self.vertices):
+            # Iterate over each edge in the adjacency list of the vertex
+            for edge in self.graph[start]:
+                # If the capacity of the edge is zero, add the destination vertex to the reconstructed graph
+                if edge[1] == 0:
+                    reconstructed_graph[start].append(edge[0])
+        return reconstructed_graph
+
+        return "\n".join(result)
+    
+    def assign(self):
+        """
+        Function Description: This function assigns participants to activities based on their preferences and the number of places available in each activity.
+
+        Approach Description: The function initialises the result list of fixed size and creates a list of the current index for each place. It then reconstructs the path of maximum flow and assigns the participants to the activities based on the leader and non-leader nodes for each place.
+
+        Input:
+            None
+
+        Output:
+            result (list): A list of lists representing the participants assigned to each activity, or None if it is not possible to assign everyone.
+
+        Time Complexity: O(n^2), where n is the number of participants
+
+        Time Complexity Analysis:
+            The initialisation of the result list takes at most O(n^2) time, where n is the number of participants.
+            The function reconstructs the path of maximum flow, leading to O(n^2) time complexity.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+
+        Auxiliary Space Complexity/Space Complexity: O(n^2), where n is the number of participants
+
+        Auxiliary Space/Space Complexity Analysis:
+            The function initialises the result list of fixed size and creates a list of the current index for each place, leading to an auxiliary space complexity of O(n^2), where n is the number of participants.
+
+            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+        """
+        # Initialise the result list of fixed size
+        result = [[None] * people_allowed for people_allowed in self.places]
+        # Create a list of the current index for each place
+        place_indexs = [0] * self.num_places
+        # Reconstruct the path of maximum flow
+        path = self.reconstructed_graph
+        # Only get the edges from each person to the places
+        people_assignments = path[1:self.num_people + 1]
+        # Iterate over each place getting the leader and non leader nodes for each place
+        for place_index, place in enumerate(self.place_nodes):
+            # Iterate over each person and their assigned place
+            for person_index, person in enumerate(people_assignments):
+                # Check if the person is assigned to the leader node of the place or the non-leader node of the place
+                for i in range(2):
+                    if person[0] == place[i]:
+                        # Assign the person to the place
+                        result[place_index][place_indexs[place_index]] = (person_index)
+                        place_indexs[place_index] += 1
+
+        # Check if all places have been assigned
+        for place_index in range(self.num_places):
+            # If a place has less people than the number of places available, return None
+            if place_indexs[place_index] < self.places[place_index]:
+                return None
+        return result
+
+
+def assign(preferences, places):
+    """
+    Function Description: This function assigns participants to activities based on their preferences and the number of places available in each activity.
+
+    Approach Description: The function creates a preference manager object with the given preferences and places. It then assigns the participants to the activities using the Ford-Fulkerson algorithm, implemented with a bredth first saerch and returns who is assigned to each activity if it is possible to assign everyone, otherwise it returns None.
+
+    Input:
+        preferences (list): A list of lists representing the preferences of each participant for each activity.
+        places (list): A list of integers representing the number of places available in each activity.
+
+    Output:
+        result (list): A list of lists representing the participants assigned to each activity, or None if it is not possible to assign everyone.
+
+    Time Complexity: O(n^3), where n is the number of participants and m is the number of activities
+
+    Time Complexity Analysis:
+        The function creates a preference manager object with the given preferences and places, leading to O(n * m) time complexity.
+        The function assigns the participants to the activities using the Ford-Fulkerson algorithm, implemented with a bredth first search, leading to O(n^3) time complexity.
+
+        The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+
+    Auxiliary Space Complexity/Space Complexity: O(n^2), where n is the number of participants
+
+    Auxiliary Space/Space Complexity Analysis:
+        The function creates a preference manager object with the given preferences and places, leading to an auxiliary space complexity of O(n * m), where n is the number of participants and m is the number of activities.
+        The function assigns the participants to the activities using the Ford-Fulkerson algorithm, implemented with a bredth first search, leading to an auxiliary space complexity of O(n^2), where n is the number of participants.
+
+        The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+    """
+    # Create the graph and preference manager
+    preference_manager = PreferenceManager(preferences, places)
+    return preference_manager.assign()
+
+class SpellServer:
+    def __init__(self, checker, batch_window=0.001, max_batch=1024, line_limit=LINE_LIMIT):
+        """
+        Function Description: Initialises a server answering spell check requests over TCP or a Unix socket
+
+        Approach Description: The server speaks a line-delimited JSON protocol. Each request is a JSON object on one line with an optional "id", and either a "word", a list of "words", or "metrics": true. Each response is a JSON object on one line with the same "id" and the "suggestions" for the word, a list of suggestions for each of the words, the "metrics" of the server, or an "error". The responses of a connection are written in the order of its requests, and a client may send many requests without waiting for the responses. A request line longer than line_limit bytes is answered with an "error" and the connection is closed, as the rest of the line can not be told apart from the next request.
+
+        The words of every request that arrives within batch_window seconds of the first waiting request are checked together with one call to SpellChecker.check_many, from every connection, so the cost of the lookup is shared by the batch instead of paid per request. A batch is checked early once it holds max_batch words.
+
+        Input:
+            checker: a SpellChecker object used to answer the requests
+            batch_window: a float representing the number of seconds to gather requests for a batch
+            max_batch: an integer representing the number of words that checks a batch without waiting for the window to end
+            line_limit: an integer representing the longest request line in bytes
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        if batch_window < 0 or max_batch < 1 or line_limit < 1:
+            raise ValueError("batch_window must be at least 0, and max_batch and line_limit at least 1")
+        self.checker = checker
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.line_limit = line_limit
+        self.server = None
+        # The requests waiting for the next batch, as lists of words and the futures of their results
+        self._pending = []
+        self._pending_words = 0
+        self._timer = None
+        self.requests = 0
+        self.batches = 0
+        self.words = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.queue_counts = [0] * (len(QUEUE_BUCKETS) + 1)
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """
+        Function Description: Starts listening for connections on a TCP port, or on a Unix socket if path is given
+
+        Input:
+            host: a string representing the address to listen on
+            port: an integer representing the TCP port, or 0 for a free port
+            path: a string representing the path of a Unix socket, or None to listen on TCP
+
+        Output:
+            address: the address the server listens on, a (host, port) tuple or the path of the Unix socket
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle, path=path, limit=self.line_limit)
+        else:
+            self.server = await asyncio.start_server(self._handle, host, port, limit=self.line_limit)
+        return self.server.sockets[0].getsockname()
+
+    async def close(self):
+        """
+        Function Description: Stops listening for connections and waits for the server to close
+
+        Input:
+            None
+
+        Output:
+            None
+
+        Time Complexity: O(C) where C is the number of open connections
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        self.server.close()
+        await self.server.wait_closed()
+
+    def submit(self, words):
+        """
+        Function Description: Adds words to the next batch and returns a future of their suggestions
+
+        Approach Description: The first request of a batch schedules the batch to be checked once batch_window seconds have passed, and later requests join it. A batch that reaches max_batch words is checked at once, so a busy server checks full batches without waiting.
+
+        Input:
+            words: a list of strings representing the words to check
+
+        Output:
+            future: an asyncio future of a list of the suggestions of each word
+
+        Time Complexity: O(1), not counting the batch it may check
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((words, future))
+        self._pending_words += len(words)
+        self.max_queue_depth = max(self.max_queue_depth, len(self._pending))
+        if self._pending_words >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return future
+
+    def _flush(self):
+        """
+        Function Description: Checks every waiting request with one call to check_many and resolves their futures
+
+        Input:
+            None
+
+        Output:
+            None
+
+        Time Complexity: O(N*log(N)*M + S) where N is the number of words in the batch, M is the number of characters in the longest word and S is the number of characters of the distinct words, as for check_many
+
+        Auxiliary Space/Space Complexity: O(N) where N is the number of words in the batch
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._pending_words = self._pending, [], 0
+        if not pending:
+            return
+        self._observe(self.queue_counts, QUEUE_BUCKETS, len(pending))
+        try:
+            results = self.checker.check_many(word for words, _ in pending for word in words)
+        except Exception as error:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        self.batches += 1
+        self.words += len(results)
+        position = 0
+        for words, future in pending:
+            # A future is cancelled if its connection closed while it waited
+            if not future.done():
+                future.set_result(results[position:position + len(words)])
+            position += len(words)
+
+    def _request(self, line):
+        """
+        Function Description: Parses a request line and starts answering it
+
+        Input:
+            line: a bytes object representing one line of the protocol
+
+        Output:
+            request: a tuple of the request id, the kind of request, and a future of the suggestions or the response fields
+
+        Time Complexity: O(L) where L is the number of characters in the line
+
+        Auxiliary Space/Space Complexity: O(L) where L is the number of characters in the line
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return None, 'error', {'error': 'invalid JSON'}
+        if not isinstance(request, dict):
+            return None, 'error', {'error': 'a request must be a JSON object'}
+        request_id = request.get('id')
+        if 'word' in request and isinstance(request['word'], str):
+            return request_id, 'word', self.submit([request['word']])
+        words = request.get('words')
+        if isinstance(words, list) and all(isinstance(word, str) for word in words):
+            return request_id, 'words', self.submit(words)
+        if request.get('metrics') is True:
+            return request_id, 'metrics', None
+        return request_id, 'error', {'error': 'a request needs a "word" string, a "words" list of strings or "metrics": true'}
+
+    async def _handle(self, reader, writer):
+        """
+        Function Description: Answers the requests of one connection
+
+        Approach Description: Requests are read and submitted as they arrive, while a second task writes the responses in request order, so a client can pipeline many requests and they join the same batch. The queue between the two tasks is bounded, so a client that does not read its responses stops being read from. A line over the limit of the reader is answered with an error after the earlier responses, and ends the connection. If the connection fails while requests are waiting, the sender stops, and the waiting requests are dropped from the queue depth and their futures cancelled.
+
+        Input:
+            reader: an asyncio StreamReader of the connection
+            writer: an asyncio StreamWriter of the connection
+
+        Output:
+            None
+
+        Time Complexity: O(R) where R is the number of requests of the connection, not counting their lookups
+
+        Auxiliary Space/Space Complexity: O(B) where B is the largest batch size
+        """
+        responses = asyncio.Queue(self.max_batch)
+        sender = asyncio.create_task(self._send(responses, writer))
+        try:
+            while not sender.done():
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # The line is longer than the limit of the reader
+                    self.requests += 1
+                    self.in_flight += 1
+                    await self._queue(responses, sender, (time.perf_counter(), None, 'error', {'error': f'a request line must be at most {self.line_limit} bytes'}))
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    self.requests += 1
+                    self.in_flight += 1
+                    if not await self._queue(responses, sender, (time.perf_counter(), *self._request(line))):
+                        break
+        except ConnectionError:
+            pass
+        finally:
+            await self._queue(responses, sender, None)
+            try:
+                await sender
+            except ConnectionError:
+                pass
+            # The sender stops early if the connection fails, leaving requests that are never answered
+            while not responses.empty():
+                self._drop(responses.get_nowait())
+            writer.close()
+
+    async def _queue(self, responses, sender, item):
+        """
+        Function Description: Puts a request into the response queue of a connection, unless the sender of the connection stops first
+
+        Approach Description: The queue is bounded, so putting into it waits while the queue is full. If the sender stopped because the connection failed, the queue is never emptied again, so the put is abandoned and the request is dropped.
+
+        Input:
+            responses: an asyncio Queue of the requests of the connection
+            sender: the asyncio Task writing the responses of the connection
+            item: a request tuple, or None to end the queue
+
+        Output:
+            queued: a boolean representing whether the item was put into the queue
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        if not responses.full():
+            responses.put_nowait(item)
+            return True
+        put = asyncio.ensure_future(responses.put(item))
+        await asyncio.wait((put, sender), return_when=asyncio.FIRST_COMPLETED)
+        if put.done():
+            return True
+        put.cancel()
+        self._drop(item)
+        return False
+
+    def _drop(self, item):
+        """
+        Function Description: Forgets a request that will never be answered, as its connection failed
+
+        Input:
+            item: a request tuple of the response queue of a connection, or None
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        if item is not None:
+            self.in_flight -= 1
+            if isinstance(item[3], asyncio.Future):
+                item[3].cancel()
+
+    async def _send(self, responses, writer):
+        """
+        Function Description: Writes the responses of one connection in request order
+
+        Input:
+            responses: an asyncio Queue of the requests of the connection, ending with None
+            writer: an asyncio StreamWriter of the connection
+
+        Output:
+            None
+
+        Time Complexity: O(R) where R is the number of requests of the connection
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        while (item := await responses.get()) is not None:
+            received, request_id, kind, result = item
+            try:
+                if kind == 'metrics':
+                    response = {'metrics': self.metrics()}
+                elif kind == 'error':
+                    response = result
+                else:
+                    suggestions = await result
+                    response = {'suggestions': suggestions[0] if kind == 'word' else suggestions}
+            except Exception as error:
+                response = {'error': str(error)}
+            if 'error' in response:
+                self.errors += 1
+            writer.write((json.dumps({'id': request_id, **response}) + '\n').encode())
+            self.in_flight -= 1
+            self._observe(self.latency_counts, LATENCY_BUCKETS, time.perf_counter() - received)
+            self.latency_sum += time.perf_counter() - received
+            if responses.empty():
+                await writer.drain()
+
+    @staticmethod
+    def _observe(counts, bounds, value):
+        """
+        Function Description: Counts a value in the bucket of a histogram with the smallest upper bound that is at least the value
+
+        Input:
+            counts: a list of integers representing the count of each bucket, with one more bucket than bounds for larger values
+            bounds: a tuple of the upper bounds of the buckets, in increasing order
+            value: a number to count
+
+        Output:
+            None
+
+        Time Complexity: O(log(B)) where B is the number of buckets
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        counts[bisect_left(bounds, value)] += 1
+
+    def metrics(self):
+        """
+        Function Description: Returns the metrics of the server
+
+        Approach Description: The counters are returned with the current queue depth, which is the number of requests received but not yet answered, and two histograms. The latency histogram counts the seconds from reading each request to writing its response, and the queue depth histogram counts the number of requests checked by each batch. Each histogram is a list of buckets with an upper bound "le", None for the last bucket, and the count of values in the bucket.
+
+        Input:
+            None
+
+        Output:
+            metrics: a dictionary of the metrics of the server
+
+        Time Complexity: O(B) where B is the number of buckets
+
+        Auxiliary Space/Space Complexity: O(B) where B is the number of buckets
+        """
+        def histogram(bounds, counts):
+            return [{'le': bound, 'count': count} for bound, count in zip((*bounds, None), counts)]
+        answered = sum(self.latency_counts)
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'words': self.words,
+            'errors': self.errors,
+            'queue_depth': self.in_flight,
+            'max_queue_depth': self.max_queue_depth,
+            'mean_latency': self.latency_sum / answered if answered else 0.0,
+            'latency': histogram(LATENCY_BUCKETS, self.latency_counts),
+            'batch_queue_depth': histogram(QUEUE_BUCKETS, self.queue_counts),
+        }
+
+
+class SpellClient:
+    def __init__(self, reader, writer):
+        """
+        Function Description: Initialises a client of a SpellServer on an open connection, use SpellClient.connect to open one
+
+        Approach Description: Every request gets a new id and a future, which a reading task resolves when the response with the same id arrives. Requests are sent without waiting for earlier responses, so many concurrent calls share one connection and the server batches them together.
+
+        Input:
+            reader: an asyncio StreamReader of the connection
+            writer: an asyncio StreamWriter of the connection
+
+        Output:
+            None
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        self.reader = reader
+        self.writer = writer
+        self._next_id = 0
+        self._waiting = {}
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=None, path=None, line_limit=LINE_LIMIT):
+        """
+        Function Description: Connects to a SpellServer over TCP, or over a Unix socket if path is given
 
-    def add_edges(self):
+        Input:
+            host: a string representing the address of the server
+            port: an integer representing the TCP port of the server
+            path: a string representing the path of the Unix socket of the server, or None to connect over TCP
+            line_limit: an integer representing the longest response line in bytes
+
+        Output:
+            client: a SpellClient object
+
+        Time Complexity: O(1)
+
+        Auxiliary Space/Space Complexity: O(1)
         """
-        Function Description: This function adds edges to the graph, representing roads with capacities.
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=line_limit)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=line_limit)
+        return cls(reader, writer)
 
-        Approach Description: The graph is an adjacency list, where each index represents a location. Each location contains a list of edges, where each edge is represented by a list containing the destination and the capacity of the road. For each edge in the input list, the function adds a forward edge with the given capacity and a backward edge with zero capacity to the graph.
+    async def _receive(self):
+        """
+        Function Description: Resolves the future of each response as it arrives, and fails the waiting requests once the connection closes
 
         Input:
             None
 
-        Output: 
+        Output:
             None
-        
-        Time Complexity: O(E), where E is the number of edges
 
-        Time Complexity Analysis: 
-            The function iterates over each edge in the input list to add it to the graph. Therefore, the time complexity is O(E), where E is the number of edges.
-            The append operation for adding an edge to the adjacency list takes O(1) time leading to O(E + 1), O(E).
+        Time Complexity: O(R) where R is the number of responses
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
-        
-        Auxiliary Space Complexity/Space Complexity: O(1)
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        try:
+            while line := await self.reader.readline():
+                response = json.loads(line)
+                future = self._waiting.pop(response.pop('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("the connection to the server closed"))
+            self._waiting.clear()
+
+    async def request(self, **fields):
+        """
+        Function Description: Sends a request and waits for its response
 
-        Auxiliary Space/Space Complexity Analysis: 
-            The function uses a constant amount of extra space for variables, resulting in an auxiliary space complexity of O(1).
+        Input:
+            fields: the fields of the request, such as word, words or metrics
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
-        """
-        for start, end, capacity in self.edges:
-            self.graph[start].append([end, capacity])
-            self.graph[end].append([start, 0])
+        Output:
+            response: a dictionary of the fields of the response, without its id
 
-    def bfs(self, parent):
-        """
-        Function Description: This function performs a breadth-first search to find a path from the source to the sink in the graph.
+        Time Complexity: O(L) where L is the number of characters in the request and response
 
-        Approach Description: The function initializes a list to keep track of visited vertices and a queue to store the vertices to visit. It then iterates over the queue, visiting each vertex and adding its neighbors to the queue if they have not been visited and have a positive capacity. If the sink is reached, the function returns True. Otherwise, it returns False.
+        Auxiliary Space/Space Complexity: O(L) where L is the number of characters in the request and response
+        """
+        if self._receiver.done():
+            raise ConnectionError("the connection to the server closed")
+        self._next_id += 1
+        future = self._waiting[self._next_id] = asyncio.get_running_loop().create_future()
+        self.writer.write((json.dumps({'id': self._next_id, **fields}) + '\n').encode())
+        await self.writer.drain()
+        response = await future
+        if 'error' in response:
+            raise ValueError(response['error'])
+        return response
+
+    async def check(self, word):
+        """
+        Function Description: Returns the suggestions of the server for a word, as returned by SpellChecker.check
 
         Input:
-            parent (list): A list to store the parent of each vertex in the path
+            word: a string representing the word to check
 
         Output:
-            True if a path from the source to the sink is found, False otherwise
+            suggestions: a list of strings representing the suggestions
 
-        Time Complexity: O(n^2), where n is the number of participants
+        Time Complexity: O(L) where L is the number of characters in the request and response
 
-        Time Complexity Analysis:
-            The initialisation of teh visited list takes O(V) time, where V is the number of vertices.
-            The time complexity of the breadth-first search function is O(V + E), where V is the number of vertices and E is the number of edges.
-            The number of vertices is equal to the the source (1), the number of participants (n), the sink (1), the number of places (m), the number of leaders (m), and the number of people (m), leading to a total of V = 3m + 2n + 2 vertices.
-        
-        Auxiliary Space Complexity/Space Complexity: O(V), where V is the number of vertices
-        
-        Auxiliary Space/Space Complexity Analysis:
-            The function uses a list to keep track of visited vertices and a queue to store the vertices to visit, leading to an auxiliary space complexity of O(V), where V is the number of vertices.
+        Auxiliary Space/Space Complexity: O(L) where L is the number of characters in the request and response
+        """
+        return (await self.request(word=word))['suggestions']
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+    async def check_many(self, words):
         """
-        # Initialize a list to keep track of visited vertices
-        visited = [False] * self.vertices
-        # Initialize a queue to store the vertices to visit
-        queue = [self.source]
-        # Mark the source vertex as visited
-        visited[self.source] = True
+        Function Description: Returns the suggestions of the server for many words, as returned by SpellChecker.check_many
 
-        # Iterate over the queue
-        while queue:
-            # Get the current vertex
-            current = queue.pop()
-            # For each neighbor of the current vertex
-            for neighbor, capacity in self.graph[current]:
-                # If the neighbor has not been visited and has a positive capacity
-                if not visited[neighbor] and capacity > 0:
-                    # Set the parent of the neighbor to the current vertex
-                    parent[neighbor] = current
-                    # If the neighbor is the sink, return True
-                    if neighbor == self.sink:
-                        return True
-                    # If the neighbor is not the sink, mark it as visited and add it to the queue
-                    queue.append(neighbor)
-                    visited[neighbor] = True
-        # If none of the verticies with positive capacity reach the sink, return False
-        return False
+        Input:
+            words: a list of strings representing the words to check
 
-    def ford_fulkerson(self):
+        Output:
+            suggestions: a list with a list of suggestions for each word
+
+        Time Complexity: O(L) where L is the number of characters in the request and response
+
+        Auxiliary Space/Space Complexity: O(L) where L is the number of characters in the request and response
         """
-        Function Description: This function implements the Ford-Fulkerson algorithm to find the maximum flow in the graph.
+        return (await self.request(words=list(words)))['suggestions']
 
-        Approach Description: The function initializes a parent list to store the augmenting path and the max flow to zero. It then checks if there is a path from the source to the sink using the breadth-first search function. If a path is found, the function initializes the path flow to infinity and the current node to the sink. It then finds the path from the source to the sink with the minimum flow and updates the residual capacities of the edges on the path. The function returns the max flow.
+    async def metrics(self):
+        """
+        Function Description: Returns the metrics of the server, as returned by SpellServer.metrics
 
         Input:
             None
 
         Output:
-            max_flow (int): The maximum flow in the graph
+            metrics: a dictionary of the metrics of the server
 
-        Time Complexity: O(n^3), where n the number of participants
+        Time Complexity: O(B) where B is the number of buckets of the histograms
 
-        Time Complexity Analysis:
-            The initialisatin of the parent list takes O(V) time, where V is the number of vertices.
-            The time complexity of the breadth-first search function is O(V + E), where V is the number of vertices and E is the number of edges.
-            The amount of 
+        Auxiliary Space/Space Complexity: O(B) where B is the number of buckets of the histograms
+        """
+        return (await self.request(metrics=True))['metrics']
 
-        Auxiliary Space Complexity/Space Complexity: O(V), where V is the number of vertices
+    async def close(self):
+        """
+        Function Description: Closes the connection to the server
 
-        Auxiliary Space/Space Complexity Analysis:
-            The function uses a list to store the augmenting path of length V and the max flow, leading to an auxiliary space complexity of O(V), where V is the number of vertices.
+        Input:
+            None
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
-        """
-        # Initialize parent list to store the augmenting path and max flow
-        parent = [-1] * self.vertices
-        max_flow = 0
-        # Check if there is a path from source to sink
-        while self.bfs(parent):
-            # Initialize path flow to infinity and the current node to the sink
-            path_flow = float("Inf")
-            current_node = self.sink
+        Output:
+            None
 
-            # Find the path from source to sink with minimum flow
-            while current_node != self.source:
-                prev_node = parent[current_node]
-                # Find the edge that connects current node and previous node with minimum capacity
-                for edge in self.graph[prev_node]:
-                    if edge[0] == current_node:
-                        path_flow = min(path_flow, edge[1])
-                current_node = prev_node
+        Time Complexity: O(1)
 
-            # Add the minimum capacity to the max flow
-            max_flow += path_flow
+        Auxiliary Space/Space Complexity: O(1)
+        """
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._receiver.cancel()
 
-            # Update the residual capacities of the edges on the path
-            current_node = self.sink
-            while current_node != self.source:
-                prev_node = parent[current_node]
 
-                # Decrease capacity of the forward edge
-                for edge in self.graph[prev_node]:
-                    if edge[0] == current_node:
-                        edge[1] -= path_flow
+def read_lines(source, encoding=None, chunk_size=CHUNK_SIZE):
+    """
+    Function Description: Reads the lines of an input, decompressing it while it is read.
 
-                # Increase capacity of the backward edge
-                for edge in self.graph[current_node]:
-                    if edge[0] == prev_node:
-                        edge[1] += path_flow
+    Approach Description: The input is read in chunks with read_chunks and each chunk is split into lines. The last line of a chunk may continue in the next chunk, so it is held back and joined to the start of the next chunk.
 
-                current_node = prev_node
+    Input:
+        source: a file name, path or binary stream
+        encoding: a string representing the encoding of the input, the locale encoding used by open if None
+        chunk_size: an integer representing the number of characters to read at a time
 
-        return max_flow
+    Output:
+        lines: a generator of strings representing the lines of the input, without their line endings
 
-    def reconstruct_graph(self):
-        """
-        Function Description: This function reconstructs the graph with only the forward edges used in the flow.
+    Time Complexity: O(T) where T is the number of characters in the input
 
-        Approach Description: The function creates a new graph with the same number of vertices as the original graph. It then iterates over each vertex in the original graph and each edge in the adjacency list of the vertex. If the capacity of the edge is zero, the function adds the destination vertex to the reconstructed graph.
+    Auxiliary Space/Space Complexity: O(C + L) where C is the chunk size and L is the number of characters in the longest line
+    """
+    partial = ''
+    for chunk in read_chunks(source, encoding, chunk_size):
+        lines = (partial + chunk).split('\n')
+        partial = lines.pop()
+        yield from lines
+    if partial:
+        yield partial
 
-        Input:
-            None
 
-        Output:
-            reconstructed_graph (list): A list of lists representing the reconstructed graph with only the forward edges used in the flow
+def iter_batches(items, batch_size):
+    """
+    Function Description: Groups items into lists of up to batch_size items, in order.
 
-        Time Complexity: O(n^2), where n is the number of participants
+    Input:
+        items: an iterable of items
+        batch_size: an integer representing the largest number of items in a batch
 
-        Time Complexity Analysis:
-            The function creates a new graph with the same number of vertices as the original graph, leading to O(V) time complexity.
-            The function iterates over each vertex in the original graph and each edge in the adjacency list of the vertex, leading to O(V + E) time complexity.
-            The amount of vertices is equal to 3m + 2n + 2. The amount of of edges is at worst n * m, leading to O((3m + 2n + 2) + n * m), O(n * m).
-            The number of activities is equal to at most n/2, leading to O(n * n / 2), O(n^2).
+    Output:
+        batches: a generator of lists of items
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+    Time Complexity: O(N) where N is the number of items
 
-        Auxiliary Space Complexity/Space Complexity: O(n^2), where V is the number of vertices and E is the number of edges
+    Auxiliary Space/Space Complexity: O(B) where B is the batch size
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
-        Auxiliary Space/Space Complexity Analysis:
-            The function creates a new graph with the same number of vertices as the original graph and iterates over each vertex in the original graph and each edge in the adjacency list of the vertex, leading to an auxiliary space complexity of O(V + E), where V is the number of vertices and E is the number of edges.
-            Described in terms of the number of participants, the auxiliary space complexity is O(n^2), where n is the number of participants.
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
-        """
-        # Create a new graph with the same number of vertices as the original graph
-        reconstructed_graph = [[] for _ in range(self.vertices)]
-        # Iterate over each vertex in the original graph
-        for start in range(self.vertices):
-            # Iterate over each edge in the adjacency list of the vertex
-            for edge in self.graph[start]:
-                # If the capacity of the edge is zero, add the destination vertex to the reconstructed graph
-                if edge[1] == 0:
-                    reconstructed_graph[start].append(edge[0])
-        return reconstructed_graph
+# The SpellChecker used by the check_batch calls of a worker process, set by init_worker
+_worker_checker = None
 
-        return "\n".join(result)
-    
-    def assign(self):
-        """
-        Function Description: This function assigns participants to activities based on their preferences and the number of places available in each activity.
 
-        Approach Description: The function initialises the result list of fixed size and creates a list of the current index for each place. It then reconstructs the path of maximum flow and assigns the participants to the activities based on the leader and non-leader nodes for each place.
+def init_worker(snapshot=None, shared_name=None):
+    """
+    Function Description: Opens the dictionary of a worker process of the spell command.
 
-        Input:
-            None
+    Approach Description: The dictionary is opened from a snapshot file with SpellChecker.load, or attached from shared memory with SpellChecker.attach, so every worker searches the same pages in place instead of holding its own copy.
 
-        Output:
-            result (list): A list of lists representing the participants assigned to each activity, or None if it is not possible to assign everyone.
+    Input:
+        snapshot: a string representing the path of a snapshot file, or None
+        shared_name: a string representing the name of a shared memory block published with SpellChecker.share, or None
 
-        Time Complexity: O(n^2), where n is the number of participants
+    Output:
+        None
 
-        Time Complexity Analysis:
-            The initialisation of the result list takes at most O(n^2) time, where n is the number of participants.
-            The function reconstructs the path of maximum flow, leading to O(n^2) time complexity.
+    Time Complexity: O(1)
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+    Auxiliary Space/Space Complexity: O(1)
+    """
+    global _worker_checker
+    _worker_checker = SpellChecker.load(snapshot) if snapshot else SpellChecker.attach(shared_name)
 
-        Auxiliary Space Complexity/Space Complexity: O(n^2), where n is the number of participants
 
-        Auxiliary Space/Space Complexity Analysis:
-            The function initialises the result list of fixed size and creates a list of the current index for each place, leading to an auxiliary space complexity of O(n^2), where n is the number of participants.
+def check_batch(batch, lines=False, checker=None):
+    """
+    Function Description: Checks a batch of words or lines and formats the results as lines of JSON.
 
-            The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
-        """
-        # Initialise the result list of fixed size
-        result = [[None] * people_allowed for people_allowed in self.places]
-        # Create a list of the current index for each place
-        place_indexs = [0] * self.num_places
-        # Reconstruct the path of maximum flow
-        path = self.reconstructed_graph
-        # Only get the edges from each person to the places
-        people_assignments = path[1:self.num_people + 1]
-        # Iterate over each place getting the leader and non leader nodes for each place
-        for place_index, place in enumerate(self.place_nodes):
-            # Iterate over each person and their assigned place
-            for person_index, person in enumerate(people_assignments):
-                # Check if the person is assigned to the leader node of the place or the non-leader node of the place
-                for i in range(2):
-                    if person[0] == place[i]:
-                        # Assign the person to the place
-                        result[place_index][place_indexs[place_index]] = (person_index)
-                        place_indexs[place_index] += 1
+    Approach Description: Every word of the batch is checked at once with SpellChecker.check_many, which sorts the distinct words so that words sharing a prefix reuse the same path of the trie. In word mode each word gets a record with its suggestions. In line mode each line gets a record with its number, its words and the suggestions of each word, in the order of the words. The records are formatted in the worker, so the parent process only writes the text out.
 
-        # Check if all places have been assigned
-        for place_index in range(self.num_places):
-            # If a place has less people than the number of places available, return None
-            if place_indexs[place_index] < self.places[place_index]:
-                return None
-        return result
+    Input:
+        batch: a list of words, or a list of (line number, line) tuples in line mode
+        lines: a boolean representing whether the batch holds lines
+        checker: a SpellChecker object, or None for the dictionary opened by init_worker
+
+    Output:
+        text: a string of one JSON record per word or line, each ending with a newline
 
+    Time Complexity: O(N*log(N)*M + S) where N is the number of words in the batch, M is the number of characters in the longest word and S is the number of characters of the distinct words, as for check_many
 
-def assign(preferences, places):
+    Auxiliary Space/Space Complexity: O(N) where N is the number of words in the batch
     """
-    Function Description: This function assigns participants to activities based on their preferences and the number of places available in each activity.
+    checker = checker or _worker_checker
+    if not lines:
+        return ''.join(json.dumps({'word': word, 'suggestions': suggestions}) + '\n' for word, suggestions in zip(batch, checker.check_many(batch)))
+    words = [split_words(line) for _, line in batch]
+    suggestions = iter(checker.check_many(word for line_words in words for word in line_words))
+    return ''.join(json.dumps({'line': number, 'words': line_words, 'suggestions': [next(suggestions) for _ in line_words]}) + '\n' for (number, _), line_words in zip(batch, words))
 
-    Approach Description: The function creates a preference manager object with the given preferences and places. It then assigns the participants to the activities using the Ford-Fulkerson algorithm, implemented with a bredth first saerch and returns who is assigned to each activity if it is possible to assign everyone, otherwise it returns None.
+
+async def serve_forever(server, host='127.0.0.1', port=0, path=None):
+    """
+    Function Description: Starts a SpellServer and answers requests until the task is cancelled
 
     Input:
-        preferences (list): A list of lists representing the preferences of each participant for each activity.
-        places (list): A list of integers representing the number of places available in each activity.
+        server: a SpellServer object
+        host: a string representing the address to listen on
+        port: an integer representing the TCP port to listen on
+        path: a string representing the path of a Unix socket, or None to listen on TCP
 
     Output:
-        result (list): A list of lists representing the participants assigned to each activity, or None if it is not possible to assign everyone.
+        None
 
-    Time Complexity: O(n^3), where n is the number of participants and m is the number of activities
+    Time Complexity: O(1), not counting the requests
 
-    Time Complexity Analysis:
-        The function creates a preference manager object with the given preferences and places, leading to O(n * m) time complexity.
-        The function assigns the participants to the activities using the Ford-Fulkerson algorithm, implemented with a bredth first search, leading to O(n^3) time complexity.
+    Auxiliary Space/Space Complexity: O(1)
+    """
+    address = await server.start(host, port, path)
+    print(f"Listening on {address}", file=sys.stderr, flush=True)
+    async with server.server:
+        await server.server.serve_forever()
 
-        The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
 
-    Auxiliary Space Complexity/Space Complexity: O(n^2), where n is the number of participants
+def main(argv=None):
+    """
+    Function Description: Runs the command line interface, python -m spell_and_assign spell
 
-    Auxiliary Space/Space Complexity Analysis:
-        The function creates a preference manager object with the given preferences and places, leading to an auxiliary space complexity of O(n * m), where n is the number of participants and m is the number of activities.
-        The function assigns the participants to the activities using the Ford-Fulkerson algorithm, implemented with a bredth first search, leading to an auxiliary space complexity of O(n^2), where n is the number of participants.
+    Approach Description: Both commands open the dictionary from a snapshot file, or build it from a corpus and optionally save it as a snapshot. The serve command answers requests with a SpellServer until it is interrupted. The spell command reads words or lines from the input files or standard input and writes their suggestions as lines of JSON. The input is grouped into batches, which are checked with check_batch. With --workers N the batches are checked by a pool of N processes, which open a snapshot in place or attach to the dictionary published in shared memory. At most two batches per worker are in flight and the results are written in the order the batches were submitted, so the output is in input order and memory stays bounded for inputs of any size.
 
-        The big Θ notation is the same as the big O notation as the auxiliary space complexity is the same in the best and worst case scenarios
+    Input:
+        argv: a list of strings representing the command line arguments, or None for sys.argv
+
+    Output:
+        status: an integer representing the exit status
+
+    Time Complexity: O(T + N*log(B)*M) where T is the number of characters in the input, N is the number of words, B is the batch size and M is the number of characters in the longest word
+
+    Auxiliary Space/Space Complexity: O(W*B) where W is the number of workers and B is the batch size
     """
-    # Create the graph and preference manager
-    preference_manager = PreferenceManager(preferences, places)
-    return preference_manager.assign()
\ No newline at end of file
+    parser = argparse.ArgumentParser(prog='python -m spell_and_assign', description='Spell checking and activity assignment tools')
+    options = argparse.ArgumentParser(add_help=False)
+    dictionary = options.add_mutually_exclusive_group(required=True)
+    dictionary.add_argument('--snapshot', help='a snapshot file written by SpellChecker.save to search in place')
+    dictionary.add_argument('--corpus', nargs='+', help='corpus files or glob patterns to build the dictionary from')
+    options.add_argument('--save', metavar='SNAPSHOT', help='save the dictionary built from --corpus as a snapshot file')
+    commands = parser.add_subparsers(dest='command', required=True)
+    spell = commands.add_parser('spell', parents=[options], help='write the suggestions for words or lines read from files or standard input as JSON lines')
+    spell.add_argument('inputs', nargs='*', default=['-'], help='input files or glob patterns, or - for standard input (the default)')
+    spell.add_argument('--lines', action='store_true', help='write one record per line instead of one per word')
+    spell.add_argument('--workers', type=int, default=0, help='the number of worker processes checking batches, or 0 to check in this process')
+    spell.add_argument('--batch-size', type=int, default=1000, help='the number of words or lines checked at a time')
+    spell.add_argument('--output', help='the file to write to, standard output by default')
+    serve = commands.add_parser('serve', parents=[options], help='answer line-delimited JSON requests over TCP or a Unix socket')
+    serve.add_argument('--host', default='127.0.0.1', help='the address to listen on')
+    serve.add_argument('--port', type=int, default=8765, help='the TCP port to listen on')
+    serve.add_argument('--unix', metavar='PATH', help='listen on a Unix socket at PATH instead of TCP')
+    serve.add_argument('--batch-window', type=float, default=1.0, help='the milliseconds to gather requests into one batch')
+    serve.add_argument('--max-batch', type=int, default=1024, help='the number of words that checks a batch without waiting')
+    serve.add_argument('--line-limit', type=int, default=LINE_LIMIT, help='the longest request line in bytes')
+    args = parser.parse_args(argv)
+    if args.save and not args.corpus:
+        parser.error('--save needs --corpus')
+    if args.command == 'spell' and (args.workers < 0 or args.batch_size < 1):
+        parser.error('--workers must be at least 0 and --batch-size at least 1')
+    if args.command == 'serve' and (args.batch_window < 0 or args.max_batch < 1 or args.line_limit < 1):
+        parser.error('--batch-window must be at least 0, and --max-batch and --line-limit at least 1')
+    if args.snapshot:
+        checker = SpellChecker.load(args.snapshot)
+    else:
+        checker = SpellChecker(args.corpus, bulk=True)
+        if args.save:
+            checker.save(args.save)
+    if args.command == 'serve':
+        try:
+            asyncio.run(serve_forever(SpellServer(checker, args.batch_window / 1000, args.max_batch, args.line_limit), args.host, args.port, args.unix))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            checker.close()
+        return 0
+    sources = [source for name in args.inputs for source in ([sys.stdin.buffer] if name == '-' else SpellChecker._file_names(name))]
+    if args.lines:
+        items = enumerate((line for source in sources for line in read_lines(source)), 1)
+    else:
+        items = (word for source in sources for words in tokenize_input(source) for word in words)
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        batches = iter_batches(items, args.batch_size)
+        if not args.workers:
+            for batch in batches:
+                output.write(check_batch(batch, args.lines, checker))
+            return 0
+        shared_name = None if args.snapshot else checker.share()
+        with ProcessPoolExecutor(args.workers, initializer=init_worker, initargs=(args.snapshot, shared_name)) as executor:
+            pending = deque()
+            for batch in batches:
+                if len(pending) == 2 * args.workers:
+                    output.write(pending.popleft().result())
+                pending.append(executor.submit(check_batch, batch, args.lines))
+            while pending:
+                output.write(pending.popleft().result())
+        return 0
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        else:
+            output.flush()
+        checker.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
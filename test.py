@@ -1,6 +1,61 @@
+import asyncio
+import bz2
+import gzip
+import io
+import lzma
+import multiprocessing
 import os
-from spell_and_assign import SpellChecker, assign
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import tracemalloc
+from itertools import islice
+import spell_and_assign
+from spell_and_assign import SpellChecker, SpellClient, SpellServer, SpellStats, assign, main, count_list, edit_distance, read_backwards, split_file, split_words
 import unittest
+import benchmark
+import load_generator
+
+MESSAGES = """
+    Oh, LOL.
+    I do not understand. ELI5.
+    IDK. Tell me more.
+    LMK if you want to go.
+    If you will not go, me neither.
+    I know how to do this, AMA.
+    Fine, IDC.
+    BTW, I will not come back home for dinner tonight.
+    IDK. Tell me more.
+"""
+
+
+def write_messages(content):
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(content)
+    return f.name
+
+
+def random_corpus(seed, lines=2000, vocabulary=300):
+    rng = random.Random(seed)
+    alphabet = "abcdeABC01"
+    words = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 7))) for _ in range(vocabulary)]
+    content = "\n".join(", ".join(rng.choice(words[:rng.randint(1, vocabulary)]) for _ in range(8)) for _ in range(lines))
+    return content, words
+
+
+def queries_for(words):
+    queries = set()
+    for word in words:
+        for i in range(1, len(word) + 1):
+            queries.add(word[:i])
+            queries.add(word[:i] + "x")
+            queries.add(word[:i-1] + "Z" + word[i:])
+    queries.discard("")
+    return sorted(queries)
+
 
 def validate_allocation(preferences, places, result):
     if len(result) != len(places): # not enough/too many activities
@@ -80,6 +135,994 @@ class TestSpellChecker(unittest.TestCase):
             if os.path.exists(messages_filename):
                 os.remove(messages_filename)
 
+
+class TestArrayTrie(unittest.TestCase):
+    def test_example_from_prompt(self):
+        file_name = write_messages(MESSAGES)
+        try:
+            checker = SpellChecker(file_name, backend="array")
+            self.assertEqual(checker.check("IDK"), [])
+            self.assertEqual(checker.check("zoo"), [])
+            self.assertEqual(checker.check("LOK"), ["LOL", "LMK"])
+            self.assertEqual(checker.check("IDP"), ["IDK", "IDC", "I"])
+            self.assertEqual(checker.check("Ifc"), ["If", "I", "IDK"])
+        finally:
+            os.remove(file_name)
+
+    def test_matches_trie(self):
+        content, words = random_corpus(1)
+        file_name = write_messages(content)
+        try:
+            trie_checker = SpellChecker(file_name)
+            array_checker = SpellChecker(file_name, backend="array")
+            for query in queries_for(words):
+                self.assertEqual(array_checker.check(query), trie_checker.check(query), query)
+        finally:
+            os.remove(file_name)
+
+    def test_repeated_check_does_not_change_result(self):
+        file_name = write_messages(MESSAGES)
+        try:
+            checker = SpellChecker(file_name)
+            self.assertEqual(checker.check("ID"), ["IDK", "IDC", "I"])
+            self.assertEqual(checker.check("ID"), ["IDK", "IDC", "I"])
+            self.assertEqual(checker.check("Tellx"), ["Tell"])
+        finally:
+            os.remove(file_name)
+
+
+class TestBulkBuild(unittest.TestCase):
+    def test_matches_incremental_build(self):
+        for seed in range(3):
+            content, words = random_corpus(seed, lines=500, vocabulary=100)
+            file_name = write_messages(content)
+            try:
+                expected = SpellChecker(file_name)
+                for backend in ("trie", "array"):
+                    checker = SpellChecker(file_name, backend=backend, bulk=True)
+                    for query in queries_for(words):
+                        self.assertEqual(checker.check(query), expected.check(query), query)
+            finally:
+                os.remove(file_name)
+
+    def test_counts_are_ordered_by_last_occurrence(self):
+        file_name = write_messages("b a c\nb a")
+        try:
+            counts = SpellChecker().count_words(file_name)
+            self.assertEqual(list(counts.items()), [("c", 1), ("b", 2), ("a", 2)])
+        finally:
+            os.remove(file_name)
+
+
+class TestParallelCounting(unittest.TestCase):
+    def test_split_file_at_line_boundaries(self):
+        file_name = write_messages("aa bb\ncc\n\ndd ee ff\ngg")
+        try:
+            ranges = split_file(file_name, 4)
+            self.assertEqual(ranges[0][0], 0)
+            self.assertEqual(ranges[-1][1], os.path.getsize(file_name))
+            with open(file_name, "rb") as f:
+                content = f.read()
+            for (start, end), (next_start, _) in zip(ranges, ranges[1:]):
+                self.assertEqual(end, next_start)
+                self.assertEqual(content[end - 1:end], b"\n")
+        finally:
+            os.remove(file_name)
+
+    def test_matches_serial_build(self):
+        content, words = random_corpus(4)
+        file_names = [write_messages(content), write_messages(MESSAGES)]
+        try:
+            checker = SpellChecker()
+            serial = checker.count_words(file_names)
+            parallel = checker.count_words(file_names, workers=3)
+            self.assertEqual(list(parallel.items()), list(serial.items()))
+            expected = SpellChecker(file_names)
+            built = SpellChecker(file_names, workers=2)
+            for query in queries_for(words):
+                self.assertEqual(built.check(query), expected.check(query), query)
+        finally:
+            for file_name in file_names:
+                os.remove(file_name)
+
+    def test_many_ranges_are_merged_in_order(self):
+        content, _ = random_corpus(6, lines=300)
+        file_name = write_messages(content)
+        range_size = spell_and_assign.RANGE_SIZE
+        try:
+            spell_and_assign.RANGE_SIZE = 256
+            checker = SpellChecker()
+            with open(file_name, "rb") as stream:
+                parallel = checker.count_words([file_name, stream, file_name], workers=2)
+            self.assertEqual(list(parallel.items()), list(checker.count_words([file_name] * 3).items()))
+        finally:
+            spell_and_assign.RANGE_SIZE = range_size
+            os.remove(file_name)
+
+
+class TestCompressedInputs(unittest.TestCase):
+    def setUp(self):
+        self.content, self.words = random_corpus(19, lines=1500)
+        self.directory = tempfile.mkdtemp()
+        self.plain = os.path.join(self.directory, "shard0.txt")
+        with open(self.plain, "w") as f:
+            f.write(self.content)
+        self.shards = [self.plain]
+        for i, (module, extension) in enumerate([(gzip, ".gz"), (bz2, ".bz2"), (lzma, ".xz")], 1):
+            shard = os.path.join(self.directory, f"shard{i}.txt{extension}")
+            with module.open(shard, "wt") as f:
+                f.write(self.content)
+            self.shards.append(shard)
+
+    def tearDown(self):
+        for shard in self.shards:
+            os.remove(shard)
+        os.rmdir(self.directory)
+
+    def test_compressed_files_match_plain_file(self):
+        expected = SpellChecker(self.plain)
+        for shard in self.shards[1:]:
+            for checker in (SpellChecker(shard), SpellChecker(shard, bulk=True)):
+                for word in self.words:
+                    self.assertEqual(checker.trie.word_frequency(word), expected.trie.word_frequency(word), word)
+                for query in queries_for(self.words[:40]):
+                    self.assertEqual(checker.check(query), expected.check(query), query)
+
+    def test_glob_list_and_stream_match(self):
+        checker = SpellChecker()
+        expected = checker.count_words([self.plain] * 4)
+        pattern = os.path.join(self.directory, "shard*")
+        self.assertEqual(list(checker.count_words(pattern).items()), list(expected.items()))
+        self.assertEqual(list(checker.count_words(self.shards).items()), list(expected.items()))
+        self.assertEqual(list(checker.count_words(self.shards, workers=2).items()), list(expected.items()))
+        stream = io.BytesIO(self.content.encode())
+        mixed = [self.shards[1], stream, self.plain, self.shards[3]]
+        self.assertEqual(list(checker.count_words(mixed, workers=2).items()), list(expected.items()))
+        self.assertFalse(stream.closed)
+        stream.seek(0)
+        loaded = SpellChecker(stream)
+        built = SpellChecker(self.plain)
+        self.assertEqual(loaded.trie.frequency, built.trie.frequency)
+        with self.assertRaises(FileNotFoundError):
+            SpellChecker(os.path.join(self.directory, "missing*"))
+
+
+class TestTokenizer(unittest.TestCase):
+    def test_matches_isalnum_split_across_chunks(self):
+        content = MESSAGES + "caf\u00e9 na\u00efve_x 12\u00b3 \u4f60\u597d, t\u00e9st\n" * 3
+        expected = []
+        word = ""
+        for char in content:
+            if char.isalnum():
+                word += char
+            elif word:
+                expected.append(word)
+                word = ""
+        file_name = write_messages(content)
+        try:
+            checker = SpellChecker()
+            for chunk_size in (1, 2, 7, 64, 1 << 20):
+                words = [word for words in checker.tokenize(file_name, chunk_size) for word in words]
+                self.assertEqual(words, expected, chunk_size)
+            self.assertEqual(checker.clean_and_split("Oh, LOL. caf\u00e9"), ["Oh", "LOL", "caf\u00e9"])
+        finally:
+            os.remove(file_name)
+
+    def test_bulk_counts_match_counting_each_word(self):
+        content, _ = random_corpus(10)
+        content += "\n" + "caf\u00e9 na\u00efve_x 12\u00b3 \u4f60\u597d, t\u00e9st " * 40 + "\nb a c\n"
+        expected = {}
+        for line in content.split("\n"):
+            for word in SpellChecker().clean_and_split(line):
+                expected[word] = expected.pop(word, 0) + 1
+        file_name = write_messages(content)
+        try:
+            for chunk_size in (1, 7, 300, 1 << 20):
+                texts = list(read_backwards(file_name, chunk_size=chunk_size))
+                self.assertEqual("".join(reversed(texts)), content, chunk_size)
+            with open(file_name, "w") as f:
+                f.write("LOL " * 5000)
+            self.assertEqual(list(read_backwards(file_name, chunk_size=7)), ["LOL " * 5000])
+            with open(file_name, "w") as f:
+                f.write(content)
+            self.assertEqual(list(count_list(split_words(content)).items()), list(expected.items()))
+            self.assertEqual(list(SpellChecker().count_words(file_name).items()), list(expected.items()))
+            self.assertEqual(list(SpellChecker().count_words([file_name, file_name]).items()), [(word, 2 * count) for word, count in expected.items()])
+        finally:
+            os.remove(file_name)
+
+
+class TestCheckMany(unittest.TestCase):
+    def test_matches_check_in_input_order(self):
+        content, words = random_corpus(3)
+        file_name = write_messages(content)
+        try:
+            queries = queries_for(words)
+            random.Random(3).shuffle(queries)
+            queries += queries[:50]
+            for backend in ("trie", "array"):
+                checker = SpellChecker(file_name, backend=backend)
+                self.assertEqual(checker.check_many(queries), [checker.check(query) for query in queries])
+        finally:
+            os.remove(file_name)
+
+    def test_reuses_merges_of_shared_prefix(self):
+        content, words = random_corpus(4)
+        file_name = write_messages(content)
+        try:
+            stats = SpellStats()
+            checker = SpellChecker(file_name, stats=stats)
+        finally:
+            os.remove(file_name)
+        queries = queries_for(words)
+        stats.reset()
+        expected = [checker.check(query) for query in queries]
+        single = stats.snapshot()["counts"]
+        stats.reset()
+        self.assertEqual(checker.check_many(queries), expected)
+        many = stats.snapshot()["counts"]
+        self.assertEqual(many["searches"], single["searches"])
+        self.assertLess(many["search_nodes"] * 2, single["search_nodes"])
+        self.assertLess(many["ranking_merges"] * 2, single["ranking_merges"])
+
+
+class TestIncrementalUpdates(unittest.TestCase):
+    def test_example_updates(self):
+        file_name = write_messages(MESSAGES)
+        try:
+            checker = SpellChecker(file_name)
+            checker.remove_words(["IDK"])
+            self.assertEqual(checker.check("IDP"), ["IDC", "I", "If"])
+            checker.set_frequency("IDC", 5)
+            checker.add_words(["IDX", "IDX"])
+            self.assertEqual(checker.check("IDP"), ["IDC", "IDX", "I"])
+            checker.remove_words(["IDC", "IDX", "missing"])
+            self.assertEqual(checker.check("IDP"), ["I", "If"])
+        finally:
+            os.remove(file_name)
+
+    def test_matches_build_from_counts(self):
+        rng = random.Random(5)
+        for _ in range(20):
+            words = ["".join(rng.choice("abA0") for _ in range(rng.randint(1, 5))) for _ in range(30)]
+            checker = SpellChecker()
+            counts = {}
+            for _ in range(200):
+                word = rng.choice(words)
+                action = rng.random()
+                if action < 0.5:
+                    checker.add_words([word])
+                    counts[word] = counts.pop(word, 0) + 1
+                elif action < 0.7:
+                    checker.remove_words([word])
+                    counts.pop(word, None)
+                else:
+                    frequency = rng.randint(0, 5)
+                    checker.set_frequency(word, frequency)
+                    if frequency != counts.get(word, 0):
+                        counts.pop(word, None)
+                        if frequency:
+                            counts[word] = frequency
+            expected = SpellChecker()
+            expected.trie.build(counts)
+            for query in queries_for(words):
+                self.assertEqual(checker.check(query), expected.check(query), query)
+
+    def test_array_backend_does_not_support_updates(self):
+        checker = SpellChecker(backend="array")
+        with self.assertRaises(TypeError):
+            checker.set_frequency("LOL", 2)
+
+
+class TestResultCache(unittest.TestCase):
+    def test_hits_misses_and_evictions(self):
+        file_name = write_messages(MESSAGES)
+        try:
+            checker = SpellChecker(file_name, cache_size=2)
+            self.assertEqual(checker.check("LOK"), ["LOL", "LMK"])
+            self.assertEqual(checker.check("LOK"), ["LOL", "LMK"])
+            checker.check("IDP")
+            checker.check("Ifc")
+            info = checker.cache_info()
+            self.assertEqual((info.hits, info.misses, info.evictions, info.size, info.max_size), (1, 3, 1, 2, 2))
+            checker.check("LOK")
+            self.assertEqual(checker.cache_info().misses, 4)
+        finally:
+            os.remove(file_name)
+
+    def test_updates_only_invalidate_shared_prefixes(self):
+        file_name = write_messages(MESSAGES)
+        try:
+            checker = SpellChecker(file_name, cache_size=10)
+            checker.check("LOK")
+            checker.check("IDP")
+            checker.add_words(["IDX", "IDX"])
+            self.assertEqual(checker.cache_info().invalidations, 1)
+            self.assertEqual(checker.check("IDP"), ["IDK", "IDX", "IDC"])
+            self.assertEqual(checker.check("LOK"), ["LOL", "LMK"])
+            self.assertEqual(checker.cache_info().hits, 1)
+            checker.remove_words(["LOL"])
+            self.assertEqual(checker.check("LOK"), ["LMK"])
+        finally:
+            os.remove(file_name)
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_load_matches_built_checker(self):
+        content, words = random_corpus(2)
+        file_name = write_messages(content)
+        snapshot_name = file_name + ".snapshot"
+        try:
+            for backend in ("trie", "array"):
+                checker = SpellChecker(file_name, backend=backend)
+                checker.save(snapshot_name)
+                loaded = SpellChecker.load(snapshot_name)
+                try:
+                    for query in queries_for(words):
+                        self.assertEqual(loaded.check(query), checker.check(query), query)
+                finally:
+                    loaded.close()
+        finally:
+            os.remove(file_name)
+            if os.path.exists(snapshot_name):
+                os.remove(snapshot_name)
+
+    def test_rejects_other_files(self):
+        file_name = write_messages(MESSAGES)
+        try:
+            with self.assertRaises(ValueError):
+                SpellChecker.load(file_name)
+        finally:
+            os.remove(file_name)
+
+    def test_rejects_truncated_snapshots(self):
+        checker = SpellChecker()
+        checker.add_words(["LOL", "LMAO"])
+        snapshot = spell_and_assign.FrozenTrie.to_bytes(checker.trie)
+        for length in (0, 8, len(snapshot) - 4):
+            with self.assertRaises(ValueError):
+                spell_and_assign.FrozenTrie(snapshot[:length])
+        self.assertEqual(len(spell_and_assign.FrozenTrie(snapshot + bytes(4)).search("L").ranking), 2)
+
+
+class TestTopK(unittest.TestCase):
+    def test_top_3_is_a_prefix_of_top_k(self):
+        content, words = random_corpus(5, lines=500, vocabulary=100)
+        file_name = write_messages(content)
+        try:
+            expected = SpellChecker(file_name)
+            checker = SpellChecker(file_name, k=10)
+            for query in queries_for(words):
+                suggestions = checker.check(query)
+                self.assertLessEqual(len(suggestions), 10)
+                self.assertEqual(suggestions[:3], expected.check(query), query)
+        finally:
+            os.remove(file_name)
+
+    def test_backends_match(self):
+        content, words = random_corpus(6, lines=500, vocabulary=100)
+        file_name = write_messages(content)
+        snapshot_name = file_name + ".snapshot"
+        try:
+            expected = SpellChecker(file_name, k=10)
+            checker = SpellChecker(file_name, k=10)
+            for word in words[:20]:
+                checker.set_frequency(word, 1)
+            counts = SpellChecker().count_words(file_name)
+            for word in words[:20]:
+                counts.pop(word, None)
+                counts[word] = 1
+            updated = SpellChecker(k=10)
+            updated.trie.build(counts)
+            SpellChecker(file_name, backend="array", bulk=True, k=10).save(snapshot_name)
+            loaded = SpellChecker.load(snapshot_name)
+            try:
+                others = [SpellChecker(file_name, backend="array", k=10), SpellChecker(file_name, bulk=True, k=10), loaded]
+                for query in queries_for(words):
+                    for other in others:
+                        self.assertEqual(other.check(query), expected.check(query), query)
+                    self.assertEqual(checker.check(query), updated.check(query), query)
+            finally:
+                loaded.close()
+        finally:
+            os.remove(file_name)
+            if os.path.exists(snapshot_name):
+                os.remove(snapshot_name)
+
+    def test_rejects_empty_ranking(self):
+        with self.assertRaises(ValueError):
+            SpellChecker(k=0)
+
+
+class TestEditDistance(unittest.TestCase):
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance("LOL", "LOL", 2), 0)
+        self.assertEqual(edit_distance("KOL", "LOL", 2), 1)
+        self.assertEqual(edit_distance("IKD", "IDK", 2), 1)
+        self.assertEqual(edit_distance("Tel", "Tell", 2), 1)
+        self.assertEqual(edit_distance("abc", "bca", 2), 2)
+        self.assertEqual(edit_distance("abc", "bca", 1), 2)
+        self.assertEqual(edit_distance("a", "abcd", 2), 3)
+
+    def test_check_edits_example(self):
+        file_name = write_messages(MESSAGES)
+        try:
+            checker = SpellChecker(file_name)
+            self.assertEqual(checker.check_edits("KOL"), ["LOL"])
+            self.assertEqual(checker.check_edits("LOL"), [])
+            self.assertEqual(checker.check_edits("IKD"), ["IDK"])
+            self.assertEqual(checker.check_edits("IKD", max_distance=2), ["IDK", "I", "IDC"])
+            checker.add_words(["KOL"])
+            self.assertEqual(checker.check_edits("KOLL"), ["KOL"])
+            checker.remove_words(["KOL", "LOL"])
+            self.assertEqual(checker.check_edits("KOL"), [])
+        finally:
+            os.remove(file_name)
+
+    def test_matches_brute_force(self):
+        content, words = random_corpus(7, lines=300, vocabulary=150)
+        file_name = write_messages(content)
+        try:
+            checker = SpellChecker(file_name, backend="array")
+            counts = checker.count_words(file_name)
+            rng = random.Random(7)
+            for max_distance in (1, 2):
+                for _ in range(200):
+                    query = "".join(rng.choice("abcdeABC01x") for _ in range(rng.randint(1, 7)))
+                    expected = sorted((edit_distance(query, word, max_distance), -frequency, word) for word, frequency in counts.items())
+                    expected = [word for distance, _, word in expected if distance <= max_distance][:3]
+                    self.assertEqual(checker.check_edits(query, max_distance), [] if query in counts else expected, query)
+        finally:
+            os.remove(file_name)
+
+
+class TestUnicode(unittest.TestCase):
+    def test_accented_and_cjk_words(self):
+        file_name = write_messages("café, cafés, Café. 東京 東京都 東北\nnaïve café 東京")
+        try:
+            for backend in ("trie", "array"):
+                checker = SpellChecker(file_name, backend=backend)
+                self.assertEqual(checker.check("café"), [])
+                self.assertEqual(checker.check("cafx"), ["café", "cafés"])
+                self.assertEqual(checker.check("東西"), ["東京", "東京都", "東北"])
+                self.assertEqual(checker.check("naïf"), ["naïve"])
+        finally:
+            os.remove(file_name)
+
+    def test_children_switch_between_dictionary_and_list(self):
+        rng = random.Random(8)
+        alphabet = "abcdefghijklmnopqrstuvwxyzéüß漢字"
+        words = list({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 3))) for _ in range(400)})
+        checker = SpellChecker()
+        checker.add_words(words)
+        self.assertIs(type(checker.trie.root.children), list)
+        kept = [word for word in words if word[0] in "ab"]
+        checker.remove_words([word for word in words if word[0] not in "ab"])
+        self.assertIs(type(checker.trie.root.children), dict)
+        expected = SpellChecker()
+        expected.add_words(kept)
+        for query in queries_for(words):
+            self.assertEqual(checker.check(query), expected.check(query), query)
+
+
+class TestRadixTrie(unittest.TestCase):
+    def test_matches_trie(self):
+        for seed in range(3):
+            content, words = random_corpus(seed, lines=500, vocabulary=100)
+            file_name = write_messages(content)
+            try:
+                expected = SpellChecker(file_name)
+                for bulk in (False, True):
+                    checker = SpellChecker(file_name, backend="radix", bulk=bulk)
+                    self.assertEqual(list(checker.trie.export_nodes()), list(expected.trie.export_nodes()))
+                    queries = queries_for(words)
+                    self.assertEqual(checker.check_many(queries), [expected.check(query) for query in queries])
+            finally:
+                os.remove(file_name)
+
+    def test_collapses_single_child_chains(self):
+        file_name = write_messages("https://example.com/a1b2c3 https://example.com/d4e5 #hashtag #hash")
+        try:
+            checker = SpellChecker(file_name, backend="radix")
+            # root, "h", "ttps", "ash", "tag", "example", "com", "a1b2c3", "d4e5"
+            self.assertEqual(len(checker.trie), 9)
+            self.assertEqual(checker.check("examp"), ["example"])
+            self.assertEqual(checker.check("hashx"), ["hash", "hashtag", "https"])
+            self.assertEqual(checker.check("d4e6"), ["d4e5"])
+        finally:
+            os.remove(file_name)
+
+
+class TestSortedArray(unittest.TestCase):
+    def test_matches_trie(self):
+        limit = spell_and_assign.SORTED_SCAN_LIMIT
+        try:
+            for seed, scan_limit, k in ((0, limit, 3), (1, 0, 3), (2, 4, 1), (3, 2, 6)):
+                spell_and_assign.SORTED_SCAN_LIMIT = scan_limit
+                content, words = random_corpus(seed, lines=500, vocabulary=150)
+                file_name = write_messages(content)
+                try:
+                    expected = SpellChecker(file_name, k=k)
+                    checker = SpellChecker(file_name, backend="sorted", k=k)
+                    queries = queries_for(words)
+                    self.assertEqual([checker.check(query) for query in queries], [expected.check(query) for query in queries])
+                    self.assertEqual(checker.check_many(queries), expected.check_many(queries))
+                    self.assertEqual(list(checker.trie.export_nodes()), list(expected.trie.export_nodes()))
+                finally:
+                    os.remove(file_name)
+        finally:
+            spell_and_assign.SORTED_SCAN_LIMIT = limit
+
+    def test_uses_a_fraction_of_the_memory_and_is_read_only(self):
+        content, words = random_corpus(24, lines=3000, vocabulary=2000)
+        file_name = write_messages(content)
+        try:
+            sizes = {}
+            for backend in ("trie", "sorted"):
+                tracemalloc.start()
+                checker = SpellChecker(file_name, backend=backend, bulk=True)
+                sizes[backend] = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+            self.assertLess(sizes["sorted"] * 10, sizes["trie"])
+            with self.assertRaises(TypeError):
+                checker.add_words(["new"])
+            with self.assertRaises(ValueError):
+                checker.load_words(file_name)
+            snapshot = file_name + ".snapshot"
+            checker.save(snapshot)
+            loaded = SpellChecker.load(snapshot)
+            try:
+                queries = queries_for(words[:100])
+                self.assertEqual(loaded.check_many(queries), checker.check_many(queries))
+            finally:
+                loaded.close()
+                os.remove(snapshot)
+        finally:
+            os.remove(file_name)
+
+
+class TestDawg(unittest.TestCase):
+    def setUp(self):
+        # Words made of prefixes, roots and suffixes, which share their endings as English words do
+        rng = random.Random(25)
+        roots = ["".join(rng.choice("abcdefghijklmnoprstu") for _ in range(rng.randint(2, 6))) for _ in range(40)]
+        self.words = [prefix + root + suffix for prefix in ("", "un", "re", "dis", "over") for root in roots for suffix in ("", "s", "ed", "ing", "er", "ers", "ly")]
+        self.corpus = "\n".join(" ".join(rng.choices(self.words, k=10)) for _ in range(3000)).encode()
+
+    def test_shares_word_endings(self):
+        expected = SpellChecker(io.BytesIO(self.corpus))
+        checker = SpellChecker(io.BytesIO(self.corpus), backend="dawg")
+        self.assertLess(len(checker.trie) * 10, sum(1 for _ in expected.trie.export_nodes()))
+        with self.assertRaises(TypeError):
+            checker.add_words(["new"])
+
+    def test_matches_trie(self):
+        queries = sorted({word[:i] + end for word in self.words[::9] for i in range(1, len(word) + 1) for end in ("", "x")})
+        limit = spell_and_assign.SORTED_SCAN_LIMIT
+        try:
+            for scan_limit, k in ((limit, 3), (0, 3), (2, 6)):
+                spell_and_assign.SORTED_SCAN_LIMIT = scan_limit
+                expected = SpellChecker(io.BytesIO(self.corpus), k=k)
+                checker = SpellChecker(io.BytesIO(self.corpus), backend="dawg", k=k)
+                self.assertEqual(checker.check_many(queries), expected.check_many(queries))
+                self.assertEqual(list(checker.trie.export_nodes()), list(expected.trie.export_nodes()))
+        finally:
+            spell_and_assign.SORTED_SCAN_LIMIT = limit
+
+
+class TestWordTable(unittest.TestCase):
+    def test_words_are_stored_once(self):
+        file_name = write_messages(MESSAGES)
+        try:
+            checker = SpellChecker(file_name)
+            trie = checker.trie
+            self.assertEqual(len(trie.words), len(set(trie.words)))
+            self.assertEqual(sorted(trie.words), sorted(checker.count_words(file_name)))
+            node = trie.root
+            for char in "ID":
+                node = trie._child(node, char)
+            self.assertEqual([trie.words[word_id] for word_id in node.ranking], ["IDK", "IDC"])
+            word_id = trie.word_ids["IDC"]
+            checker.add_words(["IDC", "IDC"])
+            self.assertEqual(trie.frequency[word_id], 3)
+            self.assertEqual([trie.words[word_id] for word_id in node.ranking], ["IDC", "IDK"])
+            self.assertEqual(len(trie.words), len(set(trie.words)))
+        finally:
+            os.remove(file_name)
+
+
+def check_attached(name, queries, results):
+    checker = SpellChecker.attach(name)
+    try:
+        results.put([checker.check(query) for query in queries])
+    finally:
+        checker.close()
+
+
+class TestSharedMemory(unittest.TestCase):
+    def test_attached_workers_match_publisher(self):
+        content, words = random_corpus(3)
+        file_name = write_messages(content)
+        try:
+            checker = SpellChecker(file_name)
+            name = checker.share()
+            try:
+                queries = queries_for(words)
+                expected = [checker.check(query) for query in queries]
+                attached = SpellChecker.attach(name)
+                try:
+                    self.assertEqual([attached.check(query) for query in queries], expected)
+                finally:
+                    attached.close()
+                results = multiprocessing.Queue()
+                worker = multiprocessing.Process(target=check_attached, args=(name, queries, results))
+                worker.start()
+                self.assertEqual(results.get(timeout=60), expected)
+                worker.join()
+                self.assertEqual(worker.exitcode, 0)
+            finally:
+                checker.close()
+            with self.assertRaises(FileNotFoundError):
+                SpellChecker.attach(name)
+        finally:
+            os.remove(file_name)
+
+
+class TestIterSuggestions(unittest.TestCase):
+    def test_example_from_prompt(self):
+        file_name = write_messages(MESSAGES)
+        try:
+            checker = SpellChecker(file_name)
+            self.assertEqual(list(checker.iter_suggestions("ID")), ["IDK", "IDC", "I", "If"])
+            self.assertEqual(list(checker.iter_suggestions("LOK")), ["LOL", "LMK"])
+            self.assertEqual(list(checker.iter_suggestions("LOL")), [])
+            self.assertEqual(list(checker.iter_suggestions("XYZ")), [])
+        finally:
+            os.remove(file_name)
+
+    def test_matches_unlimited_check(self):
+        content, words = random_corpus(7, lines=500, vocabulary=100)
+        file_name = write_messages(content)
+        try:
+            for backend in ("trie", "radix"):
+                checker = SpellChecker(file_name, backend=backend)
+                expected = SpellChecker(file_name, backend=backend, k=len(words))
+                for query in queries_for(words):
+                    self.assertEqual(list(islice(checker.iter_suggestions(query), 3)), checker.check(query), query)
+                    self.assertEqual(list(checker.iter_suggestions(query)), expected.check(query), query)
+        finally:
+            os.remove(file_name)
+
+    def test_array_backend_does_not_support_iterating(self):
+        checker = SpellChecker(backend="array")
+        with self.assertRaises(TypeError):
+            checker.iter_suggestions("LOL")
+
+
+class TestStreaming(unittest.TestCase):
+    def test_window_forgets_old_messages(self):
+        checker = SpellChecker(window=2)
+        for message in ["LOL LOL LOL", "LMK", "LMAO"]:
+            checker.ingest(message)
+        self.assertEqual(checker.check("L"), ["LMK", "LMAO"])
+        checker.ingest("LMAO, LOL")
+        self.assertEqual(checker.check("L"), ["LMAO", "LOL"])
+        self.assertEqual(checker.trie.word_frequency("LMAO"), 2)
+
+    def test_decay_prefers_recent_words(self):
+        checker = SpellChecker(half_life=2)
+        checker.ingest("LOL LOL LOL")
+        self.assertEqual(checker.check("L"), ["LOL"])
+        for _ in range(4):
+            checker.ingest("LMAO")
+        # LOL decayed to 3/4 while LMAO adds up to more than 1
+        self.assertEqual(checker.check("L"), ["LMAO", "LOL"])
+
+    def test_rescale_keeps_rankings(self):
+        rng = random.Random(8)
+        words = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(30)]
+        checker = SpellChecker(half_life=0.5, cache_size=20)
+        for i in range(300):
+            checker.ingest(" ".join(rng.choice(words[:i % 30 + 1]) for _ in range(4)))
+            for query in ("a", "ab", "b", "ca"):
+                checker.check(query)
+        trie = checker.trie
+        counts = {}
+        for word_id in sorted(range(len(trie.words)), key=lambda word_id: trie.order[word_id]):
+            if trie.frequency[word_id]:
+                counts[trie.words[word_id]] = trie.frequency[word_id]
+        expected = SpellChecker(half_life=0.5)
+        expected.trie.build(counts)
+        self.assertLess(len(counts), len(set(words)))
+        self.assertEqual(len(counts), len(trie.word_ids))
+        for query in sorted({word[:i] + end for word in words for i in range(1, len(word) + 1) for end in ("", "c")}):
+            self.assertEqual(checker.check(query), expected.check(query), query)
+
+    def test_removed_words_free_their_ids(self):
+        for kwargs in ({"window": 10}, {"half_life": 10}, {"window": 10, "concurrent": True}):
+            checker = SpellChecker(**kwargs)
+            for i in range(3000):
+                checker.ingest(f"w{i}")
+            self.assertLess(len(checker.trie.words), 1000)
+            self.assertEqual(checker.trie.word_frequency("w0"), 0)
+            self.assertGreater(checker.trie.word_frequency("w2999"), 0)
+
+    def test_save_after_decay(self):
+        checker = SpellChecker(half_life=1)
+        for i in range(100):
+            checker.ingest(["LOL LMAO", "LMK LOL", "LMAO"][i % 3])
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot = os.path.join(directory, "decayed.snapshot")
+            checker.save(snapshot)
+            loaded = SpellChecker.load(snapshot)
+            try:
+                self.assertEqual(loaded.check_many(["L", "LM", "LO"]), checker.check_many(["L", "LM", "LO"]))
+            finally:
+                loaded.close()
+
+    def test_rejects_invalid_arguments(self):
+        for kwargs in ({"half_life": 1, "window": 1}, {"half_life": 0}, {"window": 0}, {"window": 1, "backend": "array"}):
+            with self.assertRaises(ValueError):
+                SpellChecker(**kwargs)
+
+
+class TestConcurrentReads(unittest.TestCase):
+    def test_matches_checker_without_copy_on_write(self):
+        words = ["LOL", "LMAO", "LMK", "LOLZ", "IDK", "IDC", "ILY", "BRB", "BTW", "BRUH"]
+        queries = ["L", "LO", "LM", "LOLZ", "I", "ID", "B", "BR", "BRUH", "X"]
+        checker = SpellChecker(concurrent=True)
+        expected = SpellChecker()
+        for spell_checker in (checker, expected):
+            spell_checker.add_words(words * 2 + words[::3])
+            spell_checker.set_frequency("LMK", 5)
+            spell_checker.set_frequency("IDC", 1)
+            spell_checker.add_words(["LOL", "BRUH", "BRUHH"])
+            spell_checker.remove_words(["LOLZ", "IDK", "BRB"])
+        self.assertEqual([checker.check(query) for query in queries], [expected.check(query) for query in queries])
+
+    def test_readers_see_whole_batches(self):
+        words = ["xa1", "xa2", "xa3", "xa4"]
+        # Each batch ties the words and ranks them by the order they were added in
+        versions = {("xa1", "xa2", "xa3"), ("xa4", "xa3", "xa2")}
+        checker = SpellChecker(concurrent=True)
+        checker.add_words(words)
+        stop = threading.Event()
+        seen = []
+        errors = []
+        def read():
+            try:
+                while not stop.is_set():
+                    seen.append(tuple(checker.check("x")))
+                    checker.check_many(["x", "xa", "xb1"])
+            except Exception as error:
+                errors.append(error)
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        try:
+            for reader in readers:
+                reader.start()
+            for i in range(1000):
+                checker.add_words(words if i % 2 else words[::-1])
+                checker.add_words([f"xb{i % 10}"])
+                checker.remove_words([f"xb{(i + 5) % 10}"])
+        finally:
+            stop.set()
+            for reader in readers:
+                reader.join()
+            sys.setswitchinterval(interval)
+        self.assertEqual(errors, [])
+        self.assertTrue(seen)
+        self.assertLessEqual(set(seen), versions)
+
+    def test_rejects_other_backends_and_cache(self):
+        for kwargs in ({"backend": "array"}, {"cache_size": 10}):
+            with self.assertRaises(ValueError):
+                SpellChecker(concurrent=True, **kwargs)
+
+
+class TestCommandLine(unittest.TestCase):
+    def setUp(self):
+        content, self.words = random_corpus(20, lines=500)
+        self.corpus = write_messages(content)
+        self.snapshot = self.corpus + ".snapshot"
+        self.queries = queries_for(self.words[:30])
+        self.input = write_messages("\n".join(" ".join(self.queries[i:i + 7]) for i in range(0, len(self.queries), 7)) + "\n")
+        self.output = self.corpus + ".jsonl"
+        self.expected = SpellChecker(self.corpus)
+
+    def tearDown(self):
+        for file_name in (self.corpus, self.snapshot, self.input, self.output):
+            if os.path.exists(file_name):
+                os.remove(file_name)
+
+    def read_output(self):
+        with open(self.output) as f:
+            return [json.loads(line) for line in f]
+
+    def test_words_from_snapshot_in_order(self):
+        self.assertEqual(main(["spell", "--corpus", self.corpus, "--save", self.snapshot, "--output", self.output, self.input]), 0)
+        serial = self.read_output()
+        self.assertEqual([record["word"] for record in serial], self.queries)
+        for record in serial:
+            self.assertEqual(record["suggestions"], self.expected.check(record["word"]), record["word"])
+        for dictionary in (["--snapshot", self.snapshot], ["--corpus", self.corpus]):
+            main(["spell", *dictionary, "--workers", "2", "--batch-size", "3", "--output", self.output, self.input])
+            self.assertEqual(self.read_output(), serial)
+
+    def test_lines_from_stdin(self):
+        with open(self.input) as f:
+            lines = f.read().splitlines()
+        SpellChecker(self.corpus).save(self.snapshot)
+        command = [sys.executable, "-m", "spell_and_assign", "spell", "--snapshot", self.snapshot, "--lines", "--workers", "2", "--batch-size", "2"]
+        result = subprocess.run(command, input="\n".join(lines), capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertEqual([record["line"] for record in records], list(range(1, len(lines) + 1)))
+        for record, line in zip(records, lines):
+            self.assertEqual(record["words"], line.split())
+            self.assertEqual(record["suggestions"], [self.expected.check(word) for word in record["words"]])
+
+    def test_rejects_save_without_corpus(self):
+        with self.assertRaises(SystemExit):
+            main(["spell", "--snapshot", self.snapshot, "--save", self.output])
+
+
+class TestSpellServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        content, self.words = random_corpus(21, lines=500)
+        file_name = write_messages(content)
+        try:
+            self.checker = SpellChecker(file_name)
+        finally:
+            os.remove(file_name)
+        self.queries = queries_for(self.words[:40])
+        self.server = SpellServer(self.checker, batch_window=0.005, max_batch=64)
+        self.host, self.port = await self.server.start(port=0)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_pipelined_requests_are_batched(self):
+        client = await SpellClient.connect(self.host, self.port)
+        try:
+            results = await asyncio.gather(*(client.check(query) for query in self.queries))
+            self.assertEqual(results, [self.checker.check(query) for query in self.queries])
+            self.assertEqual(await client.check_many(self.queries[:5]), self.checker.check_many(self.queries[:5]))
+            with self.assertRaises(ValueError):
+                await client.request(word=1)
+            metrics = await client.metrics()
+        finally:
+            await client.close()
+        self.assertEqual(metrics["requests"], len(self.queries) + 3)
+        self.assertEqual(metrics["errors"], 1)
+        self.assertLess(metrics["batches"], len(self.queries) // 10)
+        self.assertEqual(sum(bucket["count"] for bucket in metrics["latency"]), len(self.queries) + 2)
+        self.assertEqual(sum(bucket["count"] for bucket in metrics["batch_queue_depth"]), metrics["batches"])
+
+    async def test_long_requests(self):
+        client = await SpellClient.connect(self.host, self.port)
+        try:
+            self.assertEqual(await client.check_many(["helo"] * 20000), [self.checker.check("helo")] * 20000)
+        finally:
+            await client.close()
+        server = SpellServer(self.checker, line_limit=100)
+        host, port = await server.start(port=0)
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b'{"id": 1, "word": "helo"}\n{"id": 2, "words": ["' + b"a" * 200 + b'"]}\n')
+            self.assertEqual(json.loads(await reader.readline())["id"], 1)
+            self.assertIn("at most 100 bytes", json.loads(await reader.readline())["error"])
+            self.assertEqual(await reader.readline(), b"")
+            writer.close()
+        finally:
+            await server.close()
+
+    async def test_disconnect_with_unanswered_requests(self):
+        server = SpellServer(self.checker, max_batch=2)
+        host, port = await server.start(port=0)
+        try:
+            for _ in range(3):
+                reader, writer = await asyncio.open_connection(host, port)
+                writer.write(b"".join(b'{"id": %d, "words": ["a", "ab", "b", "c"]}\n' % i for i in range(5000)))
+                await asyncio.sleep(0.1)
+                writer.transport.abort()
+            for _ in range(100):
+                if not server.metrics()["queue_depth"]:
+                    break
+                await asyncio.sleep(0.02)
+            self.assertEqual(server.metrics()["queue_depth"], 0)
+        finally:
+            await server.close()
+
+    async def test_unix_socket_and_load_generator(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "spell.sock")
+        server = SpellServer(self.checker, batch_window=0.001)
+        try:
+            await server.start(path=path)
+            client = await SpellClient.connect(path=path)
+            self.assertEqual(await client.check(self.queries[0]), self.checker.check(self.queries[0]))
+            await client.close()
+            summary = await load_generator.generate_load(self.queries, 200, connections=2, depth=8, path=path)
+            self.assertEqual(summary["requests"], 200)
+            self.assertEqual(summary["server"]["requests"], 202)
+            self.assertLessEqual(summary["latency"]["p50"], summary["latency"]["max"])
+        finally:
+            await server.close()
+            os.remove(path)
+            os.rmdir(directory)
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_corpus_is_reproducible_and_results_are_complete(self):
+        directory = tempfile.mkdtemp()
+        try:
+            words = benchmark.make_vocabulary(200, seed=3)
+            self.assertEqual(len(set(words)), 200)
+            paths = [os.path.join(directory, name) for name in ("a.txt", "b.txt")]
+            for path in paths:
+                benchmark.write_corpus(path, 5000, words, 1.1, seed=3)
+            with open(paths[0]) as a, open(paths[1]) as b:
+                self.assertEqual(a.read(), b.read())
+            self.assertEqual(sum(len(chunk) for chunk in SpellChecker().tokenize(paths[0])), 5000)
+            queries = benchmark.make_queries(500, words, 1.1, {"exact": 1, "miss": 1}, seed=4)
+            self.assertEqual(queries, benchmark.make_queries(500, words, 1.1, {"exact": 1, "miss": 1}, seed=4))
+            results = benchmark.run_benchmark([2000], ["radix"], queries=300, vocabulary=200, directory=directory)
+            [result] = results["results"]
+            self.assertEqual((result["backend"], result["tokens"], result["queries"]), ("radix", 2000, 300))
+            self.assertGreater(result["nodes"], 1)
+            latency = result["check_latency_seconds"]
+            self.assertLessEqual(latency["p50"], latency["p99"])
+            [line] = benchmark.compare(results, results)
+            self.assertTrue(line.startswith("radix 2000 words: build x1.00"), line)
+            self.assertNotIn("x0", line)
+        finally:
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+
+
+class TestStats(unittest.TestCase):
+    def test_counts_nodes_merges_allocations_and_phases(self):
+        file_name = write_messages("abc abd abc x\n")
+        exported = []
+        stats = SpellStats(exported.append)
+        try:
+            checker = SpellChecker(file_name, cache_size=4, stats=stats)
+        finally:
+            os.remove(file_name)
+        counts = stats.snapshot()["counts"]
+        self.assertEqual(counts["inserts"], 4)
+        self.assertEqual(counts["insert_nodes"], 10)
+        self.assertEqual(counts["nodes_allocated"], 5)
+        self.assertEqual(counts["words_allocated"], 3)
+        stats.reset()
+        self.assertEqual(checker.check("abz"), ["abc", "abd"])
+        self.assertEqual(checker.check("abz"), ["abc", "abd"])
+        self.assertEqual(checker.check("xq"), ["x"])
+        snapshot = stats.export()
+        self.assertEqual(exported, [snapshot])
+        self.assertEqual(snapshot["counts"], {"searches": 2, "search_nodes": 3, "ranking_merges": 3})
+        self.assertEqual((snapshot["cache"]["hits"], snapshot["cache"]["misses"]), (1, 2))
+        checker.set_stats(None)
+        checker.check("ab")
+        self.assertEqual(stats.snapshot()["counts"]["searches"], 2)
+
+    def test_phases_of_each_load(self):
+        content, _ = random_corpus(23, lines=300)
+        file_name = write_messages(content)
+        try:
+            for kwargs in ({}, {"bulk": True}, {"backend": "array"}):
+                stats = SpellStats()
+                checker = SpellChecker(file_name, stats=stats, **kwargs)
+                phases = stats.snapshot()["phases"]
+                self.assertEqual(set(phases), {"load", "tokenize", "insert"}, kwargs)
+                self.assertLessEqual(phases["tokenize"]["seconds"] + phases["insert"]["seconds"], phases["load"]["seconds"])
+                self.assertEqual(checker.check("ab"), SpellChecker(file_name, **kwargs).check("ab"))
+        finally:
+            os.remove(file_name)
+
+
 if __name__ == '__main__':
     unittest.main()
 